@@ -39,6 +39,10 @@ document.addEventListener('DOMContentLoaded', function() {
     let recordingSeconds = 0;
     let currentExportSystem = null;
     let eventSource = null;
+    let currentSessionId = null;
+    let liveSocket = null;
+    let captureContext = null;
+    let captureStream = null;
 
     // Tab navigation
     tabButtons.forEach(button => {
@@ -118,12 +122,31 @@ document.addEventListener('DOMContentLoaded', function() {
         
         showLoading('Generating meeting summary...');
         
+        if (liveSocket && liveSocket.readyState === WebSocket.OPEN) {
+            // Let the server flush its last segment before summarizing
+            stopBrowserCapture();
+            liveSocket.addEventListener('message', function(event) {
+                if (JSON.parse(event.data).type === 'stopped') {
+                    liveSocket.close();
+                    fetchSummary();
+                }
+            });
+            liveSocket.send(JSON.stringify({ type: 'stop' }));
+        } else {
+            fetchSummary();
+        }
+    }
+
+    function fetchSummary() {
         // Send request to stop transcription and get results
         fetch('/api/stop-transcription', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
-            }
+            },
+            body: JSON.stringify({
+                session_id: currentSessionId
+            })
         })
         .then(response => response.json())
         .then(data => {
@@ -154,25 +177,109 @@ document.addEventListener('DOMContentLoaded', function() {
             eventSource.close();
         }
         
-        // Connect to SSE endpoint
-        eventSource = new EventSource('/api/live-transcription');
-        
-        eventSource.onmessage = function(event) {
-            const data = JSON.parse(event.data);
-            if (data.segment) {
-                const p = document.createElement('p');
-                p.textContent = data.segment;
-                liveTranscript.appendChild(p);
-                liveTranscript.scrollTop = liveTranscript.scrollHeight;
+        // Prefer streaming the browser's microphone; fall back to the server's
+        fetch('/api/live-config')
+        .then(response => response.json())
+        .then(config => {
+            if (config.websocket_port && navigator.mediaDevices) {
+                startBrowserTranscription(config.websocket_port);
+            } else {
+                startServerTranscription();
             }
+        })
+        .catch(() => startServerTranscription());
+    }
+
+    function startBrowserTranscription(port) {
+        const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+        liveSocket = new WebSocket(`${protocol}://${window.location.hostname}:${port}`);
+        liveSocket.binaryType = 'arraybuffer';
+        liveSocket.onmessage = event => handleLiveEvent(JSON.parse(event.data));
+        liveSocket.onerror = function() {
+            console.error('WebSocket connection error');
         };
         
+        navigator.mediaDevices.getUserMedia({ audio: true })
+        .then(stream => {
+            captureStream = stream;
+            captureContext = new AudioContext();
+            const input = captureContext.createMediaStreamSource(stream);
+            const processor = captureContext.createScriptProcessor(4096, 1, 1);
+            const ratio = captureContext.sampleRate / 16000;
+            
+            processor.onaudioprocess = function(e) {
+                if (!liveSocket || liveSocket.readyState !== WebSocket.OPEN) {
+                    return;
+                }
+                // Downsample to 16 kHz and convert to 16-bit PCM
+                const samples = e.inputBuffer.getChannelData(0);
+                const pcm = new Int16Array(Math.floor(samples.length / ratio));
+                for (let i = 0; i < pcm.length; i++) {
+                    const sample = Math.max(-1, Math.min(1, samples[Math.floor(i * ratio)]));
+                    pcm[i] = sample < 0 ? sample * 0x8000 : sample * 0x7FFF;
+                }
+                liveSocket.send(pcm.buffer);
+            };
+            input.connect(processor);
+            processor.connect(captureContext.destination);
+        })
+        .catch(error => {
+            showError('Microphone access denied: ' + error.message);
+        });
+    }
+
+    function stopBrowserCapture() {
+        if (captureStream) {
+            captureStream.getTracks().forEach(track => track.stop());
+            captureStream = null;
+        }
+        if (captureContext) {
+            captureContext.close();
+            captureContext = null;
+        }
+    }
+
+    function startServerTranscription() {
+        // Connect to SSE endpoint
+        eventSource = new EventSource('/api/live-transcription?summary_interval=60');
+        
+        eventSource.onmessage = event => handleLiveEvent(JSON.parse(event.data));
+        
         eventSource.onerror = function() {
             console.error('SSE connection error');
             eventSource.close();
         };
     }
 
+    function handleLiveEvent(data) {
+        if (data.session_id) {
+            currentSessionId = data.session_id;
+        }
+        if (data.type === 'summary') {
+            // Running summary refreshed by the server during the meeting
+            statusText.textContent = `Recording in progress... (${data.action_items.length} action items, ${data.decisions.length} decisions so far)`;
+        } else if (data.type === 'partial') {
+            // Interim text is shown in a single line that each update replaces
+            let interim = liveTranscript.querySelector('.interim');
+            if (!interim) {
+                interim = document.createElement('p');
+                interim.className = 'interim';
+                liveTranscript.appendChild(interim);
+            }
+            interim.textContent = data.text;
+            liveTranscript.scrollTop = liveTranscript.scrollHeight;
+        } else if (data.segment) {
+            const interim = liveTranscript.querySelector('.interim');
+            if (interim) {
+                interim.remove();
+            }
+            const p = document.createElement('p');
+            p.textContent = data.segment;
+            liveTranscript.appendChild(p);
+            liveTranscript.scrollTop = liveTranscript.scrollHeight;
+        }
+    }
+
     // File upload functionality
     audioFileInput.addEventListener('change', function() {
         if (this.files.length > 0) {
@@ -215,18 +322,19 @@ document.addEventListener('DOMContentLoaded', function() {
         };
         
         xhr.onload = function() {
-            uploadProgress.classList.add('hidden');
+            if (xhr.status === 202) {
+                // Processing continues on the server; poll the job for progress
+                const response = JSON.parse(xhr.responseText);
+                pollJob(response.job_id);
+                return;
+            }
             
-            if (xhr.status === 200) {
+            uploadProgress.classList.add('hidden');
+            try {
                 const response = JSON.parse(xhr.responseText);
-                displayResults(response);
-            } else {
-                try {
-                    const response = JSON.parse(xhr.responseText);
-                    showError('Error: ' + (response.error || 'Unknown error'));
-                } catch {
-                    showError('Error uploading file');
-                }
+                showError('Error: ' + (response.error || 'Unknown error'));
+            } catch {
+                showError('Error uploading file');
             }
             hideLoading();
         };
@@ -240,6 +348,40 @@ document.addEventListener('DOMContentLoaded', function() {
         xhr.send(formData);
     });
 
+    function pollJob(jobId) {
+        fetch(`/api/jobs/${jobId}`)
+        .then(response => response.json())
+        .then(job => {
+            if (job.status === 'done') {
+                return fetch(`/api/jobs/${jobId}/result`)
+                    .then(response => response.json())
+                    .then(result => {
+                        uploadProgress.classList.add('hidden');
+                        displayResults(result);
+                        hideLoading();
+                    });
+            }
+            if (job.status === 'failed' || job.error) {
+                throw new Error(job.error || 'Processing failed');
+            }
+            
+            // Show progress of the stage currently running
+            const stageName = Object.keys(job.stages || {}).find(name => job.stages[name].status === 'running');
+            if (stageName) {
+                const percent = Math.round(job.stages[stageName].percent);
+                progressFill.style.width = percent + '%';
+                progressText.textContent = `${stageName.charAt(0).toUpperCase() + stageName.slice(1)}: ${percent}%`;
+                loadingText.textContent = `Processing audio file (${stageName})...`;
+            }
+            setTimeout(() => pollJob(jobId), 1000);
+        })
+        .catch(error => {
+            uploadProgress.classList.add('hidden');
+            showError('Error: ' + error.message);
+            hideLoading();
+        });
+    }
+
     // Text analysis functionality
     textForm.addEventListener('submit', function(e) {
         e.preventDefault();
@@ -313,7 +455,8 @@ document.addEventListener('DOMContentLoaded', function() {
                 'Content-Type': 'application/json'
             },
             body: JSON.stringify({
-                format: format
+                format: format,
+                session_id: currentSessionId
             })
         })
         .then(response => {
@@ -331,7 +474,8 @@ document.addEventListener('DOMContentLoaded', function() {
             const a = document.createElement('a');
             a.style.display = 'none';
             a.href = url;
-            a.download = `meeting_summary.${format}`;
+            // CSV and Parquet come as a zip with one table per section
+            a.download = (format === 'csv' || format === 'parquet') ? `meeting_summary_${format}.zip` : `meeting_summary.${format}`;
             document.body.appendChild(a);
             a.click();
             window.URL.revokeObjectURL(url);
@@ -369,8 +513,10 @@ document.addEventListener('DOMContentLoaded', function() {
         
         // Add appropriate fields based on selected system
         if (system === 'jira') {
+            addCredentialField('email', 'Account Email', 'email');
             addCredentialField('api_key', 'API Key', 'password');
             addCredentialField('url', 'Jira URL', 'url');
+            addCredentialField('project', 'Project Key', 'text');
         } else if (system === 'trello') {
             addCredentialField('api_key', 'API Key', 'password');
             addCredentialField('token', 'Token', 'password');
@@ -378,8 +524,10 @@ document.addEventListener('DOMContentLoaded', function() {
             addCredentialField('api_key', 'API Key', 'password');
         } else if (system === 'github') {
             addCredentialField('token', 'Personal Access Token', 'password');
+            addCredentialField('repo', 'Repository (owner/name)', 'text');
         } else if (system === 'notion') {
             addCredentialField('token', 'Integration Token', 'password');
+            addCredentialField('database_id', 'Database ID', 'text');
         }
         
         // Show modal
@@ -443,13 +591,16 @@ document.addEventListener('DOMContentLoaded', function() {
             },
             body: JSON.stringify({
                 system: system,
-                credentials: credentials
+                credentials: credentials,
+                session_id: currentSessionId
             })
         })
         .then(response => response.json())
         .then(data => {
             if (data.error) {
                 showError('Export failed: ' + data.error);
+            } else if (data.status === 'partial') {
+                showError(`Exported ${data.created + data.existing} tasks to ${system}; ${data.failed} failed.`);
             } else {
                 showSuccess(`Tasks exported to ${system} successfully!`);
             }
@@ -464,6 +615,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // Display the analysis results
     function displayResults(data) {
+        if (data.session_id) {
+            currentSessionId = data.session_id;
+        }
+        
         // Show results section
         resultsSection.classList.remove('hidden');
         
@@ -706,7 +861,8 @@ document.addEventListener('DOMContentLoaded', function() {
                 'Content-Type': 'application/json'
             },
             body: JSON.stringify({
-                format_options: formatOptions
+                format_options: formatOptions,
+                session_id: currentSessionId
             })
         })
         .then(response => {
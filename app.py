@@ -1,10 +1,17 @@
-from flask import Flask, request, jsonify, render_template, send_file, Response
+from flask import Flask, request, jsonify, render_template, Response, stream_with_context, g
 import os
 import json
-import tempfile
 import time
+import uuid
+import threading
+import tracemalloc
 from werkzeug.utils import secure_filename
 import meeting_summarizer  
+import rendering
+import tables
+import instrumentation
+from session_store import SessionStore
+from jobs import JobQueue, QueueFull
 from pydub import AudioSegment
 import logging
 
@@ -18,30 +25,105 @@ app.config['MAX_CONTENT_LENGTH'] = 32 * 1024 * 1024  # 32MB max upload
 # Create the uploads folder if it doesn't exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-# Global variable to store active summarizer instance
-active_summarizer = None
+# Summarizer sessions keyed by session ID, so concurrent meetings stay separate
+sessions = SessionStore(
+    max_sessions=int(os.environ.get('MAX_SESSIONS', 100)),
+    ttl_seconds=int(os.environ.get('SESSION_TTL_SECONDS', 3600))
+)
+
+# Hard cap on one recording, so a forgotten background recording can't fill the disk
+MAX_RECORDING_SECONDS = int(os.environ.get('MAX_RECORDING_SECONDS', 4 * 3600))
+
+# Background workers for uploads; submissions beyond the queue limit get a 429
+jobs = JobQueue(
+    workers=int(os.environ.get('JOB_WORKERS', 2)),
+    max_queue=int(os.environ.get('JOB_QUEUE_SIZE', 16))
+)
+
+# Per-stage peak Python allocations in metrics; costs noticeable CPU, so off by default
+if os.environ.get('TRACE_MEMORY', '0') == '1':
+    tracemalloc.start()
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def observe_latency(response):
+    # Labelled by route pattern, not path, so session IDs don't create new series
+    if 'request_start' in g:
+        instrumentation.REQUEST_SECONDS.observe(
+            time.perf_counter() - g.request_start,
+            route=request.url_rule.rule if request.url_rule else 'unmatched',
+            method=request.method,
+            status=response.status_code
+        )
+    return response
+
+def metrics_requested(data=None):
+    """Whether the client asked for per-stage metrics ("metrics": true or ?metrics=1)."""
+    value = (data or {}).get('metrics') or request.args.get('metrics')
+    return str(value).lower() in ('1', 'true', 'yes')
+
+def get_session(data=None):
+    """Look up the session named by the request's session_id, if any."""
+    session_id = (data or {}).get('session_id') or request.args.get('session_id')
+    return sessions.get(session_id)
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 
+# Re-uploads and re-submitted transcripts are served from the result cache
+meeting_summarizer.configure_result_cache(
+    max_entries=int(os.environ.get('RESULT_CACHE_ENTRIES', 256)),
+    disk_dir=os.environ.get('RESULT_CACHE_DIR') or None,
+    disk_max_bytes=int(os.environ.get('RESULT_CACHE_MAX_BYTES', 512 * 2**20))
+)
+
+# Summarizer settings shared by every session (e.g. SUMMARIZER_BACKEND=quantized)
+SUMMARIZER_CONFIG = {
+    'summarizer_backend': os.environ.get('SUMMARIZER_BACKEND', meeting_summarizer.SUMMARIZER_BACKEND),
+    'onnx_model_dir': os.environ.get('ONNX_MODEL_DIR') or None,
+}
+
+# Load the shared models at startup instead of on the first request
+if os.environ.get('PRELOAD_MODELS', '0') == '1':
+    meeting_summarizer.preload_models(SUMMARIZER_CONFIG)
+
 @app.route('/')
 def index():
     """Render the main application page."""
     return render_template('index.html')
 
-from meeting_summarizer import create_trello_tasks  # ✅ Import Trello function
+# Exported task IDs survive restarts when EXPORT_STATE_FILE is set
+meeting_summarizer.configure_task_export(
+    state_path=os.environ.get('EXPORT_STATE_FILE') or None,
+    concurrency=int(os.environ.get('EXPORT_CONCURRENCY', 8))
+)
 
 @app.route("/api/export-tasks", methods=["POST"])
 def export_tasks():
-    data = request.json
-    tasks = data.get("tasks", [])
-    platform = data.get("platform")
+    """Export a session's action items (or the given tasks) to a task manager."""
+    data = request.json or {}
+    system = data.get("system") or data.get("platform")
+    credentials = data.get("credentials") or {}
 
-    if platform == "trello":
-        results = create_trello_tasks("Meeting Tasks", tasks)  # ✅ Call Trello function
-        return jsonify(results)
+    if data.get("tasks") is not None:
+        results = meeting_summarizer.export_tasks(system, data["tasks"], credentials,
+                                                  meeting_key=data.get("session_id") or "")
+    else:
+        session = get_session(data)
+        if session is None:
+            return jsonify({"error": "No active session to export"}), 400
+        # Snapshot under the lock; the remote calls can take a while and must not block the session
+        with session.lock:
+            tasks = [dict(item) for item in session.summarizer.action_items]
+            meeting_key = session.summarizer.export_key()
+        if not tasks:
+            return jsonify({"error": "No action items to export"}), 400
+        results = meeting_summarizer.export_tasks(system, tasks, credentials, meeting_key=meeting_key)
 
-    return jsonify({"status": "error", "message": "Unsupported platform"}), 400
+    return jsonify(results), 200 if results.get("status") in ("success", "partial") else 400
 
 @app.route('/api/upload', methods=['POST'])
 def upload_file():
@@ -57,99 +139,218 @@ def upload_file():
         return jsonify({'error': 'No selected file'}), 400
     
     if file:
-        # Save the uploaded file
+        # Save the uploaded file under the job ID so uploads never clash
+        job_id = uuid.uuid4().hex
         filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{job_id}_{filename}")
         logging.debug(f"Saving file to {file_path}")
         file.save(file_path)
         
-        # Initialize summarizer and process the file
         try:
-            global active_summarizer
-            active_summarizer = meeting_summarizer.create_summarizer()
-            
-            # Convert and transcribe the audio
-            logging.debug("Converting audio")
-            converted_path = active_summarizer.convert_audio(file_path)
-            logging.debug("Transcribing audio")
-            transcript = active_summarizer.transcribe_audio(converted_path)
-            
-            # Process transcript
-            logging.debug("Processing transcript")
-            results = active_summarizer.process_transcript()
-            
-            return jsonify({
-                'success': True, 
-                'filename': filename, 
-                'transcript': transcript, 
-                'summary': results.get("summary", "No summary available"),
-                'key_points': results.get("key_points", []),
-                'entities': results.get("entities", {}),
-                'action_items': results.get("action_items", []),
-                'decisions': results.get("decisions", []),
-                'participants': results.get("participants", [])
-            })
-        except Exception as e:
-            logging.error(f"Error processing file: {e}")
-            return jsonify({'error': str(e)}), 500
+            include_metrics = metrics_requested(request.form)
+            job = jobs.submit(
+                lambda job: process_upload(job, file_path, filename, include_metrics),
+                stages=['transcribe', 'summarize'],
+                job_id=job_id
+            )
+        except QueueFull as e:
+            os.remove(file_path)
+            return jsonify({'error': str(e)}), 429
+        
+        # The session shares the job's ID so exports can use either
+        return jsonify({
+            'success': True,
+            'job_id': job.id,
+            'session_id': job.id,
+            'filename': filename
+        }), 202
+
+def process_upload(job, file_path, filename, include_metrics=False):
+    """Transcribe and summarize an uploaded file on a job worker."""
+    summarizer = meeting_summarizer.create_summarizer(dict(SUMMARIZER_CONFIG))
+    logging.debug(f"Summarizer ready in {summarizer.init_seconds:.3f}s (cold start: {summarizer.cold_start})")
+    session = sessions.create(summarizer, session_id=job.id)
+    
+    with session.lock:
+        # Decode and transcribe the audio in one streaming pass
+        logging.debug("Transcribing audio")
+        job.start_stage('transcribe')
+        transcript = summarizer.transcribe_file(
+            file_path, progress=lambda done, total: job.set_progress('transcribe', done, total))
+        job.finish_stage('transcribe')
+        
+        # Process transcript
+        logging.debug("Processing transcript")
+        job.start_stage('summarize')
+        results = summarizer.process_transcript(
+            progress=lambda done, total: job.set_progress('summarize', done, total))
+        job.finish_stage('summarize')
+    
+    response = {
+        'success': True, 
+        'session_id': session.id,
+        'filename': filename, 
+        'transcript': transcript, 
+        'summary': results.get("summary", "No summary available"),
+        'key_points': results.get("key_points", []),
+        'entities': results.get("entities", {}),
+        'action_items': results.get("action_items", []),
+        'decisions': results.get("decisions", []),
+        'participants': results.get("participants", [])
+    }
+    if include_metrics:
+        response['metrics'] = summarizer.metrics.to_dict()
+    return response
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Report the status and per-stage progress of a background job."""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """Return the result of a finished job (202 while it is still running)."""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if job.status == 'failed':
+        return jsonify({'error': job.error}), 500
+    if job.status != 'done':
+        return jsonify(job.to_dict()), 202
+    return jsonify(job.result)
 
 @app.route('/api/record', methods=['POST'])
 def start_recording():
-    """Start recording from microphone."""
+    """Start recording from microphone.
+
+    With "background": true the recording runs until /api/stop-recording is
+    called (or "seconds" pass, 0 for as long as MAX_RECORDING_SECONDS allows)
+    and this returns immediately. Without it "seconds" must be positive,
+    since nothing could stop the recording.
+    """
     try:
         data = request.json
         recording_seconds = int(data.get('seconds', 60))
+        if recording_seconds <= 0:
+            if not data.get('background'):
+                return jsonify({'error': 'seconds must be positive unless background is true'}), 400
+            recording_seconds = MAX_RECORDING_SECONDS
+        if recording_seconds > MAX_RECORDING_SECONDS:
+            return jsonify({'error': f'seconds must be at most {MAX_RECORDING_SECONDS}'}), 400
         
         # Initialize summarizer
-        global active_summarizer
-        active_summarizer = meeting_summarizer.create_summarizer()
+        summarizer = meeting_summarizer.create_summarizer(dict(SUMMARIZER_CONFIG))
+        session = sessions.create(summarizer)
+        audio_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{session.id}_recording.wav")
         
-        # Record audio
-        audio_path = active_summarizer.record_audio(seconds=recording_seconds)
+        # Audio is transcribed while it is recorded, so the transcript is ready when it stops
+        record = lambda: summarizer.record_audio(seconds=recording_seconds, output_filename=audio_path, transcribe=True)
         
-        # Transcribe the recorded audio
-        transcript = active_summarizer.transcribe_audio(audio_path)
+        if data.get('background'):
+            def record_in_background():
+                try:
+                    record()
+                finally:
+                    # The TTL counts from here, so a long recording is still there to stop
+                    session.touch()
+            
+            # A live worker pins the session, so it can't expire while recording
+            session.worker = threading.Thread(target=record_in_background, name=f"record-{session.id}", daemon=True)
+            session.worker.start()
+            return jsonify({'success': True, 'session_id': session.id}), 202
         
-        # Process transcript
-        results = active_summarizer.process_transcript()
+        with session.lock:
+            record()
+            
+            # Process transcript
+            results = summarizer.process_transcript()
         
         return jsonify({
             'success': True, 
-            'transcript': transcript, 
+            'session_id': session.id,
+            'transcript': summarizer.transcript, 
             'summary': results
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/stop-recording', methods=['POST'])
+def stop_recording():
+    """Stop a background recording and process what was captured."""
+    data = request.get_json(silent=True)
+    session = get_session(data)
+    if session is None or session.worker is None:
+        return jsonify({'error': 'No active recording session'}), 400
+    
+    session.summarizer.stop_recording()
+    session.worker.join()
+    
+    with session.lock:
+        results = session.summarizer.process_transcript()
+    
+    response = {
+        'success': True,
+        'session_id': session.id,
+        'transcript': session.summarizer.transcript,
+        'summary': results
+    }
+    if metrics_requested(data):
+        response['metrics'] = session.summarizer.metrics.to_dict()
+    return jsonify(response)
+
 @app.route('/api/live-transcription', methods=['GET'])
 def live_transcription():
     """Stream live transcription results."""
+    session = get_session()
+    if session is None:
+        session = sessions.create(meeting_summarizer.create_summarizer(dict(SUMMARIZER_CONFIG)))
+    
+    request_args = request.args
+    
     def generate():
-        global active_summarizer
-        if not active_summarizer:
-            active_summarizer = meeting_summarizer.create_summarizer()
+        # Tell the client which session to stop/export later
+        yield f"data: {json.dumps({'session_id': session.id})}\n\n"
         
-        for transcript_segment in active_summarizer.live_transcription_generator():
-            yield f"data: {json.dumps({'segment': transcript_segment})}\n\n"
-            time.sleep(0.1)  # Small delay to avoid overwhelming the client
+        # Interim ("partial") and committed ("final") events are sent as soon as they arrive
+        summary_interval = request_args.get('summary_interval', type=float)
+        with session.streaming():
+            for event in session.summarizer.live_transcription_generator(summary_interval=summary_interval):
+                yield f"data: {json.dumps(event)}\n\n"
     
-    return Response(generate(), mimetype='text/event-stream')
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/live-config', methods=['GET'])
+def live_config():
+    """Tell the browser whether it can stream its own microphone over WebSocket."""
+    port = os.environ.get('WS_PORT')
+    return jsonify({'websocket_port': int(port) if port else None})
 
 @app.route('/api/stop-transcription', methods=['POST'])
 def stop_transcription():
     """Stop live transcription and process results."""
-    global active_summarizer
-    if not active_summarizer:
+    data = request.get_json(silent=True)
+    session = get_session(data)
+    if session is None:
         return jsonify({'error': 'No active transcription session'}), 400
     
-    # Process transcript
-    results = active_summarizer.process_transcript()
+    session.summarizer.stop_live_transcription()
     
-    return jsonify({
+    # Only the part of the transcript not yet covered by live summaries is analyzed
+    with session.lock:
+        results = session.summarizer.process_transcript(incremental=True)
+    
+    response = {
         'success': True,
-        'transcript': active_summarizer.transcript,
+        'session_id': session.id,
+        'transcript': session.summarizer.transcript,
         'summary': results
-    })
+    }
+    if metrics_requested(data):
+        response['metrics'] = session.summarizer.metrics.to_dict()
+    return jsonify(response)
 
 @app.route('/api/process-text', methods=['POST'])
 def process_text():
@@ -161,49 +362,71 @@ def process_text():
         if not transcript.strip():
             return jsonify({'error': 'Empty transcript'}), 400
         
-        # Initialize summarizer
-        global active_summarizer
-        active_summarizer = meeting_summarizer.create_summarizer()
+        # summary_engine "extractive" (or "auto" with latency_budget_ms) skips T5 for a fast answer
+        config = {**SUMMARIZER_CONFIG, 'lazy_models': True}
+        engine = data.get('summary_engine', 'abstractive')
+        if engine not in meeting_summarizer.SUMMARY_ENGINES:
+            return jsonify({'error': f"Unknown summary_engine. Choose from: {', '.join(meeting_summarizer.SUMMARY_ENGINES)}"}), 400
+        config['summary_engine'] = engine
+        if data.get('latency_budget_ms') is not None:
+            config['latency_budget_ms'] = float(data['latency_budget_ms'])
+        
+        # Initialize summarizer (text input never needs the speech model)
+        summarizer = meeting_summarizer.create_summarizer(config)
+        session = sessions.create(summarizer)
         
         # Process transcript
-        results = active_summarizer.process_transcript(transcript)
+        with session.lock:
+            results = summarizer.process_transcript(transcript)
         
-        return jsonify({
+        response = {
             'success': True,
+            'session_id': session.id,
             'summary': results
-        })
+        }
+        if metrics_requested(data):
+            response['metrics'] = summarizer.metrics.to_dict()
+        return jsonify(response)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def attachment(chunks, filename, mimetype):
+    """Stream chunks to the client as a file download, without a temporary file."""
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
 @app.route('/api/export', methods=['POST'])
 def export_summary():
     """Export summary in the requested format."""
-    global active_summarizer
-    if not active_summarizer:
+    data = request.json
+    session = get_session(data)
+    if session is None:
         return jsonify({'error': 'No active session to export'}), 400
     
     try:
-        data = request.json
         format_type = data.get('format', 'markdown')
+        if format_type not in meeting_summarizer.OUTPUT_FORMATS:
+            return jsonify({'error': f"Unsupported format. Choose from: {', '.join(meeting_summarizer.OUTPUT_FORMATS)}"}), 400
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{format_type}') as tmp:
-            temp_filename = tmp.name
-        
-        # Generate output
-        output = active_summarizer.generate_output(format_type, temp_filename)
+        # Snapshot the results under the lock; rendering then streams without holding it
+        with session.lock:
+            context = session.summarizer.export_context()
         
-        # If it's CSV format, it creates multiple files
-        if format_type == 'csv':
-            # Create a zip file of all generated CSVs (this part would need additional code)
-            return jsonify({'error': 'CSV export via API not fully implemented'}), 501
+        if format_type in tables.ARCHIVE_FORMATS:
+            # One table per section, zipped in memory
+            return attachment(
+                [session.summarizer.export_tables(format_type, context)],
+                f'meeting_summary_{format_type}.zip',
+                'application/zip'
+            )
         
-        # For other formats, return the file
-        return send_file(
-            temp_filename,
-            as_attachment=True,
-            download_name=f'meeting_summary.{format_type}',
-            mimetype='application/octet-stream'
+        return attachment(
+            session.summarizer.stream_output(format_type, context),
+            f'meeting_summary.{format_type}',
+            rendering.MIMETYPES[format_type]
         )
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -211,30 +434,67 @@ def export_summary():
 @app.route('/api/export-custom', methods=['POST'])
 def export_custom_summary():
     """Export summary with custom formatting options."""
-    global active_summarizer
-    if not active_summarizer:
+    data = request.json
+    session = get_session(data)
+    if session is None:
         return jsonify({'error': 'No active session to export'}), 400
     
     try:
-        data = request.json
         format_options = data.get('format_options', {})
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.txt') as tmp:
-            temp_filename = tmp.name
-        
-        # Generate custom output
-        output = active_summarizer.generate_custom_output(format_options, temp_filename)
+        with session.lock:
+            context = session.summarizer.export_context(format_options)
         
-        # Return the file
-        return send_file(
-            temp_filename,
-            as_attachment=True,
-            download_name=f'custom_meeting_summary.txt',
-            mimetype='application/octet-stream'
+        return attachment(
+            session.summarizer.stream_custom_output(format_options, context),
+            'custom_meeting_summary.txt',
+            'text/plain'
         )
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Latency histograms per route and pipeline stage, in the Prometheus text format."""
+    return Response(instrumentation.registry.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/sessions/<session_id>/metrics', methods=['GET'])
+def session_metrics(session_id):
+    """Per-stage wall time, CPU time, memory and item counts for one session's runs."""
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({'error': 'Unknown session'}), 404
+    return jsonify(session.summarizer.metrics.to_dict())
+
+@app.route('/api/models', methods=['GET'])
+def model_stats():
+    """Report load time and memory usage of the shared models."""
+    return jsonify(meeting_summarizer.model_stats())
+
+@app.route('/api/cache', methods=['GET'])
+def cache_stats():
+    """Report result cache hits, misses and sizes."""
+    return jsonify(meeting_summarizer.cache_stats())
+
+@app.route('/api/sessions', methods=['GET'])
+def session_stats():
+    """Report how many sessions are held and how many were evicted."""
+    return jsonify(sessions.stats())
+
+@app.route('/api/jobs', methods=['GET'])
+def queue_stats():
+    """Report worker and queue occupancy."""
+    return jsonify(jobs.stats())
+
+# Browser-captured audio is streamed to a WebSocket server sharing this process's models and sessions
+if os.environ.get('WS_PORT'):
+    from ws_server import TranscriptionServer
+    TranscriptionServer(
+        sessions.create,
+        port=int(os.environ['WS_PORT']),
+        decode_workers=int(os.environ.get('WS_DECODE_WORKERS', 4)),
+        summarizer_config=SUMMARIZER_CONFIG
+    ).start_in_thread()
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
\ No newline at end of file
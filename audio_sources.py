@@ -0,0 +1,190 @@
+import time
+import wave
+import socket
+
+from transcription import stream_pcm
+
+
+class AudioSource:
+    """A stream of 16-bit mono PCM at sample_rate.
+
+    read(frames) returns up to that many frames as bytes, blocking like a
+    microphone would, and b"" once the source is exhausted.
+    """
+
+    sample_rate = 16000
+    sample_width = 2
+
+    def read(self, frames):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MicrophoneSource(AudioSource):
+    """Live capture from the default input device through PyAudio."""
+
+    def __init__(self, sample_rate=16000, frames_per_buffer=1024):
+        import pyaudio
+
+        self.sample_rate = sample_rate
+        self._pyaudio = pyaudio.PyAudio()
+        self._stream = self._pyaudio.open(format=pyaudio.paInt16, channels=1, rate=sample_rate,
+                                          input=True, frames_per_buffer=frames_per_buffer)
+
+    def read(self, frames):
+        return self._stream.read(frames, exception_on_overflow=False)
+
+    def close(self):
+        self._stream.stop_stream()
+        self._stream.close()
+        self._pyaudio.terminate()
+
+
+class _PacedSource(AudioSource):
+    """Base for sources that can be replayed at real-time or accelerated speed.
+
+    speed=1.0 delivers audio at the rate a microphone would, speed=10.0 ten
+    times faster, and speed=None as fast as the reader consumes it.
+    """
+
+    def __init__(self, speed=None):
+        self.speed = speed
+        self.frames_read = 0
+        self._started = None
+
+    def _pace(self, frames):
+        if not self.speed:
+            return
+        if self._started is None:
+            self._started = time.perf_counter()
+        due = self._started + (self.frames_read + frames) / self.sample_rate / self.speed
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    def read(self, frames):
+        self._pace(frames)
+        data = self._read(frames)
+        self.frames_read += len(data) // self.sample_width
+        return data
+
+    def _read(self, frames):
+        raise NotImplementedError
+
+
+class BufferSource(_PacedSource):
+    """Replay PCM held in memory."""
+
+    def __init__(self, pcm, sample_rate=16000, speed=None):
+        super().__init__(speed)
+        self.sample_rate = sample_rate
+        self._pcm = memoryview(pcm)
+        self._pos = 0
+
+    def _read(self, frames):
+        end = self._pos + frames * self.sample_width
+        data = bytes(self._pcm[self._pos:end])
+        self._pos = end
+        return data
+
+
+class FileSource(_PacedSource):
+    """Replay an audio file. Mono 16-bit WAV at the target rate is read
+    directly; anything else is decoded on the fly with ffmpeg."""
+
+    def __init__(self, path, sample_rate=16000, speed=None):
+        super().__init__(speed)
+        self.sample_rate = sample_rate
+        self._wav = None
+        self._blocks = None
+        self._pending = b""
+
+        try:
+            wf = wave.open(path, "rb")
+            if (wf.getnchannels(), wf.getsampwidth(), wf.getframerate(), wf.getcomptype()) == (1, 2, sample_rate, "NONE"):
+                self._wav = wf
+            else:
+                wf.close()
+        except (wave.Error, EOFError):
+            pass
+
+        if self._wav is None:
+            self._blocks = stream_pcm(path, sample_rate)
+
+    def _read(self, frames):
+        if self._wav is not None:
+            return self._wav.readframes(frames)
+
+        size = frames * self.sample_width
+        while len(self._pending) < size:
+            block = next(self._blocks, b"")
+            if not block:
+                break
+            self._pending += block
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def close(self):
+        if self._wav is not None:
+            self._wav.close()
+        if self._blocks is not None:
+            self._blocks.close()
+
+
+class NetworkSource(AudioSource):
+    """Raw PCM received over a TCP connection (e.g. from a remote client)."""
+
+    def __init__(self, sock, sample_rate=16000):
+        self.sample_rate = sample_rate
+        self._sock = sock
+
+    @classmethod
+    def connect(cls, host, port, sample_rate=16000):
+        return cls(socket.create_connection((host, port)), sample_rate)
+
+    @classmethod
+    def accept(cls, port, host="0.0.0.0", sample_rate=16000):
+        """Wait for a single client to connect on port and stream from it."""
+        with socket.create_server((host, port)) as server:
+            conn, _ = server.accept()
+        return cls(conn, sample_rate)
+
+    def read(self, frames):
+        size = frames * self.sample_width
+        chunks = []
+        while size > 0:
+            chunk = self._sock.recv(size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size -= len(chunk)
+        data = b"".join(chunks)
+        # Never hand out half a sample
+        return data[:len(data) - len(data) % self.sample_width]
+
+    def close(self):
+        self._sock.close()
+
+
+def open_source(spec=None, sample_rate=16000, speed=None):
+    """Open an AudioSource from a short description.
+
+    None or "mic" opens the microphone, "tcp://host:port" connects to a PCM
+    stream, "tcp://:port" waits for one, and anything else is a file path.
+    """
+    if spec in (None, "mic"):
+        return MicrophoneSource(sample_rate)
+    if spec.startswith("tcp://"):
+        host, _, port = spec[len("tcp://"):].rpartition(":")
+        if host:
+            return NetworkSource.connect(host, int(port), sample_rate)
+        return NetworkSource.accept(int(port), sample_rate=sample_rate)
+    return FileSource(spec, sample_rate, speed)
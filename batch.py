@@ -0,0 +1,243 @@
+"""Summarize many recordings from the command line.
+
+    python batch.py recordings/ --output-dir summaries --formats markdown json
+
+Inputs are directories (searched recursively for audio files), audio files,
+or manifests (--manifest, one path per line). Files are processed on a
+process pool; each worker loads the models once and reuses them for every
+file it is given. Every worker holds its own copy of the speech and
+summarization models (hundreds of MB to a few GB, depending on the
+models), so --workers defaults to 1; raise it only as far as memory
+allows. Finished files are appended to a checkpoint manifest in the
+output directory, so an interrupted run picks up where it stopped.
+Run `python batch.py --help` for all options.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import meeting_summarizer
+from rendering import EXTENSIONS
+from tables import ARCHIVE_FORMATS, print_table
+from transcription import probe_duration, pool_context
+
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".ogg", ".flac", ".aac", ".wma", ".webm", ".mp4"}
+CHECKPOINT_FILE = "checkpoint.jsonl"
+
+_worker_config = None
+
+
+def find_inputs(paths, manifests=()):
+    """Return (path, name) pairs; name is the output name relative to its input root."""
+    inputs = []
+    for manifest in manifests:
+        with open(manifest, encoding="utf-8") as f:
+            base = os.path.dirname(os.path.abspath(manifest))
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    path = os.path.abspath(os.path.join(base, line))
+                    # Outputs mirror relative manifest paths; anything outside goes flat
+                    name = os.path.normpath(line)
+                    if os.path.isabs(name) or name.startswith(".."):
+                        name = os.path.basename(name)
+                    inputs.append((path, os.path.splitext(name)[0]))
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for file in sorted(files):
+                    if os.path.splitext(file)[1].lower() in AUDIO_EXTENSIONS:
+                        full = os.path.join(root, file)
+                        inputs.append((os.path.abspath(full), os.path.splitext(os.path.relpath(full, path))[0]))
+        else:
+            inputs.append((os.path.abspath(path), os.path.splitext(os.path.basename(path))[0]))
+    return inputs
+
+
+def file_signature(path):
+    """Size and mtime; a file with the same signature is assumed unchanged."""
+    stat = os.stat(path)
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def load_checkpoint(path):
+    """Return {input path: record} for files finished by an earlier run."""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # A line cut short by an interruption
+            if record.get("status") == "ok":
+                done[record["path"]] = record
+    return done
+
+
+def output_path(output_dir, name, format_type):
+    if format_type in ARCHIVE_FORMATS:
+        return os.path.join(output_dir, f"{name}_{format_type}.zip")
+    return os.path.join(output_dir, f"{name}.{EXTENSIONS[format_type]}")
+
+
+def _init_worker(config):
+    # Models live in the process-wide registry, so every file this worker handles reuses them
+    global _worker_config
+    _worker_config = config
+    meeting_summarizer.preload_models(config)
+
+
+def process_file(path, name, output_dir, formats):
+    """Worker entry point: transcribe, summarize and write one recording.
+
+    Returns a checkpoint record with per-stage timings in seconds.
+    """
+    record = {"path": path, "name": name}
+    timings = {}
+    try:
+        # Inside the try: a missing or unreadable file is a failed record, not a failed batch
+        record["signature"] = file_signature(path)
+        summarizer = meeting_summarizer.create_summarizer(_worker_config)
+        record["duration"] = probe_duration(path)
+
+        start = time.perf_counter()
+        summarizer.transcribe_file(path)
+        timings["transcribe"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = summarizer.process_transcript()
+        timings["process"] = time.perf_counter() - start
+        if "error" in results:
+            raise RuntimeError(results["error"])
+        for stage, seconds in results["timings"].items():
+            timings[f"process.{stage}"] = seconds
+
+        start = time.perf_counter()
+        outputs = []
+        for format_type in formats:
+            target = output_path(output_dir, name, format_type)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            summarizer.generate_output(format_type, target)
+            outputs.append(target)
+        timings["write"] = time.perf_counter() - start
+
+        record.update(status="ok", outputs=outputs, metrics=summarizer.metrics.to_dict())
+    except Exception as e:
+        record.update(status="error", error=str(e))
+    record["timings"] = {stage: round(seconds, 3) for stage, seconds in timings.items()}
+    return record
+
+
+def run(inputs, output_dir, formats, config, workers=1, checkpoint=None):
+    """Process inputs on a pool of workers, appending each finished file to checkpoint.
+
+    Files already recorded as done, unchanged and with every requested
+    output written are skipped. Returns the records of the files processed
+    in this run.
+    """
+    checkpoint = checkpoint or os.path.join(output_dir, CHECKPOINT_FILE)
+    os.makedirs(output_dir, exist_ok=True)
+    done = load_checkpoint(checkpoint)
+
+    def finished(path, name):
+        record = done.get(path)
+        if record is None:
+            return False
+        try:
+            signature = file_signature(path)
+        except OSError:
+            return False  # Gone since the last run; processing it reports the error
+        return (record["signature"] == signature
+                and all(output_path(output_dir, name, f) in record["outputs"] for f in formats))
+
+    pending = [(path, name) for path, name in inputs if not finished(path, name)]
+    skipped = len(inputs) - len(pending)
+    if skipped:
+        print(f"Skipping {skipped} file(s) already in {checkpoint}")
+
+    records = []
+    if not pending:
+        return records
+    with open(checkpoint, "a", encoding="utf-8") as log, \
+            ProcessPoolExecutor(max_workers=min(workers, len(pending)), mp_context=pool_context(),
+                                initializer=_init_worker, initargs=(config,)) as pool:
+        futures = [pool.submit(process_file, path, name, output_dir, formats) for path, name in pending]
+        for future in as_completed(futures):
+            record = future.result()
+            # Flushed per file, so an interrupted run loses at most the files in flight
+            log.write(json.dumps(record) + "\n")
+            log.flush()
+            os.fsync(log.fileno())
+            records.append(record)
+            status = "done" if record["status"] == "ok" else f"failed: {record['error']}"
+            print(f"[{len(records)}/{len(pending)}] {record['name']} {status}")
+    return records
+
+
+def report(records, wall_seconds):
+    """Print per-file stage timings and overall throughput."""
+    if not records:
+        print("Nothing to do.")
+        return
+    stages = ["transcribe", "process", "write"]
+    rows = []
+    for record in sorted(records, key=lambda r: r["name"]):
+        duration = record.get("duration")
+        rows.append([record["name"], f"{duration:.0f}s" if duration else "?",
+                     *(f"{record['timings'][stage]:.2f}s" if stage in record["timings"] else "-" for stage in stages),
+                     record["status"]])
+    print()
+    print_table(["file", "audio", *stages, "status"], rows)
+
+    audio_hours = sum(r.get("duration") or 0 for r in records if r["status"] == "ok") / 3600
+    wall_hours = wall_seconds / 3600
+    failed = sum(r["status"] != "ok" for r in records)
+    print()
+    print(f"{len(records) - failed} file(s) done, {failed} failed in {wall_seconds:.1f}s")
+    print(f"{audio_hours:.2f} audio hours, {audio_hours / max(wall_hours, 1e-9):.1f} audio hours per wall-clock hour")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="*", help="Audio files or directories to search")
+    parser.add_argument("--manifest", action="append", default=[], help="File listing one recording path per line")
+    parser.add_argument("--output-dir", default="summaries", help="Where outputs and the checkpoint are written")
+    parser.add_argument("--formats", nargs="+", default=["markdown"], choices=meeting_summarizer.OUTPUT_FORMATS,
+                        help="Output formats to write for each recording")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Recordings processed in parallel; each worker loads its own copy of the models")
+    parser.add_argument("--checkpoint", default=None,
+                        help=f"Checkpoint manifest (default: <output-dir>/{CHECKPOINT_FILE})")
+    parser.add_argument("--summarizer-backend", default=meeting_summarizer.SUMMARIZER_BACKEND,
+                        help="pytorch, quantized or onnx")
+    parser.add_argument("--summary-engine", default="abstractive", choices=meeting_summarizer.SUMMARY_ENGINES)
+    parser.add_argument("--vad", action="store_true", help="Skip silence before decoding")
+    args = parser.parse_args()
+
+    inputs = find_inputs(args.inputs, args.manifest)
+    if not inputs:
+        parser.error("no recordings given")
+
+    config = {
+        "summarizer_backend": args.summarizer_backend,
+        "summary_engine": args.summary_engine,
+        "vad": args.vad,
+        # Each file is decoded in one worker; parallelism comes from running files side by side
+        "transcription_workers": 1,
+        "use_cache": False,
+        "lazy_models": True,
+    }
+    start = time.perf_counter()
+    records = run(inputs, args.output_dir, args.formats, config, args.workers, args.checkpoint)
+    report(records, time.perf_counter() - start)
+    return 1 if any(r["status"] != "ok" for r in records) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
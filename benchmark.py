@@ -0,0 +1,423 @@
+"""Benchmarks for the meeting summarizer pipeline.
+
+Run `python benchmark.py <name> --help` for the options of each benchmark.
+"""
+import os
+import time
+import json
+import socket
+import argparse
+import tempfile
+import threading
+from collections import Counter
+
+import meeting_summarizer
+from tables import print_table
+
+
+SAMPLE_AUDIO = "Voice 004.m4a"
+
+
+def make_test_wav(repeats, input_path=SAMPLE_AUDIO, directory=None):
+    """Write the sample recording repeated `repeats` times as 16 kHz mono WAV."""
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(input_path)
+    audio = audio.set_channels(meeting_summarizer.CHANNELS).set_frame_rate(meeting_summarizer.FRAME_RATE)
+    audio = audio * repeats
+    fd, path = tempfile.mkstemp(suffix=f"_x{repeats}.wav", dir=directory)
+    os.close(fd)
+    audio.export(path, format="wav")
+    return path, len(audio) / 1000.0
+
+
+def bench_asr(args):
+    """Wall-clock real-time factor of transcribe_audio for various worker counts."""
+    summarizer = meeting_summarizer.create_summarizer({"lazy_models": True, "use_cache": False})
+    summarizer.speech_model  # load once so the first run isn't penalized
+
+    workers = sorted(set(args.workers + [os.cpu_count() or 1]))
+    rows = []
+    for repeats in args.repeats:
+        wav_path, duration = make_test_wav(repeats)
+        try:
+            for w in workers:
+                summarizer._recognizer = None
+                start = time.perf_counter()
+                summarizer.transcribe_audio(wav_path, workers=w)
+                wall = time.perf_counter() - start
+                rows.append([f"{duration:.0f}s", w, f"{wall:.2f}s", f"{wall / duration:.3f}"])
+                print(f"audio={duration:.0f}s workers={w} wall={wall:.2f}s rtf={wall / duration:.3f}")
+        finally:
+            os.remove(wav_path)
+
+    print()
+    print_table(["audio", "workers", "wall", "RTF"], rows)
+
+
+def make_padded_wav(pad_seconds, repeats=1, noise_dbfs=None, input_path=SAMPLE_AUDIO, directory=None):
+    """Write the sample recording `repeats` times with pad_seconds of silence around each copy.
+
+    noise_dbfs adds white noise at that level over the whole file, so the
+    "silence" looks like a real room rather than digital zero.
+    """
+    from pydub import AudioSegment
+    from pydub.generators import WhiteNoise
+
+    speech = AudioSegment.from_file(input_path)
+    speech = speech.set_channels(meeting_summarizer.CHANNELS).set_frame_rate(meeting_summarizer.FRAME_RATE)
+    silence = AudioSegment.silent(int(pad_seconds * 1000), frame_rate=meeting_summarizer.FRAME_RATE)
+    audio = (silence + speech) * repeats + silence
+    if noise_dbfs is not None:
+        audio = audio.overlay(WhiteNoise(sample_rate=meeting_summarizer.FRAME_RATE).to_audio_segment(len(audio), noise_dbfs)
+                              .set_channels(meeting_summarizer.CHANNELS).set_sample_width(2))
+    fd, path = tempfile.mkstemp(suffix=f"_pad{pad_seconds:g}.wav", dir=directory)
+    os.close(fd)
+    audio.export(path, format="wav")
+    return path, len(audio) / 1000.0
+
+
+def bench_vad(args):
+    """Frames skipped and real-time factor of transcribe_audio with and without VAD."""
+    plain = meeting_summarizer.create_summarizer({"lazy_models": True, "use_cache": False})
+    filtered = meeting_summarizer.create_summarizer({"lazy_models": True, "use_cache": False, "vad": True})
+    plain.speech_model
+
+    rows = []
+    for pad in args.pads:
+        wav_path, duration = make_padded_wav(pad, args.repeats, args.noise_dbfs)
+        try:
+            walls = {}
+            for name, summarizer in (("off", plain), ("on", filtered)):
+                summarizer._recognizer = None
+                start = time.perf_counter()
+                summarizer.transcribe_audio(wav_path)
+                walls[name] = time.perf_counter() - start
+                skipped = summarizer.vad_stats["skipped_ratio"] if summarizer.vad_stats else 0.0
+                words = len(summarizer.segments.render(include_timestamps=False).split())
+                rows.append([
+                    f"{pad:g}s", f"{duration:.0f}s", name, f"{skipped:.1%}", f"{walls[name]:.2f}s",
+                    f"{walls[name] / duration:.3f}", f"{walls['off'] / walls[name]:.2f}x", words,
+                ])
+                print(f"pad={pad:g}s audio={duration:.0f}s vad={name} skipped={skipped:.1%} "
+                      f"wall={walls[name]:.2f}s rtf={walls[name] / duration:.3f} words={words}")
+        finally:
+            os.remove(wav_path)
+
+    print()
+    print_table(["pad", "audio", "vad", "skipped", "wall", "RTF", "speedup", "words"], rows)
+
+
+SAMPLE_SENTENCES = [
+    "Sarah said the marketing budget for the next quarter needs to be reviewed before Friday.",
+    "John will prepare the slides for the client presentation on Monday.",
+    "We agreed to move the product launch to the second week of March.",
+    "The team discussed hiring two more engineers for the platform group.",
+    "Action item: follow up with the vendor about the delayed shipment.",
+    "Priya mentioned that customer churn dropped by three percent last month.",
+    "It was decided that the weekly sync will move to Thursday afternoons.",
+    "Mark should update the roadmap document with the new milestones.",
+]
+WORDS_PER_MINUTE = 150
+
+
+def make_transcript(minutes):
+    """Build a synthetic [MM:SS]-stamped transcript of roughly the given length."""
+    lines = []
+    words = 0
+    i = 0
+    while words < minutes * WORDS_PER_MINUTE:
+        sentence = SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)]
+        seconds = words * 60 // WORDS_PER_MINUTE
+        lines.append(f"[{seconds // 60:02d}:{seconds % 60:02d}] {sentence}")
+        words += len(sentence.split())
+        i += 1
+    return "\n".join(lines) + "\n"
+
+
+def bench_summarization(args):
+    """Summarization throughput (input tokens/sec) against batch size."""
+    rows = []
+    for minutes in args.minutes:
+        transcript = make_transcript(minutes)
+        for batch_size in args.batch_sizes:
+            summarizer = meeting_summarizer.create_summarizer({"lazy_models": True, "summary_batch_size": batch_size})
+            chunks = [chunk for chunk in summarizer._chunk_text(transcript) if len(chunk.strip()) > 100]
+            tokens = sum(len(summarizer.summarizer.tokenizer(chunk)["input_ids"]) for chunk in chunks)
+
+            # Chunk summaries are cached process-wide; time the model, not a cache hit
+            meeting_summarizer.chunk_summary_cache.clear()
+            start = time.perf_counter()
+            summarizer._summarize_chunks(chunks)
+            wall = time.perf_counter() - start
+            rows.append([f"{minutes}min", len(chunks), batch_size, f"{wall:.2f}s", f"{tokens / wall:.0f}"])
+            print(f"transcript={minutes}min chunks={len(chunks)} batch={batch_size} wall={wall:.2f}s tokens/s={tokens / wall:.0f}")
+
+    print()
+    print_table(["transcript", "chunks", "batch", "wall", "tokens/s"], rows)
+
+
+def _ngrams(tokens, n):
+    return Counter(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+
+def _f1(overlap, candidate_total, reference_total):
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / candidate_total, overlap / reference_total
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_n(candidate, reference, n=1):
+    """ROUGE-N F1 between two texts, on lowercased whitespace tokens."""
+    candidate, reference = _ngrams(candidate.lower().split(), n), _ngrams(reference.lower().split(), n)
+    return _f1(sum((candidate & reference).values()), sum(candidate.values()), sum(reference.values()))
+
+
+def rouge_l(candidate, reference):
+    """ROUGE-L F1 (longest common subsequence) between two texts."""
+    a, b = candidate.lower().split(), reference.lower().split()
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(previous[j] + 1 if x == y else max(previous[j + 1], current[j]))
+        previous = current
+    return _f1(previous[-1], len(a), len(b))
+
+
+def bench_backends(args):
+    """Latency, memory and ROUGE of each summarizer backend against the PyTorch baseline."""
+    from model_registry import registry
+
+    transcripts = {minutes: make_transcript(minutes) for minutes in args.minutes}
+    backends = ["pytorch"] + [backend for backend in args.backends if backend != "pytorch"]
+    baseline = {}
+    rows = []
+    for backend in backends:
+        summarizer = meeting_summarizer.create_summarizer({
+            "lazy_models": True, "summarizer_backend": backend, "onnx_model_dir": args.onnx_model_dir,
+        })
+        summarizer.summarizer
+        load = registry.stats()["models"][f"summarization:{summarizer.summarizer_label}"]
+
+        for minutes, transcript in transcripts.items():
+            chunks = [chunk for chunk in summarizer._chunk_text(transcript) if len(chunk.strip()) > 100]
+            meeting_summarizer.chunk_summary_cache.clear()
+            start = time.perf_counter()
+            summary = "\n\n".join(summarizer._summarize_chunks(chunks))
+            wall = time.perf_counter() - start
+
+            reference = baseline.setdefault(minutes, summary)
+            rows.append([
+                backend, f"{minutes}min", len(chunks), f"{wall:.2f}s", f"{load['load_seconds']:.1f}s",
+                f"{load['rss_delta_bytes'] / 2**20:.0f}", f"{rouge_n(summary, reference, 1):.3f}",
+                f"{rouge_n(summary, reference, 2):.3f}", f"{rouge_l(summary, reference):.3f}",
+            ])
+            print(f"backend={backend} transcript={minutes}min chunks={len(chunks)} wall={wall:.2f}s")
+
+    print()
+    print_table(["backend", "transcript", "chunks", "wall", "load", "model MiB",
+                 "ROUGE-1", "ROUGE-2", "ROUGE-L"], rows)
+    print(f"\nprocess RSS {registry.stats()['process_rss_bytes'] / 2**20:.0f} MiB; ROUGE is against the pytorch summaries")
+
+
+class FakeTrelloServer:
+    """Just enough of the Trello REST API to export cards, served locally.
+
+    Every request waits latency_ms, and every rate_limit_every-th card
+    request is answered with a 429 so retries are exercised.
+    """
+
+    def __init__(self, latency_ms=20, rate_limit_every=0):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import urlparse, parse_qs
+
+        self.boards, self.lists, self.cards = [], [], []
+        self.requests = 0
+        self.rate_limited = 0
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, as the real API allows
+
+            def setup(self):
+                super().setup()
+                # Replies go out as header and body writes; don't let Nagle hold the second
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body=None, headers=()):
+                data = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _handle(self):
+                time.sleep(latency_ms / 1000.0)
+                url = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                parts = url.path.strip("/").split("/")[1:]  # Drop the /1 version prefix
+                with lock:
+                    server.requests += 1
+                    if self.command == "GET" and parts == ["members", "me", "boards"]:
+                        return self._reply(200, server.boards)
+                    if self.command == "GET" and parts[:1] == ["boards"] and parts[2:] == ["lists"]:
+                        return self._reply(200, [l for l in server.lists if l["idBoard"] == parts[1]])
+                    if self.command == "POST" and parts == ["boards"]:
+                        server.boards.append({"id": f"b{len(server.boards)}", "name": params["name"]})
+                        return self._reply(200, server.boards[-1])
+                    if self.command == "POST" and parts == ["lists"]:
+                        server.lists.append({"id": f"l{len(server.lists)}", "name": params["name"], "idBoard": params["idBoard"]})
+                        return self._reply(200, server.lists[-1])
+                    if self.command == "POST" and parts == ["cards"]:
+                        if rate_limit_every and server.requests % rate_limit_every == 0:
+                            server.rate_limited += 1
+                            return self._reply(429, {"message": "rate limited"}, [("Retry-After", "0")])
+                        server.cards.append({"id": f"c{len(server.cards)}", "name": params["name"], "idList": params["idList"]})
+                        return self._reply(200, server.cards[-1])
+                return self._reply(404, {"message": "not found"})
+
+            do_GET = do_POST = _handle
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}/1"
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def bench_export(args):
+    """Task export throughput against a local fake Trello, by concurrency."""
+    from task_export import IdempotencyStore, TaskExporter, TrelloAdapter
+
+    rows = []
+    for n_tasks in args.tasks:
+        tasks = [{"task": f"{SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)]} (#{i})", "assignee": "Not assigned"}
+                 for i in range(n_tasks)]
+        for concurrency in args.concurrency:
+            server = FakeTrelloServer(args.latency_ms, args.rate_limit_every)
+            try:
+                adapter = TrelloAdapter({"api_key": "key", "token": "token"}, base_url=server.url, backoff_seconds=0.05)
+                exporter = TaskExporter(adapter, IdempotencyStore(), concurrency)
+                first = exporter.export(tasks, {"board": "Benchmark", "list": f"run {n_tasks}x{concurrency}"}, "bench")
+                again = exporter.export(tasks, {"board": "Benchmark", "list": f"run {n_tasks}x{concurrency}"}, "bench")
+            finally:
+                server.close()
+
+            rows.append([
+                n_tasks, concurrency, f"{first['seconds']:.2f}s", f"{n_tasks / first['seconds']:.0f}",
+                first["created"], first["failed"], server.rate_limited, len(server.cards), again["existing"],
+                f"{again['seconds']:.3f}s",
+            ])
+            print(f"tasks={n_tasks} concurrency={concurrency} wall={first['seconds']:.2f}s "
+                  f"tasks/s={n_tasks / first['seconds']:.0f} retries={first['retries']}")
+
+    print()
+    print_table(["tasks", "concurrency", "wall", "tasks/s", "created", "failed", "429s",
+                 "cards on server", "re-export skipped", "re-export wall"], rows)
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))]
+
+
+def bench_live(args):
+    """Live pipeline throughput and latency, replaying a file instead of a microphone."""
+    from audio_sources import FileSource
+
+    summarizer = meeting_summarizer.create_summarizer({"lazy_models": True})
+    summarizer.speech_model
+
+    rows = []
+    for speed in args.speeds:
+        summarizer._recognizer = None
+        source = FileSource(args.input, meeting_summarizer.FRAME_RATE, speed=speed or None)
+        latencies = {"partial": [], "final": []}
+
+        start = time.perf_counter()
+        for event in summarizer.live_transcription_generator(source=source):
+            if event.get("latency_ms") is not None and event["type"] in latencies:
+                latencies[event["type"]].append(event["latency_ms"])
+        wall = time.perf_counter() - start
+        source.close()
+
+        audio_seconds = source.frames_read / meeting_summarizer.FRAME_RATE
+        label = f"{speed}x" if speed else "max"
+        rows.append([
+            label, f"{audio_seconds:.1f}s", f"{wall:.2f}s", f"{audio_seconds / wall:.1f}x",
+            len(latencies["final"]), percentile(latencies["final"], 50), percentile(latencies["final"], 95),
+            percentile(latencies["partial"], 50), summarizer._live.ring.overruns,
+        ])
+
+    print_table(["speed", "audio", "wall", "throughput", "finals", "final p50 ms", "final p95 ms",
+                 "partial p50 ms", "overrun bytes"], rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    asr = subparsers.add_parser("asr", help=bench_asr.__doc__)
+    asr.add_argument("--repeats", type=int, nargs="+", default=[1, 10, 30],
+                     help="How many times to repeat the sample recording")
+    asr.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4],
+                     help="Worker counts to compare (the CPU count is always added)")
+    asr.set_defaults(func=bench_asr)
+
+    summarization = subparsers.add_parser("summarization", help=bench_summarization.__doc__)
+    summarization.add_argument("--minutes", type=int, nargs="+", default=[5, 30, 90],
+                               help="Synthetic transcript lengths in minutes")
+    summarization.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                               help="Batch sizes to compare")
+    summarization.set_defaults(func=bench_summarization)
+
+    live = subparsers.add_parser("live", help=bench_live.__doc__)
+    live.add_argument("--input", default=SAMPLE_AUDIO, help="Audio file to replay")
+    live.add_argument("--speeds", type=float, nargs="+", default=[1.0, 10.0],
+                      help="Replay speeds (0 for as fast as possible)")
+    live.set_defaults(func=bench_live)
+
+    backends = subparsers.add_parser("backends", help=bench_backends.__doc__)
+    backends.add_argument("--backends", nargs="+", default=["pytorch", "quantized", "onnx"],
+                          help="Summarizer backends to compare (pytorch is always run as the baseline)")
+    backends.add_argument("--minutes", type=int, nargs="+", default=[5, 15, 30],
+                          help="Synthetic transcript lengths in minutes")
+    backends.add_argument("--onnx-model-dir", default=None, help="Where ONNX exports are kept")
+    backends.set_defaults(func=bench_backends)
+
+    export = subparsers.add_parser("export", help=bench_export.__doc__)
+    export.add_argument("--tasks", type=int, nargs="+", default=[100, 500], help="Action items per export")
+    export.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16], help="Export threads to compare")
+    export.add_argument("--latency-ms", type=float, default=20, help="Simulated API latency per request")
+    export.add_argument("--rate-limit-every", type=int, default=25,
+                        help="Answer every Nth card request with 429 (0 to disable)")
+    export.set_defaults(func=bench_export)
+
+    vad = subparsers.add_parser("vad", help=bench_vad.__doc__)
+    vad.add_argument("--pads", type=float, nargs="+", default=[0, 10, 30],
+                     help="Seconds of silence around each copy of the sample (0 for the sample as is)")
+    vad.add_argument("--repeats", type=int, default=3, help="Copies of the sample recording")
+    vad.add_argument("--noise-dbfs", type=float, default=None,
+                     help="Add white noise at this level, e.g. -60")
+    vad.set_defaults(func=bench_vad)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def content_key(*parts):
+    """Return a stable hex digest for the given strings/bytes."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache with hit/miss counters."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def file_key(path, *parts, block_size=1 << 20):
+    """Return a digest of a file's bytes plus extra strings, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return content_key(digest.hexdigest(), *parts)
+
+
+class DiskCache:
+    """JSON values stored as files under a directory, evicted oldest-first by size.
+
+    Reading an entry refreshes its mtime, so eviction approximates LRU.
+    """
+
+    def __init__(self, directory, max_bytes=512 * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(os.path.getsize(path) for path, _ in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        yield path, os.path.getmtime(path)
+                    except OSError:
+                        continue
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+            return value
+        except (OSError, ValueError):
+            return default
+
+    def put(self, key, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps(value).encode("utf-8")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        with self._lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self._evict_locked()
+
+    def _evict_locked(self):
+        for path, _ in sorted(self._entries(), key=lambda entry: entry[1]):
+            if self._size <= self.max_bytes:
+                break
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                self._size -= size
+            except OSError:
+                continue
+
+    def stats(self):
+        return {"directory": self.directory, "bytes": self._size, "max_bytes": self.max_bytes}
+
+
+class ResultCache:
+    """Two-tier cache: an in-memory LRU in front of an optional DiskCache.
+
+    Values must be JSON-serializable so they can live on disk.
+    """
+
+    def __init__(self, name, max_entries=256, disk_dir=None, disk_max_bytes=512 * 2**20):
+        self.name = name
+        self.memory = LRUCache(max_entries)
+        self.disk = DiskCache(os.path.join(disk_dir, name), disk_max_bytes) if disk_dir else None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.put(key, value)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
@@ -0,0 +1,143 @@
+import re
+import threading
+
+
+# Fallback sentence splitter when no spaCy sentence spans are supplied
+SENTENCE_PATTERN = re.compile(r"[^.!?\n]+[.!?]?")
+
+
+class Trigger:
+    """A phrase that marks an action item or decision.
+
+    mode "rest" captures the text following the phrase up to the end of the
+    sentence; mode "clause" captures the whole sentence clause, which suits
+    modal verbs ("Sarah should prepare slides") where the subject matters.
+    """
+
+    __slots__ = ("kind", "pattern", "mode")
+
+    def __init__(self, kind, pattern, mode="rest"):
+        if mode not in ("rest", "clause"):
+            raise ValueError(f"Unknown trigger mode: {mode}")
+        self.kind = kind
+        self.pattern = pattern
+        self.mode = mode
+
+
+class Hit:
+    """One extracted item with its character span in the scanned text."""
+
+    __slots__ = ("kind", "text", "start", "end", "trigger_start")
+
+    def __init__(self, kind, text, start, end, trigger_start):
+        self.kind = kind
+        self.text = text
+        self.start = start
+        self.end = end
+        self.trigger_start = trigger_start
+
+    def __repr__(self):
+        return f"Hit({self.kind!r}, {self.text!r}, {self.start}, {self.end})"
+
+
+# Longer phrases come first so "we agreed" wins over "agreed" at the same spot
+DEFAULT_TRIGGERS = [
+    Trigger("action", r"\b(?:TODO|To-Do|To Do)\b:?\s*"),
+    Trigger("action", r"\b(?:action item|follow up)\b:?\s*"),
+    Trigger("action", r"\b(?:assigned to|assign|task for)\s+"),
+    Trigger("action", r"\b(?:must|should|needs to|has to|will|shall)\s+", mode="clause"),
+    Trigger("decision", r"\b(?:it\s+was\s+decided|the\s+decision|we\s+agreed|the\s+team\s+concluded)\b\s*(?:to\b|that\b)?\s*"),
+    Trigger("decision", r"\b(?:decided|concluded|agreed|determined)\b\s*(?:to\b|that\b|on\b)?\s*"),
+]
+
+
+class PatternEngine:
+    """Finds action items and decisions in a single pass per sentence.
+
+    All trigger phrases are compiled into one alternation, so each sentence
+    is scanned once no matter how many triggers are registered. The text an
+    item spans is then taken directly from the sentence bounds, which avoids
+    the lazy `(.*?)` prefixes that backtrack badly on long lines.
+    """
+
+    def __init__(self, triggers=None):
+        self._triggers = list(DEFAULT_TRIGGERS if triggers is None else triggers)
+        self._lock = threading.Lock()
+        self._compile()
+
+    def _compile(self):
+        alternatives = "|".join(f"(?P<t{i}>{trigger.pattern})" for i, trigger in enumerate(self._triggers))
+        self._scanner = re.compile(alternatives or r"(?!)", re.IGNORECASE)
+
+    def add_trigger(self, kind, pattern, mode="rest"):
+        """Register an extra trigger regex; it is merged into the single scanner."""
+        with self._lock:
+            self._triggers.append(Trigger(kind, pattern, mode))
+            self._compile()
+
+    def add_phrases(self, kind, phrases, mode="rest"):
+        """Register literal trigger phrases such as "next step"."""
+        if phrases:
+            alternatives = "|".join(re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True))
+            self.add_trigger(kind, rf"\b(?:{alternatives})\b:?\s*", mode)
+
+    def scan(self, text, sentences=None, min_length=6):
+        """Return deduplicated Hits for text, scanning each sentence once.
+
+        sentences is an optional list of (start, end) character spans, e.g.
+        from a spaCy Doc; otherwise text is split on sentence punctuation.
+        """
+        if sentences is None:
+            sentences = [m.span() for m in SENTENCE_PATTERN.finditer(text)]
+
+        scanner = self._scanner
+        triggers = self._triggers
+        hits = []
+        for sent_start, sent_end in sentences:
+            # Items stop at the first full stop, as the original patterns did
+            for match in scanner.finditer(text, sent_start, sent_end):
+                trigger = triggers[int(match.lastgroup[1:])]
+                start = sent_start if trigger.mode == "clause" else match.end()
+                stop = text.find(".", match.end(), sent_end)
+                end = sent_end if stop == -1 else stop
+
+                # Trim surrounding whitespace and trailing punctuation
+                item = text[start:end]
+                stripped = item.strip().rstrip("!?;,").rstrip()
+                if len(stripped) < min_length:
+                    continue
+                start += len(item) - len(item.lstrip())
+                hits.append(Hit(trigger.kind, stripped, start, start + len(stripped), match.start()))
+
+        return self._dedupe(hits)
+
+    @staticmethod
+    def _dedupe(hits):
+        """Drop hits overlapping an earlier, longer hit of the same kind."""
+        kept = []
+        last = {}
+        for hit in sorted(hits, key=lambda h: (h.start, -(h.end - h.start))):
+            previous = last.get(hit.kind)
+            if previous is not None and hit.start < previous.end:
+                continue
+            kept.append(hit)
+            last[hit.kind] = hit
+        return kept
+
+
+default_engine = PatternEngine()
+_engines = {}
+
+
+def get_engine(action_phrases=(), decision_phrases=()):
+    """Return a shared engine with the given extra trigger phrases registered."""
+    key = (tuple(action_phrases), tuple(decision_phrases))
+    if not any(key):
+        return default_engine
+    engine = _engines.get(key)
+    if engine is None:
+        engine = PatternEngine()
+        engine.add_phrases("action", action_phrases)
+        engine.add_phrases("decision", decision_phrases)
+        _engines[key] = engine
+    return engine
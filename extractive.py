@@ -0,0 +1,82 @@
+import re
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def tfidf_matrix(sentences, stop_words=frozenset()):
+    """Sparse sentence-by-term TF-IDF matrix with L2-normalized rows."""
+    vocabulary = {}
+    rows, cols, counts = [], [], []
+    for i, sentence in enumerate(sentences):
+        terms = Counter(word for word in TOKEN_PATTERN.findall(sentence.lower()) if word not in stop_words)
+        for word, count in terms.items():
+            rows.append(i)
+            cols.append(vocabulary.setdefault(word, len(vocabulary)))
+            counts.append(count)
+
+    n = len(sentences)
+    tf = sparse.csr_matrix((np.asarray(counts, dtype=np.float64), (rows, cols)), shape=(n, len(vocabulary)))
+    document_frequency = np.bincount(np.asarray(cols, dtype=np.int64), minlength=len(vocabulary))
+    idf = np.log((1 + n) / (1 + document_frequency)) + 1
+    matrix = tf @ sparse.diags(idf)
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return (sparse.diags(1 / norms) @ matrix).tocsr()
+
+
+def textrank(matrix, damping=0.85, iterations=100, tolerance=1e-6):
+    """PageRank over the cosine-similarity graph of the rows of matrix.
+
+    The similarity matrix S = M M^T (minus its diagonal) is never built:
+    S @ v is computed as M (M^T v) - diag * v, so each iteration costs
+    O(nonzeros of M) instead of O(sentences^2).
+    """
+    n = matrix.shape[0]
+    transpose = matrix.T.tocsr()
+    self_similarity = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+
+    def similarity_dot(vector):
+        return matrix @ (transpose @ vector) - self_similarity * vector
+
+    out_weight = similarity_dot(np.ones(n))
+    out_weight[out_weight <= 1e-12] = 1
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        # S is symmetric, so the transition step P^T s is S (s / out_weight)
+        updated = (1 - damping) / n + damping * similarity_dot(scores / out_weight)
+        if np.abs(updated - scores).sum() < tolerance:
+            return updated
+        scores = updated
+    return scores
+
+
+def rank_sentences(sentences, stop_words=frozenset()):
+    """Return sentence indices ordered from most to least central."""
+    if not sentences:
+        return []
+    scores = textrank(tfidf_matrix(sentences, stop_words))
+    # Stable sort keeps earlier sentences first among equal scores
+    return np.argsort(-scores, kind="stable").tolist()
+
+
+def summarize(sentences, max_sentences=7, max_key_points=5, stop_words=frozenset(), min_length=10):
+    """Pick the most central sentences as a summary.
+
+    Returns (summary, key_points): the summary is the top max_sentences in
+    their original order, key points are the top max_key_points best first.
+    """
+    # Repeated lines ("okay", "thanks everyone") would otherwise vote for each other
+    candidates = list(dict.fromkeys(s.strip() for s in sentences if len(s.strip()) > min_length))
+    ranked = rank_sentences(candidates, stop_words)
+
+    chosen = sorted(ranked[:max_sentences])
+    summary = " ".join(candidates[i] for i in chosen)
+    key_points = [candidates[i] for i in ranked[:max_key_points]]
+    return summary, key_points
@@ -0,0 +1,232 @@
+"""Per-stage measurements for pipeline runs, and Prometheus-style histograms.
+
+A RunMetrics collects, for each named stage of one run (one meeting), the
+wall time, CPU time, memory use and item counts:
+
+    with metrics.stage("transcribe"):
+        ...
+        metrics.count("frames", n)
+
+Every finished stage is also observed in the process-wide STAGE_SECONDS
+histogram, which registry.render() exposes in the Prometheus text format.
+
+CPU time and memory are process-wide: they include library threads such as
+torch's, and any other request running at the same time. rss_delta_mb is
+the largest growth of resident memory over one call of the stage (Linux
+only); process_peak_rss_mb is the process's high-water mark since it
+started, as of the stage's end. When tracemalloc is running, peak_traced_mb
+is the peak of Python allocations in the process while the stage ran.
+"""
+import sys
+import mmap
+import time
+import threading
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process since it started in MB, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def current_rss_mb():
+    """Resident memory of this process right now in MB, or None where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * mmap.PAGESIZE / 2**20
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values, like a Prometheus histogram."""
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(label, "")) for label in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            # Counts are per bucket here and made cumulative when rendered
+            series[bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        for key, values in series:
+            labels = ",".join(f'{label}="{_escape(value)}"' for label, value in zip(self.labels, key))
+            prefix = labels + "," if labels else ""
+            total = 0
+            for bound, count in zip(self.buckets + ("+Inf",), values):
+                total += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {total}')
+            braces = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{braces} {values[-1]}")
+            lines.append(f"{self.name}_count{braces} {total}")
+        return lines
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """The histograms exposed on /metrics."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        """Return the histogram called name, creating it on first use."""
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = Histogram(name, help, labels, buckets)
+            return self._histograms[name]
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = list(self._histograms.values())
+        return "\n".join(line for histogram in histograms for line in histogram.render()) + "\n"
+
+
+registry = MetricsRegistry()
+STAGE_SECONDS = registry.histogram(
+    "meeting_summarizer_stage_seconds", "Wall time of each summarizer pipeline stage.", ("stage",))
+REQUEST_SECONDS = registry.histogram(
+    "meeting_summarizer_request_seconds", "Time to respond to each HTTP route.", ("route", "method", "status"))
+
+
+class Stage:
+    """Measurements of one named stage, summed over every time it ran."""
+
+    __slots__ = ("name", "calls", "wall_seconds", "cpu_seconds", "rss_delta_mb", "process_peak_rss_mb",
+                 "peak_traced_mb", "counts")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.rss_delta_mb = None
+        self.process_peak_rss_mb = None
+        self.peak_traced_mb = None
+        self.counts = {}
+
+    def to_dict(self):
+        stage = {
+            "calls": self.calls,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "rss_delta_mb": None if self.rss_delta_mb is None else round(self.rss_delta_mb, 1),
+            "process_peak_rss_mb": self.process_peak_rss_mb,
+        }
+        if self.peak_traced_mb is not None:
+            stage["peak_traced_mb"] = self.peak_traced_mb
+        stage.update(self.counts)
+        return stage
+
+
+# Stages open in any run, across threads. tracemalloc has one process-wide peak,
+# so before it is reset every open stage is credited with the peak reached so far.
+_traced_open = []
+_traced_lock = threading.Lock()
+
+
+def _note_traced_peak():
+    peak = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+    for stage in _traced_open:
+        stage.peak_traced_mb = max(stage.peak_traced_mb or 0, peak)
+
+
+class RunMetrics:
+    """Per-stage measurements for one run of the pipeline.
+
+    Safe to use from several threads (a live session's decode thread and
+    request threads); each thread has its own stack of open stages.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._open = {}  # thread ident -> open stages, innermost last
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """Measure the enclosed block as stage name; yields the Stage totals.
+
+        Stages may nest; count() adds to the innermost one open in the calling thread.
+        """
+        thread = threading.get_ident()
+        with self._lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = Stage(name)
+            self._open.setdefault(thread, []).append(stage)
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            with _traced_lock:
+                _note_traced_peak()
+                tracemalloc.reset_peak()
+                _traced_open.append(stage)
+        rss = current_rss_mb()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield stage
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            rss_delta = None if rss is None else current_rss_mb() - rss
+            if tracing:
+                with _traced_lock:
+                    _note_traced_peak()
+                    _traced_open.remove(stage)
+            with self._lock:
+                stage.calls += 1
+                stage.wall_seconds += wall
+                stage.cpu_seconds += cpu
+                if rss_delta is not None:
+                    stage.rss_delta_mb = max(stage.rss_delta_mb or 0.0, rss_delta)
+                stage.process_peak_rss_mb = peak_rss_mb()
+                self._open[thread].remove(stage)
+                if not self._open[thread]:
+                    del self._open[thread]
+            STAGE_SECONDS.observe(wall, stage=name)
+
+    def count(self, key, n=1):
+        """Add n to the item count key of the calling thread's innermost open stage (ignored outside any stage)."""
+        with self._lock:
+            open_stages = self._open.get(threading.get_ident())
+            if open_stages:
+                counts = open_stages[-1].counts
+                counts[key] = counts.get(key, 0) + n
+
+    def to_dict(self):
+        with self._lock:
+            return {name: stage.to_dict() for name, stage in self.stages.items()}
@@ -0,0 +1,128 @@
+import time
+import uuid
+import queue
+import logging
+import threading
+from collections import OrderedDict
+
+
+class QueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class Job:
+    """A unit of background work with per-stage progress."""
+
+    def __init__(self, stages, job_id=None):
+        self.id = job_id or uuid.uuid4().hex
+        self.status = "queued"
+        self.stages = OrderedDict((name, {"status": "pending", "done": 0, "total": 0, "percent": 0.0}) for name in stages)
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def start_stage(self, stage):
+        with self._lock:
+            self.stages[stage]["status"] = "running"
+            self.stages[stage]["started"] = time.time()
+
+    def set_progress(self, stage, done, total):
+        """Record that done of total units (frames, chunks, ...) of stage are complete."""
+        with self._lock:
+            info = self.stages[stage]
+            info["status"] = "running"
+            info["done"] = done
+            info["total"] = total
+            info["percent"] = round(100.0 * done / total, 1) if total else 0.0
+
+    def finish_stage(self, stage):
+        with self._lock:
+            info = self.stages[stage]
+            info["status"] = "done"
+            info["percent"] = 100.0
+            if "started" in info:
+                info["seconds"] = round(time.time() - info.pop("started"), 3)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "stages": {name: dict(info) for name, info in self.stages.items()},
+                "error": self.error,
+                "created": self.created,
+                "started": self.started,
+                "finished": self.finished,
+            }
+
+
+class JobQueue:
+    """Bounded in-process job queue served by a pool of worker threads.
+
+    submit() raises QueueFull once max_queue jobs are waiting, so callers
+    can push back on clients instead of letting work pile up. Finished jobs
+    are kept for polling until more than max_finished have accumulated.
+    """
+
+    def __init__(self, workers=2, max_queue=16, max_finished=200):
+        self.max_finished = max_finished
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._workers = []
+        for i in range(workers):
+            worker = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, func, stages, job_id=None):
+        """Queue func(job) for execution and return the Job immediately."""
+        job = Job(stages, job_id)
+        try:
+            self._queue.put_nowait((job, func))
+        except queue.Full:
+            raise QueueFull("Job queue is full, try again later")
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim_locked()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _trim_locked(self):
+        finished = [jid for jid, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def _run(self):
+        while True:
+            job, func = self._queue.get()
+            job.status = "running"
+            job.started = time.time()
+            try:
+                job.result = func(job)
+                job.status = "done"
+            except Exception as e:
+                logging.error(f"Job {job.id} failed: {e}")
+                job.error = str(e)
+                job.status = "failed"
+            finally:
+                job.finished = time.time()
+                self._queue.task_done()
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": len(self._workers),
+            "queued": self._queue.qsize(),
+            "max_queue": self._queue.maxsize,
+            "jobs": counts,
+        }
@@ -0,0 +1,212 @@
+import json
+import time
+import queue
+import logging
+import datetime
+import threading
+from collections import deque
+
+
+class RingBuffer:
+    """Fixed-size byte ring shared by a capture (writer) and decode (reader) thread.
+
+    If the reader falls behind by more than the capacity, the oldest audio
+    is overwritten and counted in `overruns` rather than growing memory.
+    Each write is stamped with its capture time so readers can measure
+    end-to-end latency.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._written = 0  # Total bytes ever written
+        self._read = 0     # Total bytes ever read
+        self._stamps = deque()  # (end offset, capture time) per write
+        self._cond = threading.Condition()
+        self._closed = False
+        self.overruns = 0
+
+    def write(self, data):
+        with self._cond:
+            size = len(data)
+            if size > self.capacity:
+                # Only the newest capacity bytes fit; the rest are skipped as if
+                # written and overwritten, and counted with the unread data below
+                data = data[-self.capacity:]
+                self._written += size - self.capacity
+                size = self.capacity
+
+            pos = self._written % self.capacity
+            first = min(size, self.capacity - pos)
+            self._buffer[pos:pos + first] = data[:first]
+            self._buffer[:size - first] = data[first:]
+            self._written += size
+            self._stamps.append((self._written, time.perf_counter()))
+
+            # Drop unread audio that has just been overwritten
+            if self._written - self._read > self.capacity:
+                self.overruns += self._written - self._read - self.capacity
+                self._read = self._written - self.capacity
+            while len(self._stamps) > 1 and self._stamps[0][0] <= self._read:
+                self._stamps.popleft()
+            self._cond.notify()
+
+    def read(self, size, timeout=None):
+        """Return (data, capture_time) for up to size bytes, waiting for at least one.
+
+        capture_time is when the newest returned byte was captured. Returns
+        (b"", None) once the buffer is closed and drained, or on timeout.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._written > self._read or self._closed, timeout):
+                return b"", None
+            available = self._written - self._read
+            if available == 0:
+                return b"", None
+
+            size = min(size, available)
+            pos = self._read % self.capacity
+            first = min(size, self.capacity - pos)
+            data = bytes(self._buffer[pos:pos + first]) + bytes(self._buffer[:size - first])
+            self._read += size
+
+            capture_time = None
+            for end, stamp in self._stamps:
+                if end >= self._read:
+                    capture_time = stamp
+                    break
+            while self._stamps and self._stamps[0][0] <= self._read:
+                self._stamps.popleft()
+            return data, capture_time
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    @property
+    def pending(self):
+        return self._written - self._read
+
+
+class LiveTranscriber:
+    """Runs capture and decoding on separate threads joined by a RingBuffer.
+
+    read_audio(n_frames) is called on the capture thread and must return
+    16-bit mono PCM (b"" ends the stream). Events are dicts with "type"
+    "partial" (interim text from PartialResult) or "final" (a committed
+    segment) and the measured latency from capture to recognition. An
+    optional VoiceActivityFilter keeps silence away from the recognizer;
+    event times stay on the capture timeline. on_final, if given, is called
+    with each final event on the decode thread before the event is queued,
+    so once join() returns every final result has been handled.
+    """
+
+    def __init__(self, recognizer, read_audio, sample_rate=16000, frames_per_read=1024,
+                 buffer_seconds=5, decode_bytes=3200, vad=None, on_final=None):
+        self.recognizer = recognizer
+        self.read_audio = read_audio
+        self.sample_rate = sample_rate
+        self.frames_per_read = frames_per_read
+        self.decode_bytes = decode_bytes
+        self.vad = vad
+        self.on_final = on_final
+        self.ring = RingBuffer(int(sample_rate * 2 * buffer_seconds))
+        self.events = queue.Queue()
+        self.stop_event = threading.Event()
+        self._threads = []
+        self._last_partial = ""
+
+    def start(self):
+        for target, name in ((self._capture, "live-capture"), (self._decode, "live-decode")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+
+    def join(self, timeout=None):
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _capture(self):
+        try:
+            while not self.stop_event.is_set():
+                data = self.read_audio(self.frames_per_read)
+                if not data:
+                    break
+                self.ring.write(data)
+        except Exception as e:
+            logging.error(f"Live capture stopped: {e}")
+            self.events.put({"type": "error", "message": str(e)})
+        finally:
+            self.ring.close()
+
+    def _event(self, kind, result, capture_time):
+        now = time.perf_counter()
+        event = {
+            "type": kind,
+            "text": result.get("text", result.get("partial", "")),
+            "timestamp": datetime.datetime.now().strftime("%H:%M:%S"),
+            "latency_ms": round((now - capture_time) * 1000, 1) if capture_time else None,
+        }
+        if result.get("result"):
+            if self.vad is not None:
+                self.vad.shift_result(result)
+            event["start"] = result["result"][0].get("start")
+            event["end"] = result["result"][-1].get("end")
+        return event
+
+    def _final(self, result, capture_time):
+        if not result.get("text", "").strip():
+            return
+        event = self._event("final", result, capture_time)
+        if self.on_final is not None:
+            self.on_final(event)
+        self.events.put(event)
+
+    def _decode(self):
+        try:
+            while True:
+                data, capture_time = self.ring.read(self.decode_bytes, timeout=0.5)
+                if not data:
+                    if self.ring.closed and self.ring.pending == 0:
+                        break
+                    continue
+                if self.vad is not None:
+                    data = self.vad.push(data)
+                    if not data:
+                        continue
+
+                if self.recognizer.AcceptWaveform(data):
+                    self._last_partial = ""
+                    self._final(json.loads(self.recognizer.Result()), capture_time)
+                else:
+                    partial = json.loads(self.recognizer.PartialResult())
+                    if partial.get("partial") and partial["partial"] != self._last_partial:
+                        self._last_partial = partial["partial"]
+                        self.events.put(self._event("partial", partial, capture_time))
+
+            tail = self.vad.flush() if self.vad is not None else b""
+            if tail and self.recognizer.AcceptWaveform(tail):
+                self._final(json.loads(self.recognizer.Result()), None)
+            self._final(json.loads(self.recognizer.FinalResult()), None)
+        except Exception as e:
+            logging.error(f"Live decoding stopped: {e}")
+            self.events.put({"type": "error", "message": str(e)})
+        finally:
+            self.events.put(None)
+
+    def __iter__(self):
+        """Yield events as they are produced until the stream ends."""
+        while True:
+            event = self.events.get()
+            if event is None:
+                return
+            yield event
@@ -2,229 +2,520 @@ import os
 import json
 import wave
 import re
+import copy
+import bisect
 import datetime
-import pyaudio
-from vosk import Model, KaldiRecognizer
+import time
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from vosk import KaldiRecognizer
 from pydub import AudioSegment
-from transformers import pipeline
-import spacy
-import pandas as pd
+from model_registry import registry
+from cache import LRUCache, ResultCache, content_key, file_key
+from extraction import get_engine
+from live import LiveTranscriber
+from audio_sources import MicrophoneSource
+from recorder import Recorder
+from transcription import transcribe_parallel, stream_pcm, probe_duration, decode_pcm
+from vad import VoiceActivityFilter, skipped_ratio
+from summarizer_backends import model_label
+from extractive import summarize as summarize_extractive
+from task_export import ExportError, IdempotencyStore, TaskExporter, get_adapter
+from segments import Segment, Transcript
+from rendering import ExportContext, render_output, render_custom, highlighter, highlighter_cache
+from tables import ARCHIVE_FORMATS, write_archive
+from instrumentation import RunMetrics
 
 
 # Constants
 FRAME_RATE = 16000
 CHANNELS = 1
 MODEL_PATH = "vosk-model-en-us-0.22"
-OUTPUT_FORMATS = ["text", "json", "markdown", "html", "csv"]
+SUMMARIZER_MODEL = "t5-small"
+SUMMARIZER_BACKEND = "pytorch"  # or "quantized" / "onnx", see summarizer_backends
+NLP_MODEL = "en_core_web_sm"
+SUMMARY_PREFIX_TOKENS = 8  # Room for the "summarize: " prefix T5 pipelines prepend
+MAX_SUMMARY_LEVELS = 5
+SUMMARY_ENGINES = ["abstractive", "extractive", "auto"]
+DEFAULT_CHUNK_SECONDS = 2.0  # Assumed model time per chunk until one has been measured
+OUTPUT_FORMATS = ["text", "json", "markdown", "html", "csv", "parquet"]
+DEFAULT_SECTIONS = ["summary", "key_points", "decisions", "action_items", "participants"]
 
-# Task management integration options
+# Task management integration options; credentials given per export are merged over these
 TASK_INTEGRATIONS = {
-    "jira": {"api_key": None, "url": "https://your-instance.atlassian.net"},
+    "jira": {"api_key": None, "email": None, "url": "https://your-instance.atlassian.net", "project": None},
     "trello": {"api_key": None, "token": ""},
     "asana": {"api_key": None},
-    "notion": {"token": None},
-    "github": {"token": None}
+    "notion": {"token": None, "database_id": None},
+    "github": {"token": None, "repo": None}
 }
 
-from trello import TrelloClient
-from trello.exceptions import ResourceUnavailable
-import datetime
-
 # Replace these with your actual Trello API credentials
-TRELLO_API_KEY = "05fee9ca91c6b4c5bee27c5bfb39dba5"
-TRELLO_TOKEN = "ATTA76b97f6eda7be25394115f56bcf21b73048abb5bc724678399416569c4b81f7eDEA08A16"
+TRELLO_API_KEY = os.environ.get("TRELLO_API_KEY", "05fee9ca91c6b4c5bee27c5bfb39dba5")
+TRELLO_TOKEN = os.environ.get("TRELLO_TOKEN", "ATTA76b97f6eda7be25394115f56bcf21b73048abb5bc724678399416569c4b81f7eDEA08A16")
+TASK_INTEGRATIONS["trello"].update(api_key=TRELLO_API_KEY, token=TRELLO_TOKEN)
+
+# Exported tasks by idempotency key, so re-exports don't create duplicates
+export_store = IdempotencyStore()
+export_concurrency = 8
+
 
-client = TrelloClient(
-    api_key=TRELLO_API_KEY,
-    token=TRELLO_TOKEN
-)
+def configure_task_export(state_path=None, concurrency=8):
+    """Persist the record of exported tasks to state_path and set the export concurrency."""
+    global export_store, export_concurrency
+    export_store = IdempotencyStore(state_path)
+    export_concurrency = concurrency
 
-def create_trello_tasks(board_name, tasks):
+
+def export_tasks(system_name, tasks, credentials=None, meeting_key="", target=None, base_url=None):
+    """Export tasks to a task management system through its adapter.
+
+    Tasks already exported under the same meeting_key, account and board
+    (or project, repository, database) are reported as "exists" instead of
+    being created again. Without a meeting_key the whole task list is the
+    key, so an action item repeated in a later meeting's list is still created.
+    """
+    if system_name not in TASK_INTEGRATIONS:
+        return {"error": f"Unsupported task system. Choose from: {', '.join(TASK_INTEGRATIONS.keys())}"}
+    
+    # Merge into a copy; one request's credentials must never leak into the next
+    merged = dict(TASK_INTEGRATIONS[system_name])
+    merged.update({key: value for key, value in (credentials or {}).items() if value})
     try:
-        boards = client.list_boards()
-        
-        # Find or create the board
-        board = next((b for b in boards if b.name == board_name), None)
-        if not board:
-            board = client.add_board(board_name)
+        adapter = get_adapter(system_name, merged, base_url=base_url)
+    except ExportError as e:
+        return {"error": str(e)}
+    meeting_key = meeting_key or content_key(json.dumps(tasks, sort_keys=True))
+    return TaskExporter(adapter, export_store, export_concurrency).export(tasks, target, meeting_key)
+
+
+def create_trello_tasks(board_name, tasks, meeting_key=""):
+    return export_tasks("trello", tasks, {"board": board_name}, meeting_key)
+
 
-        # Create a list for today’s tasks
-        today_list = board.add_list(f"Tasks for {datetime.datetime.now().strftime('%Y-%m-%d')}")
+class TranscriptAnalysis:
+    """A transcript parsed once by spaCy, with indexes shared by all extractors.
 
-        results = []
-        for task in tasks:
-            card = today_list.add_card(task["task"])
-            results.append({"task": task["task"], "status": "Added to Trello"})
+    source is a Transcript or a transcript string; the text analyzed is the
+    segment text without timestamps.
+    """
 
-        return {"status": "success", "results": results}
+    def __init__(self, nlp, source):
+        self.source = source
+        self.transcript = Transcript.from_text(source) if isinstance(source, str) else source
+        self.version = self.transcript.version
+        self.text = self.transcript.plain_text
+        self.doc = nlp(self.text)
+        self.sentences = [(sent.start_char, sent.end_char) for sent in self.doc.sents]
+        self.persons = [(ent.start_char, ent.end_char, ent.text) for ent in self.doc.ents if ent.label_ == "PERSON"]
+        self._person_starts = [start for start, _, _ in self.persons]
+        self.hits = None  # Filled in by MeetingSummarizer._scan_patterns
+
+    def matches(self, source):
+        """True if this analysis is still current for source."""
+        if isinstance(source, str):
+            return source == self.source
+        return source is self.transcript and source.version == self.version
+
+    def person_in(self, start, end):
+        """Return the first PERSON entity overlapping text[start:end], or None."""
+        # Entities are sorted, so skip straight to the first one that could overlap
+        i = max(bisect.bisect_right(self._person_starts, start) - 1, 0)
+        for ent_start, ent_end, name in self.persons[i:]:
+            if ent_start >= end:
+                break
+            if ent_end > start:
+                return name
+        return None
 
-    except ResourceUnavailable:
-        return {"status": "error", "message": "Trello board not found"}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+
+# Chunk summaries shared by all sessions, keyed by model and chunk text
+chunk_summary_cache = LRUCache(max_entries=4096)
+
+# Measured seconds per summarized chunk, per model label, for latency estimates
+chunk_seconds = {}
+
+# Whole-run results keyed by content; bump CACHE_VERSION when outputs change
+CACHE_VERSION = "2"
+transcript_cache = ResultCache("transcripts")
+analysis_cache = ResultCache("analyses")
+
+
+def configure_result_cache(max_entries=256, disk_dir=None, disk_max_bytes=512 * 2**20):
+    """Resize the result caches and optionally back them with an on-disk tier."""
+    global transcript_cache, analysis_cache
+    transcript_cache = ResultCache("transcripts", max_entries, disk_dir, disk_max_bytes)
+    analysis_cache = ResultCache("analyses", max_entries, disk_dir, disk_max_bytes)
+
+
+def cache_stats():
+    """Return hit/miss counts and sizes for every result cache."""
+    return {
+        "chunk_summaries": chunk_summary_cache.stats(),
+        "transcripts": transcript_cache.stats(),
+        "analyses": analysis_cache.stats(),
+        "highlighters": highlighter_cache.stats(),
+    }
 
 
 class MeetingSummarizer:
     def __init__(self, config=None):
         """Initialize the meeting summarizer with optional configuration."""
         self.config = config or {}
-        self.transcript = ""
+        self.segments = Transcript()
         self.summary = ""
         self.key_points = []
         self.decisions = []
+        self.decision_details = []
         self.action_items = []
         self.participants = set()
-        
-        # Initialize models
-        if not os.path.exists(MODEL_PATH):
-            raise FileNotFoundError(f"Vosk model not found! Download it from https://alphacephei.com/vosk/models and extract to {MODEL_PATH}")
-        
-        self.speech_model = Model(MODEL_PATH)
-        self.recognizer = KaldiRecognizer(self.speech_model, FRAME_RATE)
-        self.recognizer.SetWords(True)
-        
-        # Load NLP Models
-        self.summarizer = pipeline("summarization", model="t5-small")
-        self.nlp = spacy.load("en_core_web_sm")
-        
-    def convert_audio(self, input_path):
+        self._recognizer = None
+        self._analysis = None
+        self._live = None
+        self._recorder = None
+        self._incremental = None
+        self._incremental_lock = threading.Lock()
+        self.timings = {}
+        self.metrics = RunMetrics()  # Per-stage wall/CPU time, memory and counts for this meeting
+        self.vad_stats = None  # Frames seen and skipped by the last VAD-filtered decode
+
+        # Heavy models are shared across sessions through the process-wide
+        # registry; each summarizer only owns its recognizer and results.
+        # Set config["lazy_models"] to defer loading until a model is used.
+        start = time.perf_counter()
+        self.cold_start = not (
+            registry.is_loaded("vosk", self.config.get("model_path", MODEL_PATH))
+            and registry.is_loaded("summarization", self.summarizer_label)
+            and registry.is_loaded("spacy", self.config.get("nlp_model", NLP_MODEL))
+        )
+        if not self.config.get("lazy_models", False):
+            self.speech_model
+            self.summarizer
+            self.nlp
+        self.init_seconds = time.perf_counter() - start
+
+    @property
+    def speech_model(self):
+        return registry.get_speech_model(self.config.get("model_path", MODEL_PATH))
+
+    @property
+    def summarizer(self):
+        return registry.get_summarizer(
+            self.config.get("summarizer_model", SUMMARIZER_MODEL),
+            self.config.get("summarizer_backend", SUMMARIZER_BACKEND),
+            {"onnx_model_dir": self.config.get("onnx_model_dir")},
+        )
+
+    @property
+    def summarizer_label(self):
+        """Model and backend of the summarizer, as used in cache keys."""
+        return model_label(self.config.get("summarizer_model", SUMMARIZER_MODEL),
+                           self.config.get("summarizer_backend", SUMMARIZER_BACKEND))
+
+    @property
+    def nlp(self):
+        return registry.get_nlp(self.config.get("nlp_model", NLP_MODEL))
+
+    @property
+    def transcript(self):
+        """The transcript as "[MM:SS] text" lines, rendered from self.segments."""
+        return self.segments.render()
+
+    @transcript.setter
+    def transcript(self, text):
+        self.segments = Transcript.from_text(text or "")
+
+    @property
+    def recognizer(self):
+        """Per-session Vosk recognizer, created on first use."""
+        if self._recognizer is None:
+            self._recognizer = KaldiRecognizer(self.speech_model, FRAME_RATE)
+            self._recognizer.SetWords(True)
+        return self._recognizer
+
+    def convert_audio(self, input_path, output_path=None):
         """Converts any audio file (MP3, OGG, WAV) into WAV format for Vosk."""
         if not os.path.exists(input_path):
             raise FileNotFoundError(f"Audio file '{input_path}' not found!")
 
-        output_path = "converted_audio.wav"
+        # Write next to the input so concurrent conversions don't collide
+        if output_path is None:
+            output_path = os.path.splitext(input_path)[0] + "_converted.wav"
 
         try:
-            audio = AudioSegment.from_file(input_path)
-            audio = audio.set_channels(CHANNELS).set_frame_rate(FRAME_RATE)
-            audio.export(output_path, format="wav")
+            with self._stage("convert"):
+                audio = AudioSegment.from_file(input_path)
+                audio = audio.set_channels(CHANNELS).set_frame_rate(FRAME_RATE)
+                audio.export(output_path, format="wav")
             return output_path
         except Exception as e:
             raise RuntimeError(f"Failed to convert audio: {e}")
 
+    @contextmanager
+    def _stage(self, name):
+        """Measure a pipeline stage in self.metrics; its wall time also goes to self.timings."""
+        start = time.perf_counter()
+        with self.metrics.stage(name):
+            yield
+        self.timings[name] = time.perf_counter() - start
+
+    
+    def transcribe_audio(self, audio_path, progress=None, workers=None):
+        """Transcribes the given WAV file using Vosk with timestamps.
+
+        Results are cached by the audio bytes, so re-uploads skip decoding.
+        See _transcribe_wav for the remaining options.
+        """
+        with self._stage("transcribe"):
+            return self._cached_transcription(audio_path, progress, lambda: self._transcribe_wav(audio_path, progress, workers))
     
-    def transcribe_audio(self, audio_path):
-        """Transcribes the given WAV file using Vosk with timestamps."""
+    def _transcribe_wav(self, audio_path, progress=None, workers=None):
+        """Decode a 16 kHz mono WAV file with Vosk.
+
+        With workers > 1 (or config["transcription_workers"]) the audio is
+        split at silences and decoded on a process pool. progress, if given,
+        is called as progress(frames_decoded, total_frames).
+        """
         wf = wave.open(audio_path, "rb")
         
         if wf.getnchannels() != CHANNELS or wf.getsampwidth() != 2 or wf.getcomptype() != "NONE":
             print("Audio file must be WAV format mono PCM.")
             return ""
         
-        # Process audio in chunks
-        results = []
-        last_text = ""
+        workers = workers or self.config.get("transcription_workers", 1)
+        if workers > 1:
+            self.metrics.count("frames", wf.getnframes())
+            wf.close()
+            vad_stats = {} if self.config.get("vad") else None
+            results = transcribe_parallel(
+                audio_path,
+                self.config.get("model_path", MODEL_PATH),
+                workers=workers,
+                segment_seconds=self.config.get("transcription_segment_seconds", 60),
+                progress=progress,
+                vad_options=self.config.get("vad"),
+                vad_stats=vad_stats,
+            )
+            if vad_stats:
+                # An empty WAV still reports stats, with no frames in
+                vad_stats["skipped_ratio"] = skipped_ratio(vad_stats["frames_skipped"], vad_stats["frames_in"])
+                self.metrics.count("frames_skipped", vad_stats["frames_skipped"])
+            self.vad_stats = vad_stats
+            return self._set_transcript(results)
         
-        while True:
-            data = wf.readframes(4000)
-            if len(data) == 0:
-                break
-            
-            if self.recognizer.AcceptWaveform(data):
-                result = json.loads(self.recognizer.Result())
-                if 'text' in result and result['text'] != last_text:
-                    results.append(result)
-                    last_text = result['text']
-        
-        # Get final result
-        final_result = json.loads(self.recognizer.FinalResult())
-        if 'text' in final_result:
-            results.append(final_result)
-        
-        # Format transcript with timestamps
-        transcript = ""
-        for i, res in enumerate(results):
-            if res.get('text', '').strip():
-                # Convert from seconds to MM:SS format
-                if 'result' in res and len(res['result']) > 0:
-                    start_time = res['result'][0].get('start', 0)
-                    minutes, seconds = divmod(int(start_time), 60)
-                    timestamp = f"[{minutes:02d}:{seconds:02d}] "
-                else:
-                    timestamp = ""
-                
-                transcript += f"{timestamp}{res.get('text', '')}\n"
+        with wf:
+            blocks = iter(lambda: wf.readframes(4000), b"")
+            return self._decode_blocks(blocks, wf.getnframes(), progress)
+    
+    def transcribe_file(self, input_path, progress=None, workers=None, wav_path=None):
+        """Transcribes any audio file, with results cached by the audio bytes.
+
+        See _transcribe_stream for the options.
+        """
+        with self._stage("transcribe"):
+            return self._cached_transcription(input_path, progress, lambda: self._transcribe_stream(input_path, progress, workers, wav_path))
+    
+    def _transcribe_stream(self, input_path, progress=None, workers=None, wav_path=None):
+        """Transcribes any audio file by streaming decoded PCM into the recognizer.
+
+        Unlike convert_audio + transcribe_audio, no intermediate WAV is written
+        (unless wav_path is given) and memory use does not grow with the
+        length of the recording. Parallel decoding needs a WAV on disk, so
+        with workers > 1 one is written to a temporary file first.
+        """
+        workers = workers or self.config.get("transcription_workers", 1)
+        if workers > 1:
+            keep_wav = wav_path is not None
+            if not keep_wav:
+                fd, wav_path = tempfile.mkstemp(suffix=".wav")
+                os.close(fd)
+            try:
+                for _ in stream_pcm(input_path, FRAME_RATE, wav_path=wav_path):
+                    pass
+                return self._transcribe_wav(wav_path, progress, workers)
+            finally:
+                if not keep_wav:
+                    os.remove(wav_path)
+        
+        duration = probe_duration(input_path) if progress else None
+        total_frames = int(duration * FRAME_RATE) if duration else 0
+        blocks = stream_pcm(input_path, FRAME_RATE, wav_path=wav_path)
+        return self._decode_blocks(blocks, total_frames, progress)
+    
+    def _cached_transcription(self, audio_path, progress, transcribe):
+        """Return the cached transcript for audio_path, or run transcribe() and cache it."""
+        if not self.config.get("use_cache", True) or not os.path.exists(audio_path):
+            return transcribe()
+        
+        key = file_key(audio_path, "transcript", self.config.get("model_path", MODEL_PATH), CACHE_VERSION,
+                       json.dumps(self.config.get("vad"), sort_keys=True))
+        cached = transcript_cache.get(key)
+        if cached is not None:
+            logging.debug(f"Transcript cache hit for {audio_path}")
+            if progress:
+                progress(1, 1)
+            self.metrics.count("cache_hits")
+            self.segments = Transcript.from_list(cached["segments"])
+            return self.transcript
         
-        self.transcript = transcript
+        transcript = transcribe()
+        transcript_cache.put(key, {"segments": self.segments.to_list()})
         return transcript
     
-    def record_audio(self, seconds=600, output_filename="recorded_audio.wav"):
-        """Records audio from the microphone and saves it as WAV."""
-        p = pyaudio.PyAudio()
-        stream = p.open(format=pyaudio.paInt16, channels=CHANNELS, rate=FRAME_RATE, input=True, frames_per_buffer=1024)
+    def _decode_blocks(self, blocks, total_frames=0, progress=None):
+        """Feed 16-bit mono PCM blocks through the recognizer and store the transcript.
 
+        If config["vad"] is set (True or VoiceActivityFilter options), silent
+        stretches are skipped before decoding; timestamps still refer to the
+        original audio.
+        """
+        def counted():
+            frames_done = 0
+            for data in blocks:
+                frames_done += len(data) // 2
+                self.metrics.count("frames", len(data) // 2)
+                if progress:
+                    progress(frames_done, max(total_frames, frames_done))
+                yield data
+        
+        vad = VoiceActivityFilter.from_config(self.config, FRAME_RATE)
+        results = decode_pcm(self.recognizer, counted(), vad=vad)
+        self.vad_stats = vad.stats() if vad else None
+        if self.vad_stats:
+            self.metrics.count("frames_skipped", self.vad_stats["frames_skipped"])
+        return self._set_transcript(results)
+    
+    def _set_transcript(self, results):
+        """Store Vosk results as segments and return the [MM:SS]-prefixed transcript."""
+        self.segments = Transcript.from_vosk_results(results)
+        self.metrics.count("segments", len(self.segments))
+        return self.transcript
+    
+    def record_audio(self, seconds=600, output_filename="recorded_audio.wav", source=None, transcribe=False):
+        """Records audio from the microphone (or another AudioSource) and saves it as WAV.
+
+        Audio is written to disk as it arrives, so memory use stays flat and
+        the file is valid even if the process dies. Recording stops after
+        `seconds` (None for no limit), on stop_recording() or on Ctrl+C.
+        With transcribe=True the audio is also transcribed while recording,
+        so self.transcript is ready as soon as this returns.
+        """
+        own_source = source is None
+        if own_source:
+            source = MicrophoneSource(FRAME_RATE)
+
+        def decode(blocks):
+            # Runs on the recorder's consumer thread; stages are per thread, so open one here
+            with self._stage("transcribe"):
+                return self._decode_blocks(blocks)
+        
+        self._recorder = Recorder(
+            source, output_filename, max_seconds=seconds,
+            consumer=decode if transcribe else None,
+        )
         print("Recording... Press Ctrl+C to stop recording.")
-        frames = []
         
         try:
-            for _ in range(int(FRAME_RATE / 1024 * seconds)):
-                frames.append(stream.read(1024))
-                if _ % int(FRAME_RATE / 1024) == 0:  # Every second
-                    print(f"Recording: {_ // int(FRAME_RATE / 1024)} seconds", end="\r")
+            self._recorder.run(on_second=lambda second: print(f"Recording: {second} seconds", end="\r"))
         except KeyboardInterrupt:
             print("\nRecording stopped by user.")
         finally:
             print("\nProcessing audio...")
-            stream.stop_stream()
-            stream.close()
-            p.terminate()
-
-        with wave.open(output_filename, "wb") as wf:
-            wf.setnchannels(CHANNELS)
-            wf.setsampwidth(p.get_sample_size(pyaudio.paInt16))
-            wf.setframerate(FRAME_RATE)
-            wf.writeframes(b"".join(frames))
+            if own_source:
+                source.close()
 
         return output_filename
     
-    def live_transcription_generator(self, buffer_time=5):
-        """Generator that yields real-time transcription segments with timestamps."""
-        p = pyaudio.PyAudio()
-        stream = p.open(format=pyaudio.paInt16, channels=CHANNELS, rate=FRAME_RATE, input=True, frames_per_buffer=1024)
+    def stop_recording(self):
+        """Signal a running record_audio to stop; the WAV stays valid."""
+        if self._recorder is not None:
+            self._recorder.stop()
+    
+    def live_transcription_generator(self, buffer_time=5, source=None, summary_interval=None):
+        """Generator that yields real-time transcription events with timestamps.
+
+        A capture thread fills a ring buffer of buffer_time seconds from the
+        microphone (or the given AudioSource, e.g. a file replayed at 10x)
+        while a decode thread feeds the recognizer, so results arrive as
+        soon as Vosk produces them. Each event is a dict: "partial" events
+        carry interim text, "final" events carry a committed "segment" (also
+        appended to the transcript), and both report "latency_ms" from
+        capture to recognition. If summary_interval is set, a "summary"
+        event with the incrementally updated analysis follows the first
+        final segment after every summary_interval seconds.
+        """
+        own_source = source is None
+        if own_source:
+            source = MicrophoneSource(FRAME_RATE)
+        
+        def append_segment(event):
+            # Runs on the decode thread, so the transcript is complete once its threads are joined
+            segment = Segment(event["text"], event.get("start"), event.get("end"), stamp=event["timestamp"])
+            self.segments.append(segment)
+            event["segment"] = segment.render()
         
-        buffer = []
-        buffer_frames = int(FRAME_RATE / 1024 * buffer_time)
+        self._live = LiveTranscriber(
+            self.recognizer,
+            source.read,
+            sample_rate=FRAME_RATE,
+            buffer_seconds=buffer_time,
+            vad=VoiceActivityFilter.from_config(self.config, FRAME_RATE),
+            on_final=append_segment,
+        ).start()
         
+        last_summary = time.monotonic()
         try:
-            while True:
-                data = stream.read(1024)
-                buffer.append(data)
+            for event in self._live:
+                if event["type"] == "error":
+                    event["segment"] = f"Transcription stopped: {event['message']}"
+                yield event
                 
-                if len(buffer) > buffer_frames:
-                    # Process the oldest chunk in the buffer
-                    oldest_chunk = buffer.pop(0)
-                    if self.recognizer.AcceptWaveform(oldest_chunk):
-                        result = json.loads(self.recognizer.Result())
-                        if result.get('text', '').strip():
-                            timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-                            transcript_segment = f"[{timestamp}] {result['text']}"
-                            self.transcript += transcript_segment + "\n"
-                            yield transcript_segment
-        
-        except Exception as e:
-            # Process any remaining audio in the buffer
-            for chunk in buffer:
-                self.recognizer.AcceptWaveform(chunk)
-            final_result = json.loads(self.recognizer.FinalResult())
-            if final_result.get('text', '').strip():
-                timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-                transcript_segment = f"[{timestamp}] {final_result['text']}"
-                self.transcript += transcript_segment + "\n"
-                yield transcript_segment
-            
-            yield f"Transcription stopped: {str(e)}"
+                if event["type"] == "final" and summary_interval and time.monotonic() - last_summary >= summary_interval:
+                    last_summary = time.monotonic()
+                    results = self.process_transcript(incremental=True)
+                    yield {
+                        "type": "summary",
+                        "summary": results["summary"],
+                        "key_points": results["key_points"],
+                        "action_items": results["action_items"],
+                        "decisions": results["decisions"],
+                        "participants": results["participants"],
+                    }
         
         finally:
-            stream.stop_stream()
-            stream.close()
-            p.terminate()
+            # Let the capture thread finish its read before the device closes
+            self._live.stop()
+            self._live.join(timeout=2)
+            if own_source:
+                source.close()
     
-    def _extract_entities(self, text):
+    def stop_live_transcription(self, timeout=10):
+        """Stop a running live_transcription_generator and wait for decoding to finish.
+
+        When this returns, the recognizer's last results (including the
+        FinalResult flushed on stop) are in self.segments, so the transcript
+        can be processed straight away.
+        """
+        if self._live is not None:
+            self._live.stop()
+            self._live.join(timeout)
+    
+    def _analyze(self, text):
+        """Return the shared spaCy analysis of text (a Transcript or string), parsing it only once."""
+        if self._analysis is None or not self._analysis.matches(text):
+            with self._stage("parse"):
+                self._analysis = TranscriptAnalysis(self.nlp, text)
+                self.metrics.count("tokens", len(self._analysis.doc))
+        return self._analysis
+
+    def _extract_entities(self, text, analysis=None):
         """Extract named entities from the text."""
-        doc = self.nlp(text)
+        analysis = analysis or self._analyze(text)
         entities = {}
         
-        for ent in doc.ents:
+        for ent in analysis.doc.ents:
             if ent.label_ not in entities:
                 entities[ent.label_] = []
             entities[ent.label_].append(ent.text)
@@ -236,94 +527,225 @@ class MeetingSummarizer:
         return entities
     
     
+    def _scan_patterns(self, text, analysis=None):
+        """Return the action/decision hits for text, scanning it only once."""
+        analysis = analysis or self._analyze(text)
+        if analysis.hits is None:
+            engine = get_engine(self.config.get("action_phrases", ()), self.config.get("decision_phrases", ()))
+            analysis.hits = engine.scan(analysis.text, analysis.sentences)
+        return analysis.hits
 
-    def _extract_action_items(self, text):
+    def _extract_action_items(self, text, analysis=None):
         """Extract action items from the transcript."""
         
-        # 🛑 Remove timestamps (e.g., [00:07])
-        cleaned_text = re.sub(r"\[\d{2}:\d{2}\]", "", text).strip()
-
-        # ✅ Updated action item patterns (more precise)
-        action_patterns = [
-            r"(?:TODO|To-Do|To Do)[:]? (.+)",  # Matches "TODO: Finish report"
-            r"(?:assign|assigned to|task for)\s+(.*?)(?:\.|$)",  # Matches "Assigned to John"
-            r"(.*?)(?: must| should| needs to| has to| will| shall) (.*?)(?:\.|$)",  # Matches "Sarah should prepare slides."
-            r"(?:Action item|Follow up)[:]? (.+)",  # Matches "Action item: Schedule meeting"
-        ]
+        # The analysis holds the segment text without timestamps (e.g. [00:07])
+        analysis = analysis or self._analyze(text)
 
         action_items = []
         
-        for pattern in action_patterns:
-            matches = re.finditer(pattern, cleaned_text, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                action = match.group(1).strip()
-
-                # 🛑 Avoid very short or meaningless matches
-                if action and len(action) > 5:
-                    # ✅ Extract possible assignee
-                    doc = self.nlp(action)
-                    assignee = None
-                    for ent in doc.ents:
-                        if ent.label_ == "PERSON":
-                            assignee = ent.text
-                            break
-
-                    action_items.append({
-                        "task": action,
-                        "assignee": assignee if assignee else "Not assigned",
-                        "status": "Open",
-                        "created": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    })
+        for hit in self._scan_patterns(text, analysis):
+            if hit.kind != "action":
+                continue
+
+            # ✅ Assignee is the first PERSON entity inside the match
+            assignee = analysis.person_in(hit.start, hit.end)
+            # When the trigger phrase was said, to the word if Vosk gave word timings
+            seconds, timestamp = analysis.transcript.time_at(hit.trigger_start)
+
+            action_items.append({
+                "task": hit.text,
+                "assignee": assignee if assignee else "Not assigned",
+                "status": "Open",
+                "created": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "timestamp": timestamp,
+                "start": seconds,
+            })
 
         self.action_items = action_items
         return action_items
 
+    def _extract_decisions(self, text, analysis=None):
+        """Extract decisions made during the meeting.
+
+        Returns the decision texts; the same decisions with the time they
+        were made are kept in self.decision_details.
+        """
+        analysis = analysis or self._analyze(text)
+        details = []
+        for hit in self._scan_patterns(text, analysis):
+            if hit.kind == "decision":
+                seconds, timestamp = analysis.transcript.time_at(hit.trigger_start)
+                details.append({"text": hit.text, "timestamp": timestamp, "start": seconds})
+
+        self.decision_details = details
+        self.decisions = [detail["text"] for detail in details]
+        return self.decisions
+
     
-    
-    import re
+    def _chunk_text(self, text):
+        """Split text into pieces that fit the summarizer's maximum input length.
 
-    def _extract_decisions(self, text):
-        """Extract decisions made during the meeting."""
-        decision_patterns = [
-            r"\b(?:decided|concluded|agreed|determined)\s*(?:to|that|on)?\s*(.*?)(?:\.|$)",
-            r"\b(?:the\s+decision|it\s+was\s+decided|we\s+agreed|the\s+team\s+concluded)\s*(?:to|that)?\s*(.*?)(?:\.|$)"
+        Chunks are cut on token boundaries of the model's own tokenizer
+        rather than on word counts, so no chunk is silently truncated.
+        """
+        tokenizer = self.summarizer.tokenizer
+        max_tokens = min(
+            self.config.get("summary_max_input_tokens", 512),
+            tokenizer.model_max_length,
+        ) - SUMMARY_PREFIX_TOKENS
+        
+        token_ids = tokenizer(text, add_special_tokens=False, verbose=False)["input_ids"]
+        return [
+            tokenizer.decode(token_ids[i:i+max_tokens], skip_special_tokens=True)
+            for i in range(0, len(token_ids), max_tokens)
         ]
+    
+    def _summarize_chunks(self, chunks, progress=None):
+        """Run chunks through the summarization pipeline in batches.
 
-        decisions = []
-        for pattern in decision_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                decision = match.group(1).strip()
-                if decision and len(decision) > 5:  # Avoid short junk matches
-                    decisions.append(decision)
-
-        self.decisions = decisions
-        return decisions
+        Chunk summaries are cached process-wide by content, so text seen
+        before (e.g. the unchanged start of a growing transcript) is not
+        summarized again. The batch size comes from config["summary_batch_size"];
+        progress, if given, is called as progress(chunks_done, total_chunks).
+        """
+        keys = [content_key(self.summarizer_label, "150:30", chunk) for chunk in chunks]
+        summaries = [chunk_summary_cache.get(key) for key in keys]
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+        self.metrics.count("chunks_summarized", len(missing))
+        self.metrics.count("chunks_cached", len(chunks) - len(missing))
+        
+        batch_size = max(1, self.config.get("summary_batch_size", 4))
+        done = len(chunks) - len(missing)
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start+batch_size]
+            batch_start = time.perf_counter()
+            results = self.summarizer([chunks[i] for i in batch], max_length=150, min_length=30, do_sample=False,
+                                      truncation=True, batch_size=batch_size)
+            per_chunk = (time.perf_counter() - batch_start) / len(batch)
+            previous = chunk_seconds.get(self.summarizer_label)
+            chunk_seconds[self.summarizer_label] = per_chunk if previous is None else 0.8 * previous + 0.2 * per_chunk
+            for i, result in zip(batch, results):
+                # Depending on the transformers version each item may be wrapped in a list
+                if isinstance(result, list):
+                    result = result[0] if result else {}
+                summaries[i] = result.get("summary_text", "")
+                chunk_summary_cache.put(keys[i], summaries[i])
+            done += len(batch)
+            if progress:
+                progress(done, len(chunks))
+        
+        return [summary for summary in summaries if summary]
+    
+    def _group_summaries(self, summaries):
+        """Greedily pack consecutive summaries into groups that fit one model input."""
+        tokenizer = self.summarizer.tokenizer
+        max_tokens = min(
+            self.config.get("summary_max_input_tokens", 512),
+            tokenizer.model_max_length,
+        ) - SUMMARY_PREFIX_TOKENS
+        
+        groups = []
+        group, group_tokens = [], 0
+        for summary in summaries:
+            n_tokens = len(tokenizer(summary, add_special_tokens=False)["input_ids"])
+            if group and group_tokens + n_tokens > max_tokens:
+                groups.append(group)
+                group, group_tokens = [], 0
+            group.append(summary)
+            group_tokens += n_tokens
+        if group:
+            groups.append(group)
+        
+        # Always make progress, even if each summary alone fills the window
+        if len(groups) == len(summaries) and len(summaries) > 1:
+            groups = [summaries[i:i+2] for i in range(0, len(summaries), 2)]
+        return ["\n\n".join(group) for group in groups]
+    
+    def _summarize_hierarchical(self, chunks, progress=None):
+        """Recursively summarize chunk summaries until the result fits the target length.
 
+        Groups are packed from the start of the transcript, so when the
+        transcript grows only the groups touching the new tail change and
+        every other level is served from the chunk summary cache.
+        """
+        return self._reduce_summaries(self._summarize_chunks(chunks, progress))
+    
+    def _reduce_summaries(self, summaries):
+        """Summarize groups of summaries until they fit summary_target_tokens."""
+        tokenizer = self.summarizer.tokenizer
+        target_tokens = self.config.get("summary_target_tokens", 300)
+        
+        for level in range(1, MAX_SUMMARY_LEVELS + 1):
+            combined = "\n\n".join(summaries)
+            if len(summaries) <= 1 or len(tokenizer(combined, add_special_tokens=False)["input_ids"]) <= target_tokens:
+                break
+            logging.debug(f"Summary level {level}: reducing {len(summaries)} summaries")
+            summaries = self._summarize_chunks(self._group_summaries(summaries))
+        return summaries
     
-    def _summarize_text(self, text):
-        """Summarize the transcript text."""
+    def _summarize_text(self, text, progress=None):
+        """Summarize the transcript text.
+
+        progress, if given, is called as progress(chunks_done, total_chunks).
+        """
         if not text.strip():
             return "No significant text detected."
         
-        # Split text into manageable chunks for the model
-        tokens = text.split(" ")
-        chunk_size = 500  # Smaller chunks for better processing
-        chunks = [" ".join(tokens[i:i+chunk_size]) for i in range(0, len(tokens), chunk_size)]
+        # Split text into chunks that fit the model's input window
+        chunks = [chunk for chunk in self._chunk_text(text) if len(chunk.strip()) > 100]  # Only process substantial chunks
         
-        # Process each chunk
-        summaries = []
-        for chunk in chunks:
-            if len(chunk.strip()) > 100:  # Only process substantial chunks
-                summary = self.summarizer(chunk, max_length=150, min_length=30, do_sample=False)
-                if summary and isinstance(summary, list) and "summary_text" in summary[0]:
-                    summaries.append(summary[0]["summary_text"])
+        # Summarize the chunks in batches, optionally reducing them recursively
+        if self.config.get("summary_mode", "flat") == "hierarchical":
+            summaries = self._summarize_hierarchical(chunks, progress)
+        else:
+            summaries = self._summarize_chunks(chunks, progress)
         
-        # Combine summaries
+        return self._combine_summaries(summaries)
+    
+    def _choose_summary_engine(self, text):
+        """Decide between the T5 summarizer and the extractive fast path.
+
+        config["summary_engine"] forces one or the other; with "auto" the
+        extractive engine is used when the estimated T5 time would exceed
+        config["latency_budget_ms"]. A model that isn't loaded yet always
+        exceeds the budget, so "auto" never pays for a cold start.
+        """
+        engine = self.config.get("summary_engine", "abstractive")
+        if engine != "auto":
+            return engine
+        budget_ms = self.config.get("latency_budget_ms")
+        if budget_ms is None:
+            return "abstractive"
+        if not registry.is_loaded("summarization", self.summarizer_label):
+            return "extractive"
+        
+        # Rough chunk count from words, so estimating doesn't cost a tokenizer pass
+        max_tokens = self.config.get("summary_max_input_tokens", 512) - SUMMARY_PREFIX_TOKENS
+        chunks = -(-int(len(text.split()) * 1.3) // max_tokens)
+        seconds = chunks * chunk_seconds.get(self.summarizer_label, DEFAULT_CHUNK_SECONDS)
+        return "extractive" if seconds * 1000 > budget_ms else "abstractive"
+    
+    def _summarize_extractive(self, analysis):
+        """Summarize by picking the most central sentences of the parsed transcript (TextRank)."""
+        if not analysis.text.strip():
+            self.summary, self.key_points = "No significant text detected.", []
+            return self.summary
+        
+        sentences = [analysis.text[start:end] for start, end in analysis.sentences]
+        self.summary, self.key_points = summarize_extractive(
+            sentences,
+            max_sentences=self.config.get("extractive_sentences", 7),
+            stop_words=self.nlp.Defaults.stop_words,
+        )
+        return self.summary
+    
+    def _combine_summaries(self, summaries):
+        """Join chunk summaries into the final summary and pick the key points."""
         combined_summary = "\n\n".join(summaries)
         
-        # Extract key points
-        doc = self.nlp(combined_summary)
+        # Extract key points (only sentence boundaries are needed here)
+        disabled = [name for name in ("ner", "lemmatizer") if name in self.nlp.pipe_names]
+        doc = self.nlp(combined_summary, disable=disabled)
         key_points = [sent.text.strip() for sent in doc.sents if len(sent.text.strip()) > 10]
 
         self.key_points = key_points[:5]  # Limit to top 5 key points
@@ -331,148 +753,244 @@ class MeetingSummarizer:
         return combined_summary
 
     
-    def process_transcript(self, transcript=None):
-        """Process the transcript to extract insights."""
+    def process_transcript(self, transcript=None, progress=None, incremental=False):
+        """Process the transcript to extract insights.
+
+        progress is passed through to _summarize_text. With incremental=True
+        only text appended since the previous incremental call is analyzed
+        (see _process_incremental).
+        """
         if transcript:
             self.transcript = transcript
+        
+        if incremental:
+            return self._process_incremental(progress)
             
         # Ensure we have a transcript
         if not self.transcript:
             return {"error": "No transcript available to process"}
             
+        # Identical transcripts processed with the same models give identical results
+        cache_key = None
+        if self.config.get("use_cache", True):
+            cache_key = self._analysis_cache_key(self.transcript)
+            cached = analysis_cache.get(cache_key)
+            if cached is not None:
+                logging.debug("Analysis cache hit")
+                return self._restore_results(copy.deepcopy(cached))
+        
+        self.timings = {}
+        
         # Generate summary
-        summary = self._summarize_text(self.transcript)
+        engine = self._choose_summary_engine(self.transcript)
+        with self._stage("summary"):
+            if engine == "extractive":
+                summary = self._summarize_extractive(self._analyze(self.segments))
+            else:
+                summary = self._summarize_text(self.transcript, progress)
+        
+        # Parse the transcript once; every extractor below shares the result
+        analysis = self._analyze(self.segments)
         
         # Extract entities
-        entities = self._extract_entities(self.transcript)
+        with self._stage("entities"):
+            entities = self._extract_entities(self.segments, analysis)
+            self.metrics.count("entities", sum(len(values) for values in entities.values()))
         
         # Extract action items
-        action_items = self._extract_action_items(self.transcript)
+        with self._stage("action_items"):
+            action_items = self._extract_action_items(self.segments, analysis)
+            self.metrics.count("action_items", len(action_items))
         
         # Extract decisions
-        decisions = self._extract_decisions(self.transcript)
+        with self._stage("decisions"):
+            decisions = self._extract_decisions(self.segments, analysis)
+            self.metrics.count("decisions", len(decisions))
         
-        return {
+        results = {
             "summary": summary,
             "key_points": self.key_points,
             "entities": entities,
             "action_items": action_items,
             "decisions": decisions,
+            "decision_details": self.decision_details,
             "participants": list(self.participants),
-            "full_transcript": self.transcript
+            "full_transcript": self.transcript,
+            "summary_engine": engine,
+            "timings": {stage: round(seconds, 4) for stage, seconds in self.timings.items()}
         }
+        if cache_key:
+            analysis_cache.put(cache_key, copy.deepcopy(results))
+        return results
     
-    def generate_output(self, format_type="markdown", output_file=None):
-        """Generate formatted output based on user preference."""
-        if format_type not in OUTPUT_FORMATS:
-            return {"error": f"Unsupported format. Choose from: {', '.join(OUTPUT_FORMATS)}"}
+    def _process_incremental(self, progress=None):
+        """Analyze only the transcript lines added since the last call and merge.
+
+        Complete chunks of new text are summarized once and kept; only the
+        unfinished tail chunk is summarized again on each update. Entities,
+        action items and decisions are extracted from the new lines alone and
+        merged with earlier results, so each update costs roughly the same
+        however long the meeting has run.
+        """
+        with self._incremental_lock:
+            return self._process_incremental_locked(progress)
+    
+    def _process_incremental_locked(self, progress):
+        state = self._incremental
+        if state is None or state["transcript"] is not self.segments:
+            # First call, or the transcript was replaced rather than extended
+            state = self._incremental = {
+                "transcript": self.segments, "index": 0, "pending": "", "summaries": [],
+                "entities": {}, "action_items": [], "decisions": [],
+            }
+            self.participants = set()
         
-        meeting_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+        # Segments are only ever appended, so everything past the index is new
+        new_segments = Transcript(self.segments[state["index"]:])
+        state["index"] += len(new_segments)
+        new_text = new_segments.render()
         
-        if format_type == "text":
-            output = f"MEETING SUMMARY - {meeting_date}\n\n"
-            output += "SUMMARY:\n" + self.summary + "\n\n"
-            output += "KEY POINTS:\n" + "\n".join([f"- {point}" for point in self.key_points]) + "\n\n"
-            output += "DECISIONS:\n" + "\n".join([f"- {decision}" for decision in self.decisions]) + "\n\n"
-            output += "ACTION ITEMS:\n" + "\n".join([f"- {item['task']} " + (f"[Assigned to: {item['assignee']}]" if item['assignee'] else "") for item in self.action_items]) + "\n\n"
-            output += "PARTICIPANTS:\n" + "\n".join([f"- {participant}" for participant in self.participants]) + "\n\n"
-            output += "FULL TRANSCRIPT:\n" + self.transcript
-            
-        elif format_type == "markdown":
-            output = f"# Meeting Summary - {meeting_date}\n\n"
-            output += "## Summary\n" + self.summary + "\n\n"
-            output += "## Key Points\n" + "\n".join([f"- {point}" for point in self.key_points]) + "\n\n"
-            output += "## Decisions\n" + "\n".join([f"- {decision}" for decision in self.decisions]) + "\n\n"
-            output += "## Action Items\n" + "\n".join([f"- {item['task']} " + (f"**[Assigned to: {item['assignee']}]**" if item['assignee'] else "") for item in self.action_items]) + "\n\n"
-            output += "## Participants\n" + "\n".join([f"- {participant}" for participant in self.participants]) + "\n\n"
-            output += "## Full Transcript\n```\n" + self.transcript + "\n```"
-            
-        elif format_type == "html":
-            transcript_html = self.transcript.replace("\n", "<br>")
-            output = f"""<!DOCTYPE html>
-        <html>
-        <head>
-            <title>Meeting Summary - {meeting_date}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; max-width: 800px; margin: 0 auto; padding: 20px; }}
-                h1, h2 {{ color: #333; }}
-                .summary {{ background-color: #f5f5f5; padding: 15px; border-radius: 5px; }}
-                .action-item {{ background-color: #fffde7; padding: 10px; margin-bottom: 5px; border-left: 3px solid #fbc02d; }}
-                .assignee {{ font-weight: bold; color: #1976d2; }}
-                .transcript {{ background-color: #f5f5f5; padding: 15px; max-height: 300px; overflow-y: auto; font-family: monospace; }}
-            </style>
-        </head>
-        <body>
-            <h1>Meeting Summary - {meeting_date}</h1>
-            
-            <h2>Summary</h2>
-            <div class="summary">{self.summary}</div>
-            
-            <h2>Key Points</h2>
-            <ul>
-                {''.join(f'<li>{point}</li>' for point in self.key_points)}
-            </ul>
-            
-            <h2>Decisions</h2>
-            <ul>
-                {''.join(f'<li>{decision}</li>' for decision in self.decisions)}
-            </ul>
+        self.timings = {}
+        with self._stage("summary"):
+            if new_text.strip():
+                # Summaries: full chunks are final, the last partial chunk stays pending
+                state["pending"] += new_text
+                chunks = self._chunk_text(state["pending"])
+                if len(chunks) > 1:
+                    state["summaries"].extend(self._summarize_chunks(
+                        [chunk for chunk in chunks[:-1] if len(chunk.strip()) > 100], progress))
+                    state["pending"] = chunks[-1]
+            tail = [state["pending"]] if len(state["pending"].strip()) > 100 else []
+            summaries = state["summaries"] + self._summarize_chunks(tail)
+            if self.config.get("summary_mode", "flat") == "hierarchical":
+                summaries = self._reduce_summaries(summaries)
+            summary = self._combine_summaries(summaries) if summaries else "No significant text detected."
+        
+        if new_text.strip():
+            with self._stage("parse"):
+                analysis = TranscriptAnalysis(self.nlp, new_segments)
             
-            <h2>Action Items</h2>
-            <div>
-                {''.join(f'<div class="action-item">{item["task"]} ' + (f'<span class="assignee">[Assigned to: {item["assignee"]}]</span>' if item["assignee"] else "") + '</div>' for item in self.action_items)}
-            </div>
+            with self._stage("entities"):
+                for label, values in self._extract_entities(new_segments, analysis).items():
+                    known = state["entities"].setdefault(label, [])
+                    known.extend(value for value in values if value not in known)
             
-            <h2>Participants</h2>
-            <ul>
-                {''.join(f'<li>{participant}</li>' for participant in self.participants)}
-            </ul>
+            with self._stage("action_items"):
+                seen = {item["task"].lower() for item in state["action_items"]}
+                for item in self._extract_action_items(new_segments, analysis):
+                    if item["task"].lower() not in seen:
+                        seen.add(item["task"].lower())
+                        state["action_items"].append(item)
             
-            <h2>Full Transcript</h2>
-            <div class="transcript">{transcript_html}</div>
-        </body>
-        </html>"""
+            with self._stage("decisions"):
+                self._extract_decisions(new_segments, analysis)
+                known = {detail["text"] for detail in state["decisions"]}
+                state["decisions"].extend(detail for detail in self.decision_details if detail["text"] not in known)
+        
+        self.action_items = list(state["action_items"])
+        self.decision_details = list(state["decisions"])
+        self.decisions = [detail["text"] for detail in self.decision_details]
+        return {
+            "summary": summary,
+            "key_points": self.key_points,
+            "entities": {label: list(values) for label, values in state["entities"].items()},
+            "action_items": self.action_items,
+            "decisions": self.decisions,
+            "decision_details": self.decision_details,
+            "participants": list(self.participants),
+            "full_transcript": self.transcript,
+            "timings": {stage: round(seconds, 4) for stage, seconds in self.timings.items()}
+        }
+    
+    def _analysis_cache_key(self, transcript):
+        """Cache key covering the normalized transcript and everything that shapes the analysis."""
+        normalized = re.sub(r"[ \t]+", " ", transcript.replace("\r\n", "\n")).strip()
+        return content_key(
+            "analysis", CACHE_VERSION, normalized,
+            self.summarizer_label,
+            self.config.get("nlp_model", NLP_MODEL),
+            json.dumps({
+                key: self.config.get(key) for key in (
+                    "summary_mode", "summary_target_tokens", "summary_max_input_tokens",
+                    "action_phrases", "decision_phrases", "summary_engine", "latency_budget_ms",
+                    "extractive_sentences",
+                )
+            }, sort_keys=True, default=list),
+        )
+    
+    def _restore_results(self, results):
+        """Load a cached process_transcript result into this summarizer."""
+        self.summary = results["summary"]
+        self.key_points = results["key_points"]
+        self.action_items = results["action_items"]
+        self.decisions = results["decisions"]
+        self.decision_details = results.get("decision_details", [])
+        self.participants = set(results["participants"])
+        # Keep our own segments (and their word timings) when the text is unchanged
+        if results["full_transcript"] != self.transcript:
+            self.transcript = results["full_transcript"]
+        return results
+    
+    def export_context(self, format_options=None):
+        """Snapshot the current results and export options as a rendering.ExportContext."""
+        format_options = format_options or {}
+        meeting_date = datetime.datetime.now().strftime(format_options.get('date_format', '%Y-%m-%d %H:%M'))
 
+        # Sort action items if requested
+        sort_by = format_options.get('sort_action_items_by')
+        action_items = self.action_items.copy()
+        if sort_by and action_items:
+            if isinstance(action_items[0], dict) and sort_by in action_items[0]:
+                action_items = sorted(action_items, key=lambda x: x.get(sort_by, ''))
 
+        return ExportContext(
+            meeting_date=meeting_date,
+            summary=self.summary,
+            key_points=self.key_points,
+            decisions=self.decisions,
+            action_items=action_items,
+            participants=self.participants,
+            segments=self.segments,
+            sections=format_options.get('sections', DEFAULT_SECTIONS),
+            action_item_format=format_options.get('action_item_format', 'detailed'),
+            include_timestamps=format_options.get('include_timestamps', True),
+            max_transcript_length=format_options.get('max_transcript_length', 0),
+            decision_details=self.decision_details,
+        )
 
-            
-        elif format_type == "json":
-            output_dict = {
-                "meeting_date": meeting_date,
-                "summary": self.summary,
-                "key_points": self.key_points,
-                "decisions": self.decisions,
-                "action_items": self.action_items,
-                "participants": list(self.participants),
-                "transcript": self.transcript
-            }
-            output = json.dumps(output_dict, indent=2)
-            
-        elif format_type == "csv":
-            # Create DataFrames for each section
-            summary_df = pd.DataFrame({"Summary": [self.summary]})
-            key_points_df = pd.DataFrame({"Key Points": self.key_points})
-            decisions_df = pd.DataFrame({"Decisions": self.decisions})
-            action_items_df = pd.DataFrame(self.action_items)
-            participants_df = pd.DataFrame({"Participants": list(self.participants)})
-            
-            # Write to multiple CSV files or one combined file
+    def stream_output(self, format_type="markdown", context=None):
+        """Yield the standard export piece by piece (any OUTPUT_FORMATS entry except csv and parquet)."""
+        return render_output(format_type, context or self.export_context())
+
+    def export_tables(self, format_type="csv", context=None):
+        """Return a zip (bytes) with one CSV or Parquet table per section, including timed segments."""
+        return write_archive(context or self.export_context(), format_type)
+
+    def stream_custom_output(self, format_options=None, context=None):
+        """Yield the custom export piece by piece; see generate_custom_output for the options."""
+        format_options = format_options or {}
+        context = context or self.export_context(format_options)
+        chunks = render_custom(format_options.get('style', 'detailed'), context)
+        highlight = highlighter(format_options.get('highlight_terms', []))
+        if highlight is None:
+            return chunks
+        # Chunks never split a word, so highlighting each one is the same as highlighting the whole
+        return map(highlight, chunks)
+
+    def generate_output(self, format_type="markdown", output_file=None):
+        """Generate formatted output based on user preference."""
+        if format_type not in OUTPUT_FORMATS:
+            return {"error": f"Unsupported format. Choose from: {', '.join(OUTPUT_FORMATS)}"}
+        
+        if format_type in ARCHIVE_FORMATS:
+            # Tables are written as one zip archive, so they need a file
             if output_file:
-                base_name = os.path.splitext(output_file)[0]
-                summary_df.to_csv(f"{base_name}_summary.csv", index=False)
-                key_points_df.to_csv(f"{base_name}_key_points.csv", index=False)
-                decisions_df.to_csv(f"{base_name}_action_items.csv", index=False)
-                participants_df.to_csv(f"{base_name}_participants.csv", index=False)
-                output = f"CSV files written to {base_name}_*.csv"
-            else:
-                output = "CSV output requires a file name."
+                with open(output_file, "wb") as file:
+                    file.write(self.export_tables(format_type))
+                return f"{format_type.upper()} tables written to {output_file}"
+            return f"{format_type.upper()} output requires a file name."
         
-        # Write to file if specified
-        if output_file and format_type != "csv":
-            with open(output_file, "w", encoding="utf-8") as file:
-                file.write(output)
-                
-        return output
+        return self._write_chunks(self.stream_output(format_type), output_file)
     
     def generate_custom_output(self, format_options=None, output_file=None):
         """
@@ -493,226 +1011,48 @@ class MeetingSummarizer:
         Returns:
         str: Formatted output based on user preferences
         """
-        # Default format options if none provided
-        if format_options is None:
-            format_options = {
-                'sections': ['summary', 'key_points', 'decisions', 'action_items', 'participants'],
-                'style': 'detailed',
-                'date_format': '%Y-%m-%d %H:%M',
-                'include_timestamps': True,
-                'action_item_format': 'detailed',
-                'highlight_terms': [],
-                'sort_action_items_by': None,
-                'max_transcript_length': 0
-            }
-        
-        # Get current date/time in requested format
-        date_format = format_options.get('date_format', '%Y-%m-%d %H:%M')
-        meeting_date = datetime.datetime.now().strftime(date_format)
-        
-        # Determine which sections to include
-        sections = format_options.get('sections', ['summary', 'key_points', 'decisions', 'action_items', 'participants'])
-        
-        # Apply style template
-        style = format_options.get('style', 'detailed')
-        
-        # Process highlight terms
-        highlight_terms = format_options.get('highlight_terms', [])
-        
-        # Sort action items if requested
-        sort_by = format_options.get('sort_action_items_by')
-        action_items = self.action_items.copy()
-        if sort_by and action_items:
-            if isinstance(action_items[0], dict) and sort_by in action_items[0]:
-                action_items = sorted(action_items, key=lambda x: x.get(sort_by, ''))
-        
-        # Format action items according to preference
-        action_item_format = format_options.get('action_item_format', 'detailed')
-        
-        # Process transcript
-        max_transcript_length = format_options.get('max_transcript_length', 0)
-        transcript = self.transcript
-        
-        if max_transcript_length > 0 and len(transcript) > max_transcript_length:
-            transcript = transcript[:max_transcript_length] + "... [truncated]"
-        
-        if not format_options.get('include_timestamps', True):
-            # Remove timestamps (e.g., [00:07])
-            transcript = re.sub(r"\[\d{2}:\d{2}\]", "", transcript).strip()
-        
-        # Generate output based on style
-        if style == 'minimal':
-            output = f"Meeting Summary - {meeting_date}\n\n"
-            
-            if 'summary' in sections:
-                output += f"{self.summary}\n\n"
-            
-            if 'key_points' in sections:
-                output += "Key Points:\n" + "\n".join([f"• {point}" for point in self.key_points]) + "\n\n"
-            
-            if 'action_items' in sections:
-                output += "Action Items:\n" + "\n".join([f"• {item['task']}" for item in action_items]) + "\n\n"
-        
-        elif style == 'business':
-            output = f"MEETING SUMMARY REPORT\nDate: {meeting_date}\n\n"
-            
-            if 'summary' in sections:
-                output += "EXECUTIVE SUMMARY\n" + "="*20 + "\n" + self.summary + "\n\n"
-            
-            if 'key_points' in sections:
-                output += "KEY DISCUSSION POINTS\n" + "="*20 + "\n"
-                for i, point in enumerate(self.key_points, 1):
-                    output += f"{i}. {point}\n"
-                output += "\n"
-            
-            if 'decisions' in sections:
-                output += "DECISIONS MADE\n" + "="*20 + "\n"
-                for i, decision in enumerate(self.decisions, 1):
-                    output += f"{i}. {decision}\n"
-                output += "\n"
-            
-            if 'action_items' in sections:
-                output += "ACTION ITEMS\n" + "="*20 + "\n"
-                if action_item_format == 'detailed':
-                    for i, item in enumerate(action_items, 1):
-                        output += f"{i}. Task: {item['task']}\n"
-                        output += f"   Assignee: {item['assignee']}\n"
-                        output += f"   Status: {item['status']}\n"
-                        output += f"   Created: {item['created']}\n\n"
-                else:
-                    for i, item in enumerate(action_items, 1):
-                        output += f"{i}. {item['task']} (Assignee: {item['assignee']})\n"
-                output += "\n"
-            
-            if 'participants' in sections:
-                output += "MEETING PARTICIPANTS\n" + "="*20 + "\n"
-                for participant in self.participants:
-                    output += f"• {participant}\n"
-                output += "\n"
-            
-            if 'transcript' in sections:
-                output += "MEETING TRANSCRIPT\n" + "="*20 + "\n" + transcript + "\n"
-        
-        else:  # detailed is the default
-            output = f"# Meeting Summary - {meeting_date}\n\n"
-            
-            if 'summary' in sections:
-                output += "## Summary\n" + self.summary + "\n\n"
-            
-            if 'key_points' in sections:
-                output += "## Key Points\n" + "\n".join([f"- {point}" for point in self.key_points]) + "\n\n"
-            
-            if 'decisions' in sections:
-                output += "## Decisions\n" + "\n".join([f"- {decision}" for decision in self.decisions]) + "\n\n"
-            
-            if 'action_items' in sections:
-                output += "## Action Items\n"
-                if action_item_format == 'detailed':
-                    for item in action_items:
-                        output += f"- **Task:** {item['task']}\n"
-                        output += f"  - Assignee: {item['assignee']}\n"
-                        output += f"  - Status: {item['status']}\n"
-                        output += f"  - Created: {item['created']}\n\n"
-                elif action_item_format == 'kanban':
-                    # Group by status
-                    status_groups = {}
-                    for item in action_items:
-                        status = item['status']
-                        if status not in status_groups:
-                            status_groups[status] = []
-                        status_groups[status].append(item)
-                    
-                    for status, items in status_groups.items():
-                        output += f"### {status}\n"
-                        for item in items:
-                            output += f"- {item['task']} (Assignee: {item['assignee']})\n"
-                        output += "\n"
-                else:
-                    for item in action_items:
-                        assignee = f" [Assigned to: {item['assignee']}]" if item['assignee'] != "Not assigned" else ""
-                        output += f"- {item['task']}{assignee}\n"
-                output += "\n"
-            
-            if 'participants' in sections:
-                output += "## Participants\n" + "\n".join([f"- {participant}" for participant in self.participants]) + "\n\n"
-            
-            if 'transcript' in sections:
-                output += "## Full Transcript\n```\n" + transcript + "\n```"
-        
-        # Apply term highlighting
-        if highlight_terms:
-            for term in highlight_terms:
-                if style == 'business':
-                    replacement = f"**{term}**"
-                else:
-                    replacement = f"**{term}**"
-                output = re.sub(r'\b' + re.escape(term) + r'\b', replacement, output, flags=re.IGNORECASE)
-        
-        # Write to file if specified
-        if output_file:
-            with open(output_file, "w", encoding="utf-8") as file:
-                file.write(output)
-        
-        return output
-    
-    def export_to_task_system(self, system_name, credentials=None):
+        return self._write_chunks(self.stream_custom_output(format_options), output_file)
+
+    @staticmethod
+    def _write_chunks(chunks, output_file=None):
+        """Join streamed chunks, writing them to output_file as they arrive if given."""
+        if not output_file:
+            return "".join(chunks)
+        parts = []
+        with open(output_file, "w", encoding="utf-8") as file:
+            for chunk in chunks:
+                file.write(chunk)
+                parts.append(chunk)
+        return "".join(parts)
+    
+    def export_to_task_system(self, system_name, credentials=None, target=None):
         """Export action items to a task management system."""
         if not self.action_items:
             return {"error": "No action items to export"}
-            
-        if system_name not in TASK_INTEGRATIONS:
-            return {"error": f"Unsupported task system. Choose from: {', '.join(TASK_INTEGRATIONS.keys())}"}
-            
-        # Update credentials if provided
-        if credentials:
-            for key, value in credentials.items():
-                TASK_INTEGRATIONS[system_name][key] = value
-                
-        # Check for required credentials
-        for key, value in TASK_INTEGRATIONS[system_name].items():
-            if value is None:
-                return {"error": f"Missing required credential: {key} for {system_name}"}
-                
-        # Implement specific integrations
-        if system_name == "jira":
-            return self._export_to_jira()
-        elif system_name == "trello":
-            return self._export_to_trello()
-        elif system_name == "asana":
-            return self._export_to_asana()
-        elif system_name == "github":
-            return self._export_to_github()
-        elif system_name == "notion":
-            return self._export_to_notion()
-            
-        return {"error": "Integration not implemented yet"}
-    
-    
-    
-    def _export_to_trello(self):
-        """Export action items to Trello."""
-        # Placeholder for Trello API integration
-        print("Exporting to Trello...")
-        return {"status": "simulated", "message": "Would export action items to Trello if configured"}
-    
-    def _export_to_asana(self):
-        """Export action items to Asana."""
-        # Placeholder for Asana API integration
-        print("Exporting to Asana...")
-        return {"status": "simulated", "message": "Would export action items to Asana if configured"}
-    
-    def _export_to_github(self):
-        """Export action items to GitHub Issues."""
-        # Placeholder for GitHub API integration
-        print("Exporting to GitHub Issues...")
-        return {"status": "simulated", "message": "Would export action items to GitHub Issues if configured"}
-    
-    def _export_to_notion(self):
-        """Export action items to Notion."""
-        # Placeholder for Notion API integration
-        print("Exporting to Notion...")
-        return {"status": "simulated", "message": "Would export action items to Notion if configured"}
+        
+        return export_tasks(system_name, self.action_items, credentials, self.export_key(), target)
+
+    def export_key(self):
+        # Keyed by content, so exporting the same meeting again finds the earlier tasks
+        return content_key(self.transcript or json.dumps(self.action_items, sort_keys=True))
 
 # For import in other modules
 def create_summarizer(config=None):
-    return MeetingSummarizer(config)
\ No newline at end of file
+    return MeetingSummarizer(config)
+
+
+def preload_models(config=None):
+    """Load the shared models up front so the first request is warm."""
+    config = config or {}
+    return registry.preload(
+        speech_model_path=config.get("model_path", MODEL_PATH),
+        summarizer_model=config.get("summarizer_model", SUMMARIZER_MODEL),
+        summarizer_backend=config.get("summarizer_backend", SUMMARIZER_BACKEND),
+        summarizer_options={"onnx_model_dir": config.get("onnx_model_dir")},
+        nlp_model=config.get("nlp_model", NLP_MODEL),
+    )
+
+
+def model_stats():
+    """Return load-time and memory metrics for the shared models."""
+    return registry.stats()
\ No newline at end of file
@@ -0,0 +1,130 @@
+import os
+import time
+import logging
+import threading
+
+import summarizer_backends
+
+
+def _current_rss():
+    """Return the resident set size of this process in bytes (0 if unknown)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # ru_maxrss is the peak, in KiB on Linux and bytes on macOS
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if os.uname().sysname == "Darwin" else usage * 1024
+    except (ImportError, AttributeError):
+        return 0
+
+
+class ModelRegistry:
+    """Process-wide cache of the heavy models used by MeetingSummarizer.
+
+    Each model is loaded at most once per process, the first time it is
+    requested (or up front via preload()). Loads are guarded by a per-model
+    lock so concurrent requests wait for a single load instead of racing.
+    """
+
+    def __init__(self):
+        self._models = {}
+        self._locks = {}
+        self._registry_lock = threading.Lock()
+        self._stats = {}
+
+    def _lock_for(self, key):
+        with self._registry_lock:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def _get(self, key, loader):
+        """Return the cached model for key, loading it with loader() on a miss."""
+        model = self._models.get(key)
+        if model is not None:
+            self._stats[key]["hits"] += 1
+            return model
+
+        with self._lock_for(key):
+            # Another thread may have finished loading while we waited
+            model = self._models.get(key)
+            if model is not None:
+                self._stats[key]["hits"] += 1
+                return model
+
+            logging.debug(f"Loading model {key}")
+            rss_before = _current_rss()
+            start = time.perf_counter()
+            model = loader()
+            load_seconds = time.perf_counter() - start
+            rss_delta = _current_rss() - rss_before
+
+            self._stats[key] = {
+                "load_seconds": round(load_seconds, 3),
+                "rss_delta_bytes": max(rss_delta, 0),
+                "loaded_at": time.time(),
+                "hits": 0,
+            }
+            self._models[key] = model
+            logging.info(f"Loaded {key} in {load_seconds:.2f}s (+{rss_delta / 2**20:.1f} MiB RSS)")
+            return model
+
+    def get_speech_model(self, model_path):
+        """Return the shared Vosk model stored at model_path."""
+        def load():
+            if not os.path.exists(model_path):
+                raise FileNotFoundError(f"Vosk model not found! Download it from https://alphacephei.com/vosk/models and extract to {model_path}")
+            from vosk import Model
+            return Model(model_path)
+
+        return self._get(("vosk", model_path), load)
+
+    def get_summarizer(self, model_name="t5-small", backend=summarizer_backends.DEFAULT_BACKEND, options=None):
+        """Return the shared summarization pipeline for model_name on the given backend."""
+        def load():
+            return summarizer_backends.load(backend, model_name, options)
+
+        return self._get(("summarization", summarizer_backends.model_label(model_name, backend)), load)
+
+    def get_nlp(self, model_name="en_core_web_sm"):
+        """Return the shared spaCy pipeline."""
+        def load():
+            import spacy
+            return spacy.load(model_name)
+
+        return self._get(("spacy", model_name), load)
+
+    def preload(self, speech_model_path=None, summarizer_model="t5-small", nlp_model="en_core_web_sm",
+                summarizer_backend=summarizer_backends.DEFAULT_BACKEND, summarizer_options=None):
+        """Eagerly load all models, e.g. at server startup."""
+        if speech_model_path:
+            self.get_speech_model(speech_model_path)
+        if summarizer_model:
+            self.get_summarizer(summarizer_model, summarizer_backend, summarizer_options)
+        if nlp_model:
+            self.get_nlp(nlp_model)
+        return self.stats()
+
+    def is_loaded(self, kind, name):
+        return (kind, name) in self._models
+
+    def stats(self):
+        """Return load-time, memory and hit-count metrics for each loaded model."""
+        return {
+            "models": {f"{kind}:{name}": dict(stats) for (kind, name), stats in self._stats.items()},
+            "process_rss_bytes": _current_rss(),
+        }
+
+    def clear(self):
+        """Drop all cached models (mainly useful in tests and benchmarks)."""
+        with self._registry_lock:
+            self._models.clear()
+            self._stats.clear()
+
+
+# Shared instance used by create_summarizer()
+registry = ModelRegistry()
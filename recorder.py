@@ -0,0 +1,120 @@
+import time
+import queue
+import struct
+import threading
+
+
+class IncrementalWavWriter:
+    """Writes PCM to a WAV file as it arrives, keeping the header valid.
+
+    Frames go through a buffered file, and every header_interval seconds
+    the RIFF and data sizes are patched in place. If the process dies, the
+    file on disk is still a playable WAV, missing at most the last interval.
+    """
+
+    def __init__(self, path, sample_rate=16000, channels=1, sample_width=2,
+                 header_interval=1.0, buffer_size=64 * 1024):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.header_interval = header_interval
+        self.data_bytes = 0
+        self._file = open(path, "wb", buffering=buffer_size)
+        self._file.write(self._header())
+        self._last_fixup = time.monotonic()
+
+    def _header(self):
+        byte_rate = self.sample_rate * self.channels * self.sample_width
+        return struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF", 36 + self.data_bytes, b"WAVE",
+            b"fmt ", 16, 1, self.channels, self.sample_rate, byte_rate,
+            self.channels * self.sample_width, self.sample_width * 8,
+            b"data", self.data_bytes,
+        )
+
+    def write(self, data):
+        self._file.write(data)
+        self.data_bytes += len(data)
+        if time.monotonic() - self._last_fixup >= self.header_interval:
+            self.fix_header()
+
+    def fix_header(self):
+        """Patch the size fields so the file is valid up to the data written so far."""
+        self._file.flush()
+        end = self._file.tell()
+        self._file.seek(4)
+        self._file.write(struct.pack("<I", 36 + self.data_bytes))
+        self._file.seek(40)
+        self._file.write(struct.pack("<I", self.data_bytes))
+        self._file.seek(end)
+        self._file.flush()
+        self._last_fixup = time.monotonic()
+
+    @property
+    def seconds(self):
+        return self.data_bytes / (self.sample_rate * self.channels * self.sample_width)
+
+    def close(self):
+        if not self._file.closed:
+            self.fix_header()
+            self._file.close()
+
+
+class Recorder:
+    """Copies an AudioSource to disk until stopped, optionally handing chunks
+    to a consumer (e.g. a recognizer) on a separate thread as they arrive.
+    """
+
+    def __init__(self, source, output_path, max_seconds=None, stop_event=None,
+                 frames_per_read=1024, consumer=None):
+        self.source = source
+        self.writer = IncrementalWavWriter(output_path, source.sample_rate, sample_width=source.sample_width)
+        self.max_seconds = max_seconds
+        self.stop_event = stop_event or threading.Event()
+        self.frames_per_read = frames_per_read
+        self.consumer = consumer
+        self._chunks = queue.Queue() if consumer else None
+        self._consumer_thread = None
+
+    def _chunk_iter(self):
+        return iter(self._chunks.get, None)
+
+    def run(self, on_second=None):
+        """Record until stop_event is set, max_seconds pass or the source ends.
+
+        Returns the consumer's result if a consumer was given, else None.
+        """
+        result = {}
+        if self.consumer:
+            self._consumer_thread = threading.Thread(
+                target=lambda: result.update(value=self.consumer(self._chunk_iter())),
+                name="recorder-consumer", daemon=True)
+            self._consumer_thread.start()
+
+        last_second = -1
+        try:
+            while not self.stop_event.is_set():
+                if self.max_seconds and self.writer.seconds >= self.max_seconds:
+                    break
+                data = self.source.read(self.frames_per_read)
+                if not data:
+                    break
+                self.writer.write(data)
+                if self._chunks is not None:
+                    self._chunks.put(data)
+                if on_second and int(self.writer.seconds) != last_second:
+                    last_second = int(self.writer.seconds)
+                    on_second(last_second)
+        finally:
+            self.writer.close()
+            if self._chunks is not None:
+                self._chunks.put(None)
+            # The consumer drains whatever is queued, even after an interrupt
+            if self._consumer_thread:
+                self._consumer_thread.join()
+        return result.get("value")
+
+    def stop(self):
+        self.stop_event.set()
@@ -0,0 +1,307 @@
+"""Streaming renderers for meeting exports.
+
+A Template is a sequence of literal text and parts that generate text from
+an ExportContext. Templates are compiled once at import (adjacent literals
+merged, optional sections resolved per render), and render() yields the
+document piece by piece, so a response can be streamed without ever
+holding the whole document, or more than one transcript line, in memory.
+"""
+import re
+import json
+import html
+
+from cache import LRUCache
+
+
+class ExportContext:
+    """A snapshot of a summarizer's results plus the options for one export."""
+
+    __slots__ = ("meeting_date", "summary", "key_points", "decisions", "action_items", "participants",
+                 "segments", "sections", "action_item_format", "include_timestamps", "max_transcript_length",
+                 "decision_details")
+
+    def __init__(self, meeting_date, summary, key_points, decisions, action_items, participants, segments,
+                 sections=(), action_item_format="detailed", include_timestamps=True, max_transcript_length=0,
+                 decision_details=()):
+        self.meeting_date = meeting_date
+        self.summary = summary
+        self.key_points = list(key_points)
+        self.decisions = list(decisions)
+        self.action_items = list(action_items)
+        self.participants = list(participants)
+        self.segments = list(segments)
+        self.sections = frozenset(sections)
+        self.action_item_format = action_item_format
+        self.include_timestamps = include_timestamps
+        self.max_transcript_length = max_transcript_length
+        self.decision_details = list(decision_details)
+
+
+class Template:
+    """Literal strings and callables (ctx -> iterable of str), rendered in order."""
+
+    def __init__(self, *parts):
+        compiled = []
+        for part in parts:
+            if isinstance(part, str) and compiled and isinstance(compiled[-1], str):
+                compiled[-1] += part
+            else:
+                compiled.append(part)
+        self.parts = tuple(compiled)
+
+    def render(self, ctx):
+        for part in self.parts:
+            if isinstance(part, str):
+                yield part
+            else:
+                yield from part(ctx)
+
+
+def value(getter, escape=str):
+    """A part yielding one value computed from the context."""
+    return lambda ctx: (escape(getter(ctx)),)
+
+
+def each(field, line, sep="\n", start=None):
+    """A part yielding line(item) (or line(i, item) when numbered from start) per item of ctx.field."""
+    def part(ctx):
+        for i, item in enumerate(getattr(ctx, field)):
+            text = line(i + start, item) if start is not None else line(item)
+            yield text if i == 0 or not sep else sep + text
+    return part
+
+
+def section(name, *parts):
+    """Parts that are only rendered when name is in ctx.sections."""
+    template = Template(*parts)
+    return lambda ctx: template.render(ctx) if name in ctx.sections else ()
+
+
+def by_action_format(**templates):
+    """Render the template matching ctx.action_item_format ("other" as the fallback)."""
+    compiled = {name: Template(*parts) for name, parts in templates.items()}
+    return lambda ctx: compiled.get(ctx.action_item_format, compiled["other"]).render(ctx)
+
+
+def transcript(escape=None, line_end="\n"):
+    """The transcript one segment at a time, honoring timestamps and truncation options."""
+    def part(ctx):
+        limit = ctx.max_transcript_length
+        written = 0
+        for segment in ctx.segments:
+            line = segment.render(ctx.include_timestamps)
+            if limit > 0 and written + len(line) + 1 > limit:
+                yield escape(line[:limit - written]) if escape else line[:limit - written]
+                yield "... [truncated]"
+                return
+            written += len(line) + 1
+            if escape:
+                line = escape(line)
+            yield line + line_end
+    return part
+
+
+def _assignee(item):
+    return item.get("assignee") or ""
+
+
+def _json_field(name, getter, last=False):
+    """One "name": value line of a pretty-printed (indent=2) JSON object."""
+    def part(ctx):
+        encoded = json.dumps(getter(ctx), indent=2).replace("\n", "\n  ")
+        yield f'  "{name}": {encoded}' + ("\n" if last else ",\n")
+    return part
+
+
+def _json_transcript(ctx):
+    # The transcript is one JSON string; encode it line by line instead of all at once
+    yield '  "transcript": "'
+    for segment in ctx.segments:
+        yield json.dumps(segment.render() + "\n")[1:-1]
+    yield '"\n'
+
+
+_html_text = lambda text: html.escape(str(text), quote=False)
+
+OUTPUT_TEMPLATES = {
+    "text": Template(
+        "MEETING SUMMARY - ", value(lambda c: c.meeting_date), "\n\n",
+        "SUMMARY:\n", value(lambda c: c.summary), "\n\n",
+        "KEY POINTS:\n", each("key_points", lambda p: f"- {p}"), "\n\n",
+        "DECISIONS:\n", each("decisions", lambda d: f"- {d}"), "\n\n",
+        "ACTION ITEMS:\n", each("action_items", lambda i: f"- {i['task']} " + (f"[Assigned to: {i['assignee']}]" if _assignee(i) else "")), "\n\n",
+        "PARTICIPANTS:\n", each("participants", lambda p: f"- {p}"), "\n\n",
+        "FULL TRANSCRIPT:\n", transcript(),
+    ),
+    "markdown": Template(
+        "# Meeting Summary - ", value(lambda c: c.meeting_date), "\n\n",
+        "## Summary\n", value(lambda c: c.summary), "\n\n",
+        "## Key Points\n", each("key_points", lambda p: f"- {p}"), "\n\n",
+        "## Decisions\n", each("decisions", lambda d: f"- {d}"), "\n\n",
+        "## Action Items\n", each("action_items", lambda i: f"- {i['task']} " + (f"**[Assigned to: {i['assignee']}]**" if _assignee(i) else "")), "\n\n",
+        "## Participants\n", each("participants", lambda p: f"- {p}"), "\n\n",
+        "## Full Transcript\n```\n", transcript(), "\n```",
+    ),
+    "html": Template(
+        """<!DOCTYPE html>
+        <html>
+        <head>
+            <title>Meeting Summary - """, value(lambda c: c.meeting_date, _html_text), """</title>
+            <style>
+                body { font-family: Arial, sans-serif; line-height: 1.6; max-width: 800px; margin: 0 auto; padding: 20px; }
+                h1, h2 { color: #333; }
+                .summary { background-color: #f5f5f5; padding: 15px; border-radius: 5px; }
+                .action-item { background-color: #fffde7; padding: 10px; margin-bottom: 5px; border-left: 3px solid #fbc02d; }
+                .assignee { font-weight: bold; color: #1976d2; }
+                .transcript { background-color: #f5f5f5; padding: 15px; max-height: 300px; overflow-y: auto; font-family: monospace; }
+            </style>
+        </head>
+        <body>
+            <h1>Meeting Summary - """, value(lambda c: c.meeting_date, _html_text), """</h1>
+
+            <h2>Summary</h2>
+            <div class="summary">""", value(lambda c: c.summary, _html_text), """</div>
+
+            <h2>Key Points</h2>
+            <ul>
+                """, each("key_points", lambda p: f"<li>{_html_text(p)}</li>", sep=""), """
+            </ul>
+
+            <h2>Decisions</h2>
+            <ul>
+                """, each("decisions", lambda d: f"<li>{_html_text(d)}</li>", sep=""), """
+            </ul>
+
+            <h2>Action Items</h2>
+            <div>
+                """, each("action_items", lambda i: f'<div class="action-item">{_html_text(i["task"])} '
+                          + (f'<span class="assignee">[Assigned to: {_html_text(i["assignee"])}]</span>' if _assignee(i) else "")
+                          + "</div>", sep=""), """
+            </div>
+
+            <h2>Participants</h2>
+            <ul>
+                """, each("participants", lambda p: f"<li>{_html_text(p)}</li>", sep=""), """
+            </ul>
+
+            <h2>Full Transcript</h2>
+            <div class="transcript">""", transcript(escape=_html_text, line_end="<br>"), """</div>
+        </body>
+        </html>""",
+    ),
+    "json": Template(
+        "{\n",
+        _json_field("meeting_date", lambda c: c.meeting_date),
+        _json_field("summary", lambda c: c.summary),
+        _json_field("key_points", lambda c: c.key_points),
+        _json_field("decisions", lambda c: c.decisions),
+        _json_field("action_items", lambda c: c.action_items),
+        _json_field("participants", lambda c: c.participants),
+        _json_transcript,
+        "}",
+    ),
+}
+
+
+def _kanban(ctx):
+    groups = {}
+    for item in ctx.action_items:
+        groups.setdefault(item["status"], []).append(item)
+    for status, items in groups.items():
+        yield f"### {status}\n"
+        for item in items:
+            yield f"- {item['task']} (Assignee: {item['assignee']})\n"
+        yield "\n"
+
+
+CUSTOM_TEMPLATES = {
+    "minimal": Template(
+        "Meeting Summary - ", value(lambda c: c.meeting_date), "\n\n",
+        section("summary", value(lambda c: c.summary), "\n\n"),
+        section("key_points", "Key Points:\n", each("key_points", lambda p: f"• {p}"), "\n\n"),
+        section("action_items", "Action Items:\n", each("action_items", lambda i: f"• {i['task']}"), "\n\n"),
+    ),
+    "business": Template(
+        "MEETING SUMMARY REPORT\nDate: ", value(lambda c: c.meeting_date), "\n\n",
+        section("summary", "EXECUTIVE SUMMARY\n", "=" * 20, "\n", value(lambda c: c.summary), "\n\n"),
+        section("key_points", "KEY DISCUSSION POINTS\n", "=" * 20, "\n",
+                each("key_points", lambda i, p: f"{i}. {p}\n", sep="", start=1), "\n"),
+        section("decisions", "DECISIONS MADE\n", "=" * 20, "\n",
+                each("decisions", lambda i, d: f"{i}. {d}\n", sep="", start=1), "\n"),
+        section("action_items", "ACTION ITEMS\n", "=" * 20, "\n", by_action_format(
+            detailed=[each("action_items", lambda i, item: f"{i}. Task: {item['task']}\n"
+                           f"   Assignee: {item['assignee']}\n"
+                           f"   Status: {item['status']}\n"
+                           f"   Created: {item['created']}\n\n", sep="", start=1)],
+            other=[each("action_items", lambda i, item: f"{i}. {item['task']} (Assignee: {item['assignee']})\n", sep="", start=1)],
+        ), "\n"),
+        section("participants", "MEETING PARTICIPANTS\n", "=" * 20, "\n",
+                each("participants", lambda p: f"• {p}\n", sep=""), "\n"),
+        section("transcript", "MEETING TRANSCRIPT\n", "=" * 20, "\n", transcript(), "\n"),
+    ),
+    "detailed": Template(
+        "# Meeting Summary - ", value(lambda c: c.meeting_date), "\n\n",
+        section("summary", "## Summary\n", value(lambda c: c.summary), "\n\n"),
+        section("key_points", "## Key Points\n", each("key_points", lambda p: f"- {p}"), "\n\n"),
+        section("decisions", "## Decisions\n", each("decisions", lambda d: f"- {d}"), "\n\n"),
+        section("action_items", "## Action Items\n", by_action_format(
+            detailed=[each("action_items", lambda item: f"- **Task:** {item['task']}\n"
+                           f"  - Assignee: {item['assignee']}\n"
+                           f"  - Status: {item['status']}\n"
+                           f"  - Created: {item['created']}\n\n", sep="")],
+            kanban=[_kanban],
+            other=[each("action_items", lambda item: f"- {item['task']}"
+                        + (f" [Assigned to: {item['assignee']}]" if item['assignee'] != "Not assigned" else "") + "\n", sep="")],
+        ), "\n"),
+        section("participants", "## Participants\n", each("participants", lambda p: f"- {p}"), "\n\n"),
+        section("transcript", "## Full Transcript\n```\n", transcript(), "\n```"),
+    ),
+}
+
+MIMETYPES = {
+    "text": "text/plain",
+    "markdown": "text/markdown",
+    "html": "text/html",
+    "json": "application/json",
+}
+EXTENSIONS = {"text": "txt", "markdown": "md", "html": "html", "json": "json"}
+
+
+# Compiled highlighters by term list; glossaries are usually reused across requests
+highlighter_cache = LRUCache(max_entries=256)
+
+
+def highlighter(terms):
+    """Return a function that wraps every whole-word match of any term in **bold**.
+
+    All terms go into one case-insensitive alternation (longest first, so
+    "action item" wins over "action"), so a chunk is scanned once however
+    many terms there are. Matches are replaced by the term as given.
+    Returns None when there are no terms.
+    """
+    key = tuple(term for term in terms if term)
+    if not key:
+        return None
+    highlight = highlighter_cache.get(key)
+    if highlight is None:
+        spelling = {}
+        for term in key:
+            spelling.setdefault(term.lower(), term)
+        pattern = re.compile(
+            r"\b(?:" + "|".join(re.escape(term) for term in sorted(spelling.values(), key=len, reverse=True)) + r")\b",
+            re.IGNORECASE
+        )
+        replace = lambda match: f"**{spelling.get(match.group(0).lower(), match.group(0))}**"
+        highlight = lambda text: pattern.sub(replace, text)
+        highlighter_cache.put(key, highlight)
+    return highlight
+
+
+def render_output(format_type, ctx):
+    """Yield the standard export in format_type (text, markdown, html or json)."""
+    return OUTPUT_TEMPLATES[format_type].render(ctx)
+
+
+def render_custom(style, ctx):
+    """Yield the custom export for style (minimal, business or detailed; unknown styles are detailed)."""
+    return CUSTOM_TEMPLATES.get(style, CUSTOM_TEMPLATES["detailed"]).render(ctx)
@@ -0,0 +1,194 @@
+import re
+import bisect
+from array import array
+
+
+# Line prefixes written for recorded audio ([MM:SS]) and live sessions ([HH:MM:SS])
+STAMP_PATTERN = re.compile(r"\[(\d{2,}):(\d{2})(?::(\d{2}))?\] ?")
+
+
+def format_timestamp(seconds):
+    """Format an offset in seconds as MM:SS, the way transcripts are stamped."""
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+class Segment:
+    """One recognized utterance with its timing and per-word detail.
+
+    start and end are offsets in seconds from the start of the audio (None
+    when unknown). stamp overrides the rendered [MM:SS] prefix, e.g. with
+    the wall-clock time of a live segment. Word timings are kept in flat
+    arrays rather than one dict per word, so long meetings stay small.
+    """
+
+    __slots__ = ("text", "start", "end", "stamp", "words", "word_starts", "word_ends", "confidences")
+
+    def __init__(self, text, start=None, end=None, stamp=None, words=(),
+                 word_starts=(), word_ends=(), confidences=()):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.stamp = stamp
+        self.words = tuple(words)
+        self.word_starts = array("d", word_starts)
+        self.word_ends = array("d", word_ends)
+        self.confidences = array("f", confidences)
+
+    @classmethod
+    def from_vosk(cls, result, stamp=None):
+        """Build a segment from a Vosk Result()/FinalResult() dict (SetWords(True))."""
+        words = result.get("result") or []
+        return cls(
+            result.get("text", "").strip(),
+            start=words[0].get("start", 0) if words else None,
+            end=words[-1].get("end") if words else None,
+            stamp=stamp,
+            words=[word.get("word", "") for word in words],
+            word_starts=[word.get("start", 0) for word in words],
+            word_ends=[word.get("end", 0) for word in words],
+            confidences=[word.get("conf", 1.0) for word in words],
+        )
+
+    @property
+    def label(self):
+        """The timestamp shown for this segment, or None if it has none."""
+        if self.stamp is not None:
+            return self.stamp
+        if self.start is not None:
+            return format_timestamp(self.start)
+        return None
+
+    def render(self, include_timestamps=True):
+        label = self.label if include_timestamps else None
+        return f"[{label}] {self.text}" if label else self.text
+
+    def time_at(self, offset):
+        """Start time of the word at character offset in self.text.
+
+        Falls back to the segment start when there are no word timings.
+        """
+        if not self.words:
+            return self.start
+        # Vosk's text is its words joined by single spaces
+        position = 0
+        for i, word in enumerate(self.words):
+            position += len(word) + 1
+            if offset < position:
+                return self.word_starts[i]
+        return self.word_starts[-1]
+
+    def to_dict(self):
+        return {
+            "text": self.text, "start": self.start, "end": self.end, "stamp": self.stamp,
+            "words": list(self.words), "word_starts": self.word_starts.tolist(),
+            "word_ends": self.word_ends.tolist(), "confidences": self.confidences.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def __repr__(self):
+        return f"Segment({self.text!r}, start={self.start}, end={self.end})"
+
+
+class Transcript:
+    """An ordered list of segments; the text forms are rendered on demand.
+
+    render() gives the familiar "[MM:SS] text" lines and plain_text the
+    same lines without stamps, which is what the extractors scan. Both are
+    cached until the next append. segment_at() maps a character offset in
+    plain_text back to its segment, so extracted items can carry the time
+    they were said.
+    """
+
+    def __init__(self, segments=()):
+        self.segments = list(segments)
+        self.version = 0  # Bumped on every change, so analyses know when they're stale
+        self._text = None
+        self._plain = None
+        self._offsets = None
+
+    @classmethod
+    def from_vosk_results(cls, results):
+        return cls(segment for segment in map(Segment.from_vosk, results) if segment.text)
+
+    @classmethod
+    def from_text(cls, text):
+        """Parse a transcript string, reading any [MM:SS] or [HH:MM:SS] line prefixes."""
+        segments = []
+        for line in text.splitlines():
+            match = STAMP_PATTERN.match(line.strip())
+            if match is None:
+                if line.strip():
+                    segments.append(Segment(line.strip()))
+                continue
+            body = line.strip()[match.end():]
+            first, second, third = match.groups()
+            if third is None:
+                segments.append(Segment(body, start=int(first) * 60 + int(second)))
+            else:
+                # Wall-clock time of a live segment, not an offset into the audio
+                segments.append(Segment(body, stamp=f"{first}:{second}:{third}"))
+        transcript = cls(segments)
+        # Hand back exactly what was given until the transcript changes
+        transcript._text = text
+        return transcript
+
+    def to_list(self):
+        return [segment.to_dict() for segment in self.segments]
+
+    @classmethod
+    def from_list(cls, data):
+        return cls(Segment.from_dict(item) for item in data)
+
+    def append(self, segment):
+        self.segments.append(segment)
+        self.version += 1
+        self._text = self._plain = self._offsets = None
+
+    def render(self, include_timestamps=True):
+        if not include_timestamps:
+            return "".join(segment.text + "\n" for segment in self.segments)
+        if self._text is None:
+            self._text = "".join(segment.render() + "\n" for segment in self.segments)
+        return self._text
+
+    @property
+    def plain_text(self):
+        if self._plain is None:
+            offsets, position = [], 0
+            for segment in self.segments:
+                offsets.append(position)
+                position += len(segment.text) + 1
+            self._offsets = offsets
+            self._plain = "\n".join(segment.text for segment in self.segments)
+        return self._plain
+
+    def segment_at(self, offset):
+        """Return (segment, offset within it) for a character offset in plain_text."""
+        if not self.segments:
+            return None, 0
+        self.plain_text
+        i = max(bisect.bisect_right(self._offsets, offset) - 1, 0)
+        return self.segments[i], offset - self._offsets[i]
+
+    def time_at(self, offset):
+        """Return (seconds, label) for the moment a plain_text offset was said."""
+        segment, local = self.segment_at(offset)
+        if segment is None:
+            return None, None
+        seconds = segment.time_at(local)
+        if segment.stamp is not None:
+            return seconds, segment.stamp
+        return seconds, format_timestamp(seconds) if seconds is not None else None
+
+    def __len__(self):
+        return len(self.segments)
+
+    def __iter__(self):
+        return iter(self.segments)
+
+    def __getitem__(self, index):
+        return self.segments[index]
@@ -0,0 +1,141 @@
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class Session:
+    """A summarizer plus the bookkeeping needed to share it between requests."""
+
+    def __init__(self, session_id, summarizer):
+        self.id = session_id
+        self.summarizer = summarizer
+        self.lock = threading.RLock()
+        self._streams_lock = threading.Lock()
+        self.worker = None  # Background thread working on this session, if any
+        self.streams = 0  # Live SSE/WebSocket streams feeding this session
+        self.created = time.time()
+        self.last_access = self.created
+
+    def touch(self):
+        self.last_access = time.time()
+
+    @property
+    def busy(self):
+        """True while a background worker or a live stream is still running; busy sessions are never evicted."""
+        return self.streams > 0 or (self.worker is not None and self.worker.is_alive())
+
+    @contextmanager
+    def streaming(self):
+        """Pin the session for the duration of a live stream."""
+        with self._streams_lock:
+            self.streams += 1
+        try:
+            yield self
+        finally:
+            with self._streams_lock:
+                self.streams -= 1
+            self.touch()
+
+    def close(self):
+        """Stop any recording or live transcription still feeding this session."""
+        try:
+            self.summarizer.stop_recording()
+            self.summarizer.stop_live_transcription(timeout=0)
+        except Exception as e:
+            logging.error(f"Stopping session {self.id} failed: {e}")
+
+
+class SessionStore:
+    """Thread-safe store of meeting sessions keyed by session ID.
+
+    Sessions expire after ttl_seconds without access, and once more than
+    max_sessions are held the least recently used one is evicted. Busy
+    sessions (a background recording or a live stream still running) are
+    kept however long they run, so they can still be stopped. Each session
+    carries its own lock so work on different meetings never serializes
+    behind a single object.
+    """
+
+    def __init__(self, max_sessions=100, ttl_seconds=3600):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def create(self, summarizer, session_id=None):
+        """Store a summarizer under a new (or given) session ID and return the session."""
+        session = Session(session_id or uuid.uuid4().hex, summarizer)
+        with self._lock:
+            self._sessions[session.id] = session
+            self._sessions.move_to_end(session.id)
+            evicted = self._evict_locked(keep=session)
+        self._close(evicted)
+        return session
+
+    def get(self, session_id):
+        """Return the live session for session_id, or None if unknown or expired."""
+        if not session_id:
+            return None
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if not self._expired(session, time.time()):
+                session.touch()
+                self._sessions.move_to_end(session_id)
+                return session
+            del self._sessions[session_id]
+            self.evictions += 1
+        session.close()
+        return None
+
+    def remove(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None)
+
+    def _expired(self, session, now):
+        return self.ttl_seconds and now - session.last_access > self.ttl_seconds and not session.busy
+
+    def _evict_locked(self, keep=None):
+        """Drop expired sessions, then idle ones other than keep from the LRU end; returns the sessions dropped."""
+        now = time.time()
+        evicted = [s for s in self._sessions.values() if self._expired(s, now)]
+        excess = len(self._sessions) - len(evicted) - self.max_sessions
+        if excess > 0:
+            # Oldest first; if every session is busy the store stays over max_sessions for a while
+            idle = [s for s in self._sessions.values() if s not in evicted and s is not keep and not s.busy]
+            evicted.extend(idle[:excess])
+        for session in evicted:
+            del self._sessions[session.id]
+        self.evictions += len(evicted)
+        return evicted
+
+    @staticmethod
+    def _close(evicted):
+        # Outside the store lock: stopping a recorder can wait on its threads
+        for session in evicted:
+            session.close()
+
+    def sweep(self):
+        """Drop expired sessions; returns the number still held."""
+        with self._lock:
+            evicted = self._evict_locked()
+            held = len(self._sessions)
+        self._close(evicted)
+        return held
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,70 @@
+"""Loaders for the summarization model, selected by config["summarizer_backend"].
+
+Every backend returns a transformers summarization pipeline (or an object
+with the same call signature and a .tokenizer), so MeetingSummarizer does
+not care which one it is talking to:
+
+    pytorch    the full-precision model, as before (default)
+    quantized  the same weights with Linear layers dynamically quantized to int8
+    onnx       the model exported to ONNX and run with ONNX Runtime (needs optimum)
+"""
+import os
+import logging
+
+
+DEFAULT_BACKEND = "pytorch"
+ONNX_MODEL_DIR = "onnx_models"
+
+
+def _load_pytorch(model_name, options):
+    from transformers import pipeline
+    return pipeline("summarization", model=model_name)
+
+
+def _load_quantized(model_name, options):
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    model.eval()
+    # Weights are stored as int8, activations are quantized on the fly per batch
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipeline("summarization", model=model, tokenizer=tokenizer)
+
+
+def _load_onnx(model_name, options):
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from transformers import AutoTokenizer, pipeline
+
+    # The export is written once next to the app and reused on later starts
+    export_dir = os.path.join(options.get("onnx_model_dir") or ONNX_MODEL_DIR, model_name.replace("/", "--"))
+    if os.path.exists(os.path.join(export_dir, "config.json")):
+        model = ORTModelForSeq2SeqLM.from_pretrained(export_dir)
+        tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    else:
+        logging.info(f"Exporting {model_name} to ONNX in {export_dir}")
+        model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model.save_pretrained(export_dir)
+        tokenizer.save_pretrained(export_dir)
+    return pipeline("summarization", model=model, tokenizer=tokenizer)
+
+
+BACKENDS = {
+    "pytorch": _load_pytorch,
+    "quantized": _load_quantized,
+    "onnx": _load_onnx,
+}
+
+
+def load(backend, model_name, options=None):
+    """Load model_name with the named backend."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown summarizer backend: {backend}. Choose from: {', '.join(BACKENDS)}")
+    return BACKENDS[backend](model_name, options or {})
+
+
+def model_label(model_name, backend=DEFAULT_BACKEND):
+    """Name a model/backend pair for caches and stats; the default backend keeps the bare name."""
+    return model_name if backend == DEFAULT_BACKEND else f"{model_name}@{backend}"
@@ -0,0 +1,81 @@
+"""Tabular exports: every section of a meeting as its own table, in one zip.
+
+tables() turns an ExportContext into (name, columns, rows) triples.
+write_archive() packs them into an in-memory zip of CSV files using only
+the csv module. For analytics tools it can write Parquet files instead;
+that needs pyarrow and is only imported when asked for. print_table()
+prints rows as an aligned plain-text table for the command-line tools.
+"""
+import io
+import csv
+import zipfile
+
+
+ACTION_ITEM_COLUMNS = ["task", "assignee", "status", "created", "timestamp", "start"]
+ARCHIVE_FORMATS = ["csv", "parquet"]
+
+
+def _decision_rows(ctx):
+    details = ctx.decision_details
+    if len(details) != len(ctx.decisions):
+        details = [{"text": decision} for decision in ctx.decisions]
+    return [[detail["text"], detail.get("timestamp"), detail.get("start")] for detail in details]
+
+
+def _action_item_table(items):
+    # Standard fields first, then anything a custom extraction added
+    columns = list(ACTION_ITEM_COLUMNS)
+    for item in items:
+        columns.extend(key for key in item if key not in columns)
+    return columns, [[item.get(column) for column in columns] for item in items]
+
+
+def tables(ctx):
+    """Yield (name, columns, rows) for each section of the export context."""
+    yield "summary", ["summary"], [[ctx.summary]]
+    yield "key_points", ["rank", "key_point"], [[i, point] for i, point in enumerate(ctx.key_points, 1)]
+    yield "decisions", ["decision", "timestamp", "start"], _decision_rows(ctx)
+    yield ("action_items",) + _action_item_table(ctx.action_items)
+    yield "participants", ["participant"], [[participant] for participant in ctx.participants]
+    yield "segments", ["start", "end", "timestamp", "text"], [
+        [segment.start, segment.end, segment.label, segment.text] for segment in ctx.segments
+    ]
+
+
+def _write_csv(archive, name, columns, rows):
+    with archive.open(f"{name}.csv", "w") as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+
+def _write_parquet(archive, name, columns, rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.table({column: [row[i] for row in rows] for i, column in enumerate(columns)})
+    buffer = pa.BufferOutputStream()
+    pq.write_table(table, buffer)
+    # Parquet is already compressed per column; deflating it again gains nothing
+    archive.writestr(f"{name}.parquet", buffer.getvalue().to_pybytes(), compress_type=zipfile.ZIP_STORED)
+
+
+def print_table(headers, rows):
+    """Print rows under headers, each column padded to its widest value."""
+    widths = [max(len(str(h)), *(len(str(row[i])) for row in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(v).ljust(w) for v, w in zip(row, widths)))
+
+
+def write_archive(ctx, format_type="csv"):
+    """Return the bytes of a zip holding one file per table, as CSV or Parquet."""
+    if format_type not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown table format: {format_type}. Choose from: {', '.join(ARCHIVE_FORMATS)}")
+    write = _write_csv if format_type == "csv" else _write_parquet
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, columns, rows in tables(ctx):
+            write(archive, name, columns, rows)
+    return output.getvalue()
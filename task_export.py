@@ -0,0 +1,423 @@
+"""Export action items to task trackers (Trello, Jira, Asana, GitHub, Notion).
+
+Each tracker is a TaskAdapter that knows how to find (or create) the place
+tasks go and how to create one task there. TaskExporter drives an adapter:
+tasks are created on a bounded thread pool, rate limits and transient
+errors are retried with backoff, and every task carries an idempotency key
+so exporting the same meeting twice does not create duplicates.
+
+Adapters take a base_url, so the whole path can be pointed at a local fake
+server (see benchmark.py export).
+"""
+import os
+import re
+import json
+import time
+import random
+import datetime
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache import LRUCache, content_key
+
+
+class ExportError(Exception):
+    """A task tracker rejected a request or stayed unavailable after retries."""
+
+
+# Board/project/list IDs by tracker, endpoint, account and name; they rarely change
+container_cache = LRUCache(max_entries=512)
+
+
+def _redact(text):
+    """Drop URL query strings from text; some trackers take credentials there."""
+    return re.sub(r"\?[^\s'\"]*", "?<redacted>", str(text))
+
+
+class TaskAdapter:
+    """Common interface for task trackers.
+
+    Subclasses set name, default_url and required (credential keys) and
+    implement find_container() and create_task(). Requests go through
+    request(), which retries 429s, 5xx responses and connection errors.
+    """
+
+    name = None
+    default_url = None
+    required = ()
+
+    def __init__(self, credentials, base_url=None, max_retries=5, backoff_seconds=0.5, pool_size=16, timeout=30):
+        missing = [key for key in self.required if not credentials.get(key)]
+        if missing:
+            raise ExportError(f"Missing required credential: {', '.join(missing)} for {self.name}")
+        self.credentials = credentials
+        self.base_url = (base_url or credentials.get("url") or self.default_url).rstrip("/")
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout = timeout
+        self.retries = 0
+        self._retries_lock = threading.Lock()
+        self.session = requests.Session()
+        # One pooled connection per worker thread instead of a handshake per task
+        self.session.mount(self.base_url, HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+
+    def request(self, method, path, **kwargs):
+        """Send a request and return the decoded JSON body, retrying when sensible."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.request(method, self.base_url + path, timeout=self.timeout,
+                                                **self.authenticate(kwargs))
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # The exception text includes the URL; keep it out of errors that reach clients
+                logging.warning(f"{self.name} request failed: {_redact(e)}")
+                if attempt == self.max_retries:
+                    raise ExportError(f"{self.name} unavailable: {type(e).__name__}")
+                self._backoff(attempt)
+                continue
+            except requests.RequestException as e:
+                logging.warning(f"{self.name} request failed: {_redact(e)}")
+                raise ExportError(f"{self.name} request failed: {type(e).__name__}")
+
+            if response.status_code == 429 or response.status_code >= 500:
+                if attempt == self.max_retries:
+                    raise ExportError(f"{self.name} returned {response.status_code} after {attempt + 1} attempts")
+                self._backoff(attempt, response.headers.get("Retry-After"))
+                continue
+            if response.status_code >= 400:
+                raise ExportError(f"{self.name} returned {response.status_code}: {response.text[:200]}")
+            return response.json() if response.content else {}
+
+    def _backoff(self, attempt, retry_after=None):
+        # Called from every export worker thread
+        with self._retries_lock:
+            self.retries += 1
+        delay = self.backoff_seconds * 2 ** attempt
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        # Jitter keeps the worker threads from retrying in lockstep
+        time.sleep(delay * random.uniform(0.5, 1.0))
+
+    def authenticate(self, kwargs):
+        """Add credentials to the request arguments."""
+        return kwargs
+
+    def account(self):
+        """A key for the credentials, so two accounts on one endpoint stay apart."""
+        return content_key(*(str(self.credentials.get(key)) for key in self.required))
+
+    def scope(self, target):
+        """The part of target that identifies where a task lives once created.
+
+        Idempotency keys use this rather than the whole target, so a target
+        that changes between exports (like Trello's dated list) still finds
+        the tasks exported earlier.
+        """
+        return json.dumps(target, sort_keys=True)
+
+    def container(self, target):
+        """Return the ID tasks for target go into, looked up once per process."""
+        key = (self.name, self.base_url, self.account(), json.dumps(target, sort_keys=True))
+        container_id = container_cache.get(key)
+        if container_id is None:
+            container_id = self.find_container(target)
+            container_cache.put(key, container_id)
+        return container_id
+
+    def find_container(self, target):
+        raise NotImplementedError
+
+    def create_task(self, container_id, task, description):
+        """Create one task and return its remote ID."""
+        raise NotImplementedError
+
+    def default_target(self):
+        return None
+
+
+def _describe(task, idempotency_key):
+    lines = []
+    if task.get("assignee") and task["assignee"] != "Not assigned":
+        lines.append(f"Assignee: {task['assignee']}")
+    if task.get("timestamp"):
+        lines.append(f"Mentioned at: {task['timestamp']}")
+    lines.append(f"Export key: {idempotency_key}")
+    return "\n".join(lines)
+
+
+class TrelloAdapter(TaskAdapter):
+    """Cards on a board list; target is {"board": name, "list": name}."""
+
+    name = "trello"
+    default_url = "https://api.trello.com/1"
+    required = ("api_key", "token")
+
+    def authenticate(self, kwargs):
+        # A header rather than key/token query parameters, which would show up in every logged URL
+        return dict(kwargs, headers={"Authorization": f'OAuth oauth_consumer_key="{self.credentials["api_key"]}", '
+                                                      f'oauth_token="{self.credentials["token"]}"'})
+
+    def default_target(self):
+        return {"board": self.credentials.get("board") or "Meeting Tasks",
+                "list": self.credentials.get("list") or f"Tasks for {datetime.date.today():%Y-%m-%d}"}
+
+    def scope(self, target):
+        # Cards are keyed per board: the default list is named after the day it was created
+        return target["board"]
+
+    def find_container(self, target):
+        boards = self.request("GET", "/members/me/boards", params={"fields": "name"})
+        board = next((b for b in boards if b["name"] == target["board"]), None)
+        if board is None:
+            board = self.request("POST", "/boards", params={"name": target["board"], "defaultLists": "false"})
+
+        lists = self.request("GET", f"/boards/{board['id']}/lists", params={"fields": "name"})
+        task_list = next((l for l in lists if l["name"] == target["list"]), None)
+        if task_list is None:
+            task_list = self.request("POST", "/lists", params={"name": target["list"], "idBoard": board["id"]})
+        return task_list["id"]
+
+    def create_task(self, container_id, task, description):
+        card = self.request("POST", "/cards", params={"idList": container_id, "name": task["task"], "desc": description})
+        return card["id"]
+
+
+class JiraAdapter(TaskAdapter):
+    """Issues in a Jira project; target is the project key."""
+
+    name = "jira"
+    required = ("url", "email", "api_key", "project")
+
+    def authenticate(self, kwargs):
+        return dict(kwargs, auth=(self.credentials["email"], self.credentials["api_key"]))
+
+    def default_target(self):
+        return self.credentials["project"]
+
+    def find_container(self, target):
+        return self.request("GET", f"/rest/api/2/project/{target}")["key"]
+
+    def create_task(self, container_id, task, description):
+        issue = self.request("POST", "/rest/api/2/issue", json={"fields": {
+            "project": {"key": container_id},
+            "summary": task["task"][:255],
+            "description": description,
+            "issuetype": {"name": self.credentials.get("issue_type") or "Task"},
+        }})
+        return issue["key"]
+
+
+class AsanaAdapter(TaskAdapter):
+    """Tasks in an Asana project of the first workspace; target is the project name."""
+
+    name = "asana"
+    default_url = "https://app.asana.com/api/1.0"
+    required = ("api_key",)
+
+    def authenticate(self, kwargs):
+        return dict(kwargs, headers={"Authorization": f"Bearer {self.credentials['api_key']}"})
+
+    def default_target(self):
+        return self.credentials.get("project") or "Meeting Tasks"
+
+    def find_container(self, target):
+        workspace = self.credentials.get("workspace") or self.request("GET", "/workspaces")["data"][0]["gid"]
+        projects = self.request("GET", "/projects", params={"workspace": workspace, "archived": "false"})["data"]
+        project = next((p for p in projects if p["name"] == target), None)
+        if project is None:
+            project = self.request("POST", "/projects", json={"data": {"name": target, "workspace": workspace}})["data"]
+        return project["gid"]
+
+    def create_task(self, container_id, task, description):
+        created = self.request("POST", "/tasks", json={"data": {
+            "name": task["task"], "notes": description, "projects": [container_id],
+        }})
+        return created["data"]["gid"]
+
+
+class GitHubAdapter(TaskAdapter):
+    """Issues in a repository; target is "owner/repo"."""
+
+    name = "github"
+    default_url = "https://api.github.com"
+    required = ("token", "repo")
+
+    def authenticate(self, kwargs):
+        return dict(kwargs, headers={"Authorization": f"Bearer {self.credentials['token']}",
+                                     "Accept": "application/vnd.github+json"})
+
+    def default_target(self):
+        return self.credentials["repo"]
+
+    def find_container(self, target):
+        return self.request("GET", f"/repos/{target}")["full_name"]
+
+    def create_task(self, container_id, task, description):
+        issue = self.request("POST", f"/repos/{container_id}/issues", json={"title": task["task"], "body": description})
+        return str(issue["number"])
+
+
+class NotionAdapter(TaskAdapter):
+    """Pages in a Notion database; target is the database ID."""
+
+    name = "notion"
+    default_url = "https://api.notion.com/v1"
+    required = ("token", "database_id")
+
+    def authenticate(self, kwargs):
+        return dict(kwargs, headers={"Authorization": f"Bearer {self.credentials['token']}",
+                                     "Notion-Version": "2022-06-28"})
+
+    def default_target(self):
+        return self.credentials["database_id"]
+
+    def find_container(self, target):
+        database = self.request("GET", f"/databases/{target}")
+        # Pages are titled through whichever property is the database's title column
+        title = next(name for name, prop in database["properties"].items() if prop["type"] == "title")
+        return [target, title]
+
+    def create_task(self, container_id, task, description):
+        database_id, title = container_id
+        page = self.request("POST", "/pages", json={
+            "parent": {"database_id": database_id},
+            "properties": {title: {"title": [{"text": {"content": task["task"][:2000]}}]}},
+            "children": [{"object": "block", "type": "paragraph", "paragraph": {
+                "rich_text": [{"type": "text", "text": {"content": description}}]}}],
+        })
+        return page["id"]
+
+
+ADAPTERS = {adapter.name: adapter for adapter in (TrelloAdapter, JiraAdapter, AsanaAdapter, GitHubAdapter, NotionAdapter)}
+
+
+def get_adapter(system_name, credentials, **kwargs):
+    if system_name not in ADAPTERS:
+        raise ExportError(f"Unsupported task system. Choose from: {', '.join(ADAPTERS)}")
+    return ADAPTERS[system_name](credentials, **kwargs)
+
+
+class IdempotencyStore:
+    """Remembers which tasks were exported, optionally persisted to a JSON file.
+
+    claim() reserves a key before the remote call, so two concurrent
+    exports of the same meeting can't both create the task. complete()
+    only updates memory; flush() writes the file, once per export.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._done = {}
+        self._claimed = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._done = json.load(f)
+
+    def get(self, key):
+        return self._done.get(key)
+
+    def claim(self, key):
+        """Reserve key; False if it was already exported or is being exported."""
+        with self._lock:
+            if key in self._done or key in self._claimed:
+                return False
+            self._claimed.add(key)
+            return True
+
+    def complete(self, key, remote_id):
+        with self._lock:
+            self._claimed.discard(key)
+            self._done[key] = remote_id
+            self._dirty = True
+
+    def release(self, key):
+        with self._lock:
+            self._claimed.discard(key)
+
+    def flush(self):
+        """Write completed keys to the file, if there is one and anything changed."""
+        with self._lock:
+            if self.path and self._dirty:
+                self._save_locked()
+                self._dirty = False
+
+    def _save_locked(self):
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._done, f)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self):
+        return len(self._done)
+
+
+class TaskExporter:
+    """Creates tasks through an adapter on up to `concurrency` threads."""
+
+    def __init__(self, adapter, store=None, concurrency=8):
+        self.adapter = adapter
+        self.store = store if store is not None else IdempotencyStore()
+        self.concurrency = concurrency
+
+    def task_key(self, meeting_key, target, task):
+        adapter = self.adapter
+        return content_key("task-export", adapter.name, adapter.base_url, adapter.account(), adapter.scope(target),
+                           meeting_key, task["task"], str(task.get("assignee")))
+
+    def _export_one(self, container_id, target, meeting_key, task):
+        key = self.task_key(meeting_key, target, task)
+        if not self.store.claim(key):
+            return {"task": task["task"], "status": "exists", "id": self.store.get(key)}
+        try:
+            remote_id = self.adapter.create_task(container_id, task, _describe(task, key))
+        except Exception as e:
+            self.store.release(key)
+            logging.error(f"Exporting '{task['task']}' to {self.adapter.name} failed: {e}")
+            return {"task": task["task"], "status": "error", "message": str(e)}
+        self.store.complete(key, remote_id)
+        return {"task": task["task"], "status": "created", "id": remote_id}
+
+    def export(self, tasks, target=None, meeting_key=""):
+        """Export tasks (dicts with "task" and optional "assignee"/"timestamp").
+
+        meeting_key scopes the idempotency keys: the same tasks exported
+        under the same meeting_key, account and adapter scope (see
+        TaskAdapter.scope) are only created once.
+        """
+        target = target if target is not None else self.adapter.default_target()
+        start = time.perf_counter()
+        try:
+            container_id = self.adapter.container(target)
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+
+        workers = max(1, min(self.concurrency, len(tasks)))
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"export-{self.adapter.name}") as pool:
+                results = list(pool.map(lambda task: self._export_one(container_id, target, meeting_key, task), tasks))
+        finally:
+            self.store.flush()
+
+        seconds = time.perf_counter() - start
+        created, existing, failed = (sum(1 for r in results if r["status"] == status) for status in ("created", "exists", "error"))
+        summary = {
+            "status": "success" if not failed else ("partial" if created or existing else "error"),
+            "system": self.adapter.name,
+            "results": results,
+            "created": created,
+            "existing": existing,
+            "failed": failed,
+            "retries": self.adapter.retries,
+            "seconds": round(seconds, 3),
+        }
+        if summary["status"] == "error":
+            summary["error"] = next(r["message"] for r in results if r["status"] == "error")
+        return summary
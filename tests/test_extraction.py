@@ -0,0 +1,50 @@
+import pytest
+
+from extraction import PatternEngine, Trigger, default_engine, get_engine
+
+
+MEETING = ("Hello everyone. Action item: update the budget sheet. "
+           "Sarah should prepare the slides for Monday. We agreed to move the launch to May. TODO: ok.")
+
+
+def items(hits):
+    return [(hit.kind, hit.text) for hit in hits]
+
+
+def test_scan_finds_actions_and_decisions():
+    assert items(PatternEngine().scan(MEETING)) == [
+        ("action", "update the budget sheet"),
+        ("action", "Sarah should prepare the slides for Monday"),
+        ("decision", "move the launch to May"),
+    ]
+
+
+def test_hit_spans_point_into_the_text():
+    for hit in PatternEngine().scan(MEETING):
+        assert MEETING[hit.start:hit.end] == hit.text
+
+
+def test_overlapping_hits_of_one_kind_keep_the_longest():
+    hits = PatternEngine().scan("We decided that we agreed to ship the release on Friday.")
+    assert items(hits) == [("decision", "we agreed to ship the release on Friday")]
+
+
+def test_given_sentence_spans_are_used_instead_of_punctuation():
+    text = "we will review the budget\nthe team concluded that hiring waits"
+    split = text.index("\n")
+    hits = PatternEngine().scan(text, sentences=[(0, split), (split + 1, len(text))])
+    assert items(hits) == [("action", "we will review the budget"), ("decision", "hiring waits")]
+
+
+def test_custom_phrases_get_their_own_shared_engine():
+    engine = get_engine(("next step",))
+    assert items(engine.scan("Next step: book the venue for the offsite.")) == [
+        ("action", "book the venue for the offsite")]
+    assert get_engine(("next step",)) is engine
+    assert get_engine() is default_engine
+    assert default_engine.scan("Next step: book the venue for the offsite.") == []
+
+
+def test_unknown_trigger_mode_is_rejected():
+    with pytest.raises(ValueError):
+        Trigger("action", "x", mode="everything")
@@ -0,0 +1,46 @@
+import threading
+
+from instrumentation import Histogram, RunMetrics
+
+
+def test_counts_go_to_the_innermost_stage():
+    metrics = RunMetrics()
+    with metrics.stage("process"):
+        metrics.count("items", 2)
+        with metrics.stage("parse"):
+            metrics.count("tokens", 5)
+    metrics.count("ignored")
+
+    stages = metrics.to_dict()
+    assert stages["process"]["items"] == 2 and "tokens" not in stages["process"]
+    assert stages["parse"]["tokens"] == 5 and stages["parse"]["calls"] == 1
+
+
+def test_counts_need_a_stage_open_in_the_same_thread():
+    metrics = RunMetrics()
+
+    def consumer():
+        metrics.count("frames", 10)  # No stage open on this thread: dropped
+        with metrics.stage("transcribe"):
+            metrics.count("frames", 20)
+
+    with metrics.stage("record"):
+        thread = threading.Thread(target=consumer)
+        thread.start()
+        thread.join()
+
+    stages = metrics.to_dict()
+    assert stages["transcribe"]["frames"] == 20
+    assert "frames" not in stages["record"]
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("stage_seconds", "Stage wall time.", ("stage",), buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value, stage="parse")
+
+    lines = histogram.render()
+    assert 'stage_seconds_bucket{stage="parse",le="0.1"} 1' in lines
+    assert 'stage_seconds_bucket{stage="parse",le="1"} 2' in lines
+    assert 'stage_seconds_bucket{stage="parse",le="+Inf"} 3' in lines
+    assert 'stage_seconds_count{stage="parse"} 3' in lines
@@ -0,0 +1,35 @@
+from live import RingBuffer
+
+
+def test_read_returns_written_bytes_in_order():
+    ring = RingBuffer(8)
+    ring.write(b"abcde")
+    ring.write(b"fgh")
+    assert ring.read(8)[0] == b"abcdefgh"
+    assert ring.overruns == 0
+
+
+def test_overwritten_unread_bytes_are_counted():
+    ring = RingBuffer(8)
+    ring.write(b"abcdef")
+    ring.write(b"ghijk")
+    assert ring.overruns == 3
+    assert ring.read(8)[0] == b"defghijk"
+
+
+def test_write_larger_than_capacity_counts_each_dropped_byte_once():
+    ring = RingBuffer(8)
+    ring.write(b"abc")  # Unread, lost to the next write
+    ring.write(b"0123456789ab")  # 4 bytes more than fit
+    assert ring.overruns == 3 + 4
+    assert ring.pending == 8
+    assert ring.read(8)[0] == b"456789ab"
+
+
+def test_write_larger_than_capacity_after_partial_read():
+    ring = RingBuffer(4)
+    ring.write(b"wxyz")
+    assert ring.read(2)[0] == b"wx"
+    ring.write(b"abcdef")
+    assert ring.overruns == 2 + 2
+    assert ring.read(4)[0] == b"cdef"
@@ -0,0 +1,56 @@
+import json
+
+from rendering import ExportContext, highlighter, render_custom, render_output
+from segments import Segment
+
+
+ACTION_ITEM = {"task": "Send <the> notes", "assignee": "Sam", "status": "To Do", "created": "2024-01-01"}
+
+
+def context(**options):
+    options.setdefault("sections", ["summary", "action_items", "transcript"])
+    return ExportContext(
+        "2024-01-01", "We shipped.", ["Launch"], ["Ship on Friday"], [ACTION_ITEM], ["Sam"],
+        [Segment("hello there", start=0), Segment("bye now", start=65)], **options)
+
+
+def render(format_type, ctx):
+    return "".join(render_output(format_type, ctx))
+
+
+def test_json_export_is_valid_and_complete():
+    data = json.loads(render("json", context()))
+    assert data["action_items"] == [ACTION_ITEM]
+    assert data["transcript"] == "[00:00] hello there\n[01:05] bye now\n"
+
+
+def test_html_export_escapes_text():
+    html = render("html", context())
+    assert "Send &lt;the&gt; notes" in html
+    assert "[00:00] hello there<br>[01:05] bye now<br>" in html
+
+
+def test_transcript_honors_timestamps_and_truncation():
+    assert render("text", context(include_timestamps=False)).endswith("FULL TRANSCRIPT:\nhello there\nbye now\n")
+    truncated = render("text", context(max_transcript_length=15))
+    assert truncated.endswith("FULL TRANSCRIPT:\n[00:00] hello t... [truncated]")
+
+
+def test_custom_styles_keep_the_transcript_trailing_newline():
+    ctx = context(include_timestamps=False)
+    assert "".join(render_custom("detailed", ctx)).endswith("## Full Transcript\n```\nhello there\nbye now\n\n```")
+    assert "".join(render_custom("business", ctx)).endswith("=\nhello there\nbye now\n\n")
+
+
+def test_custom_export_renders_only_requested_sections():
+    minimal = "".join(render_custom("minimal", context(sections=["summary"])))
+    assert minimal == "Meeting Summary - 2024-01-01\n\nWe shipped.\n\n"
+    # Unknown styles fall back to detailed
+    assert "".join(render_custom("fancy", context())).startswith("# Meeting Summary - 2024-01-01")
+
+
+def test_highlighter_bolds_whole_words_longest_first():
+    highlight = highlighter(["budget", "action item", "action"])
+    assert highlight("One Action item on the Budget, no budgets.") == "One **action item** on the **budget**, no budgets."
+    assert highlight("Action now") == "**action** now"
+    assert highlighter([]) is None
@@ -0,0 +1,65 @@
+from segments import Segment, Transcript, format_timestamp
+
+
+VOSK_RESULT = {
+    "text": "send the notes",
+    "result": [
+        {"word": "send", "start": 61.0, "end": 61.3, "conf": 0.9},
+        {"word": "the", "start": 61.3, "end": 61.4, "conf": 1.0},
+        {"word": "notes", "start": 61.5, "end": 62.0, "conf": 0.8},
+    ],
+}
+
+
+def test_segment_from_vosk_keeps_word_timings():
+    segment = Segment.from_vosk(VOSK_RESULT)
+    assert (segment.text, segment.start, segment.end) == ("send the notes", 61.0, 62.0)
+    assert segment.render() == "[01:01] send the notes"
+    assert segment.render(include_timestamps=False) == "send the notes"
+    assert segment.time_at(len("send the ")) == 61.5
+
+
+def test_segment_round_trips_through_dict():
+    segment = Segment.from_vosk(VOSK_RESULT)
+    copy = Segment.from_dict(segment.to_dict())
+    assert copy.to_dict() == segment.to_dict()
+
+
+def test_from_text_reads_recorded_and_live_stamps():
+    transcript = Transcript.from_text("[01:05] hello there\n[10:15:30] live line\nno stamp\n")
+    first, live, plain = transcript
+    assert (first.text, first.start) == ("hello there", 65)
+    assert (live.text, live.stamp, live.start) == ("live line", "10:15:30", None)
+    assert (plain.text, plain.label) == ("no stamp", None)
+    # Unchanged transcripts render exactly as given
+    assert transcript.render() == "[01:05] hello there\n[10:15:30] live line\nno stamp\n"
+
+
+def test_append_invalidates_rendered_text():
+    transcript = Transcript([Segment("one", start=0)])
+    assert transcript.render() == "[00:00] one\n"
+    version = transcript.version
+    transcript.append(Segment("two", start=75))
+    assert transcript.version == version + 1
+    assert transcript.render() == "[00:00] one\n[01:15] two\n"
+    assert transcript.plain_text == "one\ntwo"
+
+
+def test_offsets_map_back_to_the_time_said():
+    transcript = Transcript([Segment("hello", start=3), Segment.from_vosk(VOSK_RESULT)])
+    offset = transcript.plain_text.index("notes")
+    segment, local = transcript.segment_at(offset)
+    assert segment.text == "send the notes" and local == len("send the ")
+    assert transcript.time_at(offset) == (61.5, "01:01")
+    assert Transcript().time_at(0) == (None, None)
+
+
+def test_empty_vosk_results_are_dropped():
+    transcript = Transcript.from_vosk_results([{"text": ""}, VOSK_RESULT])
+    assert len(transcript) == 1
+    assert Transcript.from_list(transcript.to_list())[0].text == "send the notes"
+
+
+def test_format_timestamp():
+    assert format_timestamp(0) == "00:00"
+    assert format_timestamp(3725.9) == "62:05"
@@ -0,0 +1,118 @@
+import time
+import wave
+import threading
+
+from recorder import Recorder
+from session_store import SessionStore
+
+
+class FakeSummarizer:
+    def __init__(self):
+        self.stopped = threading.Event()
+
+    def stop_recording(self):
+        self.stopped.set()
+
+    def stop_live_transcription(self, timeout=10):
+        self.stopped.set()
+
+
+def start_worker(session):
+    session.worker = threading.Thread(target=session.summarizer.stopped.wait, daemon=True)
+    session.worker.start()
+
+
+def test_idle_session_expires_after_ttl():
+    sessions = SessionStore(ttl_seconds=0.05)
+    session = sessions.create(FakeSummarizer())
+    time.sleep(0.1)
+    assert sessions.get(session.id) is None
+    assert sessions.evictions == 1
+    assert session.summarizer.stopped.is_set()
+
+
+def test_session_with_running_worker_outlives_ttl():
+    sessions = SessionStore(ttl_seconds=0.05)
+    session = sessions.create(FakeSummarizer())
+    start_worker(session)
+    time.sleep(0.1)
+    assert sessions.sweep() == 1
+    assert sessions.get(session.id) is session
+    assert not session.summarizer.stopped.is_set()
+
+    session.summarizer.stop_recording()
+    session.worker.join(1)
+    session.last_access -= 1
+    assert sessions.get(session.id) is None
+
+
+def test_streaming_session_outlives_ttl():
+    sessions = SessionStore(ttl_seconds=0.05)
+    session = sessions.create(FakeSummarizer())
+    with session.streaming():
+        time.sleep(0.1)
+        assert sessions.get(session.id) is session
+        session.last_access -= 1
+        assert sessions.sweep() == 1
+    # Leaving the stream counts as access
+    assert sessions.get(session.id) is session
+
+
+def test_lru_eviction_skips_busy_sessions():
+    sessions = SessionStore(max_sessions=2, ttl_seconds=0)
+    busy = sessions.create(FakeSummarizer())
+    start_worker(busy)
+    idle = sessions.create(FakeSummarizer())
+    newest = sessions.create(FakeSummarizer())
+    assert sessions.get(busy.id) is busy
+    assert sessions.get(idle.id) is None
+    assert sessions.get(newest.id) is newest
+    assert idle.summarizer.stopped.is_set()
+    busy.summarizer.stop_recording()
+
+
+def test_store_stays_over_capacity_when_every_session_is_busy():
+    sessions = SessionStore(max_sessions=1, ttl_seconds=0)
+    busy = sessions.create(FakeSummarizer())
+    start_worker(busy)
+    newest = sessions.create(FakeSummarizer())
+    assert len(sessions) == 2
+    assert sessions.get(busy.id) is busy and sessions.get(newest.id) is newest
+    busy.summarizer.stop_recording()
+
+
+class EndlessSilence:
+    """A microphone that never runs out, delivering audio at 10x real time."""
+
+    sample_rate = 16000
+    sample_width = 2
+
+    def read(self, frames):
+        time.sleep(frames / self.sample_rate / 10)
+        return bytes(frames * self.sample_width)
+
+
+class RecordingSummarizer(FakeSummarizer):
+    def __init__(self, path):
+        super().__init__()
+        self.recorder = Recorder(EndlessSilence(), path)
+
+    def stop_recording(self):
+        super().stop_recording()
+        self.recorder.stop()
+
+
+def test_background_recording_can_be_stopped_after_ttl(tmp_path):
+    sessions = SessionStore(ttl_seconds=0.05)
+    session = sessions.create(RecordingSummarizer(str(tmp_path / "recording.wav")))
+    session.worker = threading.Thread(target=session.summarizer.recorder.run, daemon=True)
+    session.worker.start()
+    time.sleep(0.2)
+
+    found = sessions.get(session.id)
+    assert found is session
+    found.summarizer.stop_recording()
+    found.worker.join(1)
+    assert not found.worker.is_alive()
+    with wave.open(str(tmp_path / "recording.wav"), "rb") as wav:
+        assert wav.getnframes() > 0
@@ -0,0 +1,125 @@
+import json
+import socket
+
+import pytest
+
+from task_export import ExportError, IdempotencyStore, TaskAdapter, TaskExporter, TrelloAdapter
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode() if body is not None else b""
+        self.text = self.content.decode()
+        self.headers = headers or {}
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+class FakeBoardAdapter(TaskAdapter):
+    """Cards kept in memory; the target is {"board": ..., "list": ...} like Trello's."""
+
+    name = "fake"
+    default_url = "http://tracker.invalid"
+    required = ("token",)
+
+    def __init__(self, credentials, **kwargs):
+        super().__init__(credentials, **kwargs)
+        self.created = []
+
+    def find_container(self, target):
+        return f"{target['board']}/{target['list']}"
+
+    def create_task(self, container_id, task, description):
+        self.created.append((container_id, task["task"]))
+        return f"card-{len(self.created)}"
+
+    def scope(self, target):
+        return target["board"]
+
+
+TASKS = [{"task": "Send the notes to the team", "assignee": "Not assigned"}]
+MONDAY = {"board": "Meetings", "list": "Tasks for 2024-01-01"}
+TUESDAY = {"board": "Meetings", "list": "Tasks for 2024-01-02"}
+
+
+def test_re_export_of_the_same_meeting_is_not_duplicated():
+    adapter = FakeBoardAdapter({"token": "t"})
+    exporter = TaskExporter(adapter, IdempotencyStore())
+    assert exporter.export(TASKS, MONDAY, "meeting-1")["created"] == 1
+    again = exporter.export(TASKS, TUESDAY, "meeting-1")
+    assert again["existing"] == 1 and again["created"] == 0
+    assert len(adapter.created) == 1
+
+
+def test_same_action_item_from_another_meeting_is_created():
+    adapter = FakeBoardAdapter({"token": "t"})
+    exporter = TaskExporter(adapter, IdempotencyStore())
+    exporter.export(TASKS, MONDAY, "meeting-1")
+    assert exporter.export(TASKS, MONDAY, "meeting-2")["created"] == 1
+    assert len(adapter.created) == 2
+
+
+def test_same_meeting_on_another_account_is_created():
+    store = IdempotencyStore()
+    TaskExporter(FakeBoardAdapter({"token": "alice"}), store).export(TASKS, MONDAY, "meeting-1")
+    other = FakeBoardAdapter({"token": "bob"})
+    assert TaskExporter(other, store).export(TASKS, MONDAY, "meeting-1")["created"] == 1
+
+
+def test_exported_keys_are_persisted_once_per_export(tmp_path):
+    path = tmp_path / "exported.json"
+    tasks = [{"task": f"Task {i}"} for i in range(5)]
+    TaskExporter(FakeBoardAdapter({"token": "t"}), IdempotencyStore(str(path))).export(tasks, MONDAY, "m")
+    assert len(json.loads(path.read_text())) == 5
+
+    adapter = FakeBoardAdapter({"token": "t"})
+    result = TaskExporter(adapter, IdempotencyStore(str(path))).export(tasks, MONDAY, "m")
+    assert result["existing"] == 5 and adapter.created == []
+
+
+def test_rate_limited_requests_are_retried():
+    adapter = FakeBoardAdapter({"token": "t"}, backoff_seconds=0)
+    responses = iter([FakeResponse(429), FakeResponse(503), FakeResponse(200, {"id": 1})])
+    adapter.session.request = lambda *args, **kwargs: next(responses)
+    assert adapter.request("GET", "/thing") == {"id": 1}
+    assert adapter.retries == 2
+
+
+def test_client_errors_are_not_retried():
+    adapter = FakeBoardAdapter({"token": "t"}, backoff_seconds=0)
+    adapter.session.request = lambda *args, **kwargs: FakeResponse(404, {"message": "no such board"})
+    with pytest.raises(ExportError, match="404"):
+        adapter.request("GET", "/thing")
+    assert adapter.retries == 0
+
+
+class FlakyBoardAdapter(FakeBoardAdapter):
+    failures = 1
+
+    def create_task(self, container_id, task, description):
+        if self.failures:
+            self.failures -= 1
+            raise ExportError("fake returned 500 after 6 attempts")
+        return super().create_task(container_id, task, description)
+
+
+def test_failed_task_is_released_for_a_later_export():
+    exporter = TaskExporter(FlakyBoardAdapter({"token": "t"}), IdempotencyStore())
+    failed = exporter.export(TASKS, MONDAY, "m")
+    assert failed["status"] == "error" and failed["error"] == "fake returned 500 after 6 attempts"
+    assert exporter.export(TASKS, MONDAY, "m")["created"] == 1
+
+
+def test_unreachable_tracker_error_does_not_leak_credentials():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]  # Closed again before the request, so the connection is refused
+    adapter = TrelloAdapter({"api_key": "secret-key", "token": "secret-token"},
+                            base_url=f"http://127.0.0.1:{port}", max_retries=0, timeout=2)
+    with pytest.raises(ExportError) as raised:
+        adapter.request("GET", "/members/me/boards", params={"fields": "name"})
+    assert str(raised.value) == "trello unavailable: ConnectionError"
+    assert "secret" not in str(raised.value)
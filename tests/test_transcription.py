@@ -0,0 +1,85 @@
+import json
+import wave
+
+import numpy as np
+import pytest
+
+pytest.importorskip("vosk")
+
+from transcription import decode_pcm, find_silence_splits, WINDOW_FRAMES  # noqa: E402
+from vad import VoiceActivityFilter  # noqa: E402
+
+
+RATE = 16000
+
+
+def write_wav(path, samples):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(np.asarray(samples, dtype=np.int16).tobytes())
+    return str(path)
+
+
+def loud(seconds):
+    return np.random.default_rng(0).standard_normal(int(seconds * RATE)) * 3000
+
+
+class ScriptedRecognizer:
+    """Stands in for KaldiRecognizer: every block completes the next scripted result."""
+
+    def __init__(self, results):
+        self.results = list(results)
+
+    def AcceptWaveform(self, data):
+        return bool(self.results)
+
+    def Result(self):
+        return json.dumps(self.results.pop(0))
+
+    def FinalResult(self):
+        return json.dumps({"text": ""})
+
+
+def word_result(text, start):
+    return {"text": text, "result": [{"word": text, "start": start, "end": start + 0.5}]}
+
+
+def test_splits_land_in_the_pause_nearest_each_boundary(tmp_path):
+    samples = np.concatenate([loud(1.8), np.zeros(int(0.4 * RATE)), loud(1.8)])
+    splits = find_silence_splits(write_wav(tmp_path / "a.wav", samples), segment_seconds=2, search_seconds=0.5)
+    assert splits[0] == 0 and splits[-1] == len(samples)
+    assert len(splits) == 3
+    assert 1.8 * RATE <= splits[1] <= 2.2 * RATE - WINDOW_FRAMES
+
+
+def test_empty_wav_is_one_empty_segment(tmp_path):
+    assert find_silence_splits(write_wav(tmp_path / "empty.wav", [])) == [0, 0]
+
+
+def test_segment_results_are_shifted_onto_the_whole_file():
+    # Two segments decoded separately, the second starting 60 s into the file
+    first = decode_pcm(ScriptedRecognizer([word_result("hello", 1.0)]), [b"\0\0"], 0.0)
+    second = decode_pcm(ScriptedRecognizer([word_result("again", 2.0)]), [b"\0\0"], 60.0)
+    stitched = first + second
+    assert [r["text"] for r in stitched] == ["hello", "again"]
+    assert [r["result"][0]["start"] for r in stitched] == [1.0, 62.0]
+
+
+def test_repeated_results_are_dropped():
+    recognizer = ScriptedRecognizer([word_result("hello", 1.0), word_result("hello", 1.0), word_result("bye", 3.0)])
+    results = decode_pcm(recognizer, [b"\0\0"] * 3)
+    assert [r["text"] for r in results] == ["hello", "bye"]
+
+
+def test_vad_and_segment_offsets_combine():
+    vad = VoiceActivityFilter(RATE)
+    pcm = (np.concatenate([loud(1), np.zeros(3 * RATE), loud(1)])).astype(np.int16).tobytes()
+    kept = b"".join(vad.filter([pcm]))
+    second_burst = (len(kept) // 2 - RATE) / RATE
+
+    # A fresh filter replays the same cuts while decode_pcm feeds it
+    results = decode_pcm(ScriptedRecognizer([word_result("again", second_burst)]), [pcm], 30.0,
+                         VoiceActivityFilter(RATE))
+    assert results[0]["result"][0]["start"] == pytest.approx(34.0)
@@ -0,0 +1,62 @@
+import numpy as np
+
+from vad import VoiceActivityFilter, skipped_ratio
+
+
+RATE = 16000
+
+
+def speech(seconds, seed=0):
+    noise = np.random.default_rng(seed).standard_normal(int(seconds * RATE)) * 3000
+    return noise.astype(np.int16).tobytes()
+
+
+def silence(seconds):
+    return bytes(int(seconds * RATE) * 2)
+
+
+def run(vad, pcm, block=8000):
+    return b"".join(vad.filter(pcm[i:i + block] for i in range(0, len(pcm), block)))
+
+
+def test_empty_input_produces_no_audio_and_zero_ratio():
+    vad = VoiceActivityFilter()
+    assert list(vad.filter([])) == []
+    assert vad.stats() == {"frames_in": 0, "frames_skipped": 0, "skipped_ratio": 0.0}
+
+
+def test_skipped_ratio_of_no_input_is_zero():
+    assert skipped_ratio(0, 0) == 0.0
+    assert skipped_ratio(1, 4) == 0.25
+
+
+def test_long_silence_is_skipped_and_speech_kept():
+    pcm = speech(1) + silence(3) + speech(1, seed=1)
+    vad = VoiceActivityFilter(RATE)
+    out = run(vad, pcm)
+    stats = vad.stats()
+    assert stats["frames_in"] == len(pcm) // 2
+    assert len(out) // 2 + stats["frames_skipped"] == stats["frames_in"]
+    # Hangover and preroll keep 1.3 s of the 3 s pause
+    assert abs(stats["frames_skipped"] / RATE - 1.7) < 0.05
+    assert out.startswith(speech(1)) and out.endswith(speech(1, seed=1))
+
+
+def test_decoded_times_map_back_to_the_original_timeline():
+    pcm = speech(1) + silence(3) + speech(1, seed=1)
+    vad = VoiceActivityFilter(RATE)
+    out = run(vad, pcm)
+    second_burst = (len(out) // 2 - RATE) / RATE
+    assert vad.to_absolute(0.5) == 0.5  # Before any cut
+    assert abs(vad.to_absolute(second_burst) - 4.0) < 1e-6
+
+    result = vad.shift_result({"result": [{"word": "again", "start": second_burst, "end": second_burst + 0.4}]})
+    word = result["result"][0]
+    assert abs(word["start"] - 4.0) < 1e-6 and abs(word["end"] - 4.4) < 1e-6
+
+
+def test_short_pauses_are_not_cut():
+    pcm = speech(1) + silence(0.5) + speech(1, seed=1)
+    vad = VoiceActivityFilter(RATE)
+    assert run(vad, pcm) == pcm
+    assert vad.stats()["skipped_ratio"] == 0.0
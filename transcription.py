@@ -0,0 +1,222 @@
+import os
+import json
+import wave
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from vosk import KaldiRecognizer
+
+from model_registry import registry
+from vad import VoiceActivityFilter
+
+
+# Energy analysis window used to locate silences (30 ms at 16 kHz)
+WINDOW_FRAMES = 480
+
+
+def stream_pcm(input_path, sample_rate=16000, block_frames=4000, ffmpeg=None, wav_path=None):
+    """Decode any audio file to 16-bit mono PCM and yield it in fixed-size blocks.
+
+    ffmpeg does the decoding and resampling in a subprocess, so memory use
+    stays at one block regardless of recording length. If wav_path is
+    given, the PCM is also written there as a WAV file as it streams.
+    """
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"Audio file '{input_path}' not found!")
+
+    if ffmpeg is None:
+        from pydub import AudioSegment
+        ffmpeg = AudioSegment.converter
+
+    command = [
+        ffmpeg, "-nostdin", "-loglevel", "error", "-i", input_path,
+        "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(sample_rate), "-",
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    wf = None
+    if wav_path:
+        wf = wave.open(wav_path, "wb")
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+
+    block_bytes = block_frames * 2
+    try:
+        while True:
+            data = process.stdout.read(block_bytes)
+            if not data:
+                break
+            if wf:
+                wf.writeframes(data)
+            yield data
+
+        process.wait()
+        if process.returncode != 0:
+            raise RuntimeError(f"Failed to convert audio: {process.stderr.read().decode(errors='replace').strip()}")
+    finally:
+        if wf:
+            wf.close()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+
+def probe_duration(input_path):
+    """Return the duration of an audio file in seconds, or None if unknown."""
+    try:
+        from pydub.utils import mediainfo
+        return float(mediainfo(input_path)["duration"])
+    except Exception:
+        return None
+
+
+def find_silence_splits(wav_path, segment_seconds=60, search_seconds=5):
+    """Return frame offsets splitting the WAV into roughly segment_seconds pieces.
+
+    Each cut is placed at the quietest window within search_seconds of the
+    nominal boundary, so segments end in a pause rather than mid-word.
+    """
+    with wave.open(wav_path, "rb") as wf:
+        rate = wf.getframerate()
+        total_frames = wf.getnframes()
+        # Read in bounded blocks; only the per-window energies are kept
+        energies = []
+        while True:
+            samples = np.frombuffer(wf.readframes(WINDOW_FRAMES * 1000), dtype=np.int16)
+            n = len(samples) // WINDOW_FRAMES
+            if n == 0:
+                break
+            windows = samples[:n * WINDOW_FRAMES].reshape(n, WINDOW_FRAMES).astype(np.float32)
+            energies.append(np.sqrt(np.mean(windows * windows, axis=1)))
+
+    n_windows = sum(len(e) for e in energies)
+    if n_windows == 0:
+        return [0, total_frames]
+    energy = np.concatenate(energies)
+
+    window_seconds = WINDOW_FRAMES / rate
+    segment_windows = max(1, int(segment_seconds / window_seconds))
+    search_windows = max(1, int(search_seconds / window_seconds))
+
+    splits = [0]
+    target = segment_windows
+    while target < n_windows - search_windows:
+        lo = max(target - search_windows, splits[-1] // WINDOW_FRAMES + 1)
+        hi = min(target + search_windows, n_windows)
+        cut = lo + int(np.argmin(energy[lo:hi]))
+        splits.append(cut * WINDOW_FRAMES)
+        target = cut + segment_windows
+    splits.append(total_frames)
+    return splits
+
+
+def _shift_result(result, offset_seconds):
+    """Shift the word timings of a Vosk result by offset_seconds."""
+    for word in result.get("result", []):
+        word["start"] = word.get("start", 0) + offset_seconds
+        word["end"] = word.get("end", 0) + offset_seconds
+    return result
+
+
+def decode_pcm(recognizer, blocks, offset_seconds=0.0, vad=None):
+    """Feed PCM blocks through recognizer and return the non-empty Vosk results.
+
+    With a VoiceActivityFilter, silence is dropped before decoding and the
+    word timings are mapped back onto the unfiltered timeline.
+    """
+    if vad is not None:
+        blocks = vad.filter(blocks)
+
+    def shift(result):
+        if vad is not None:
+            vad.shift_result(result)
+        return _shift_result(result, offset_seconds)
+
+    results = []
+    last_text = ""
+    for data in blocks:
+        if recognizer.AcceptWaveform(data):
+            result = json.loads(recognizer.Result())
+            if result.get("text") and result["text"] != last_text:
+                results.append(shift(result))
+                last_text = result["text"]
+
+    final_result = json.loads(recognizer.FinalResult())
+    if final_result.get("text"):
+        results.append(shift(final_result))
+    return results
+
+
+def _read_blocks(wf, start_frame, end_frame, block_frames=4000):
+    wf.setpos(start_frame)
+    remaining = end_frame - start_frame
+    while remaining > 0:
+        data = wf.readframes(min(block_frames, remaining))
+        if not data:
+            break
+        remaining -= len(data) // (wf.getsampwidth() * wf.getnchannels())
+        yield data
+
+
+def _decode_segment(model_path, wav_path, start_frame, end_frame, vad_options=None):
+    """Worker entry point: decode one segment of the WAV with its own recognizer.
+
+    Returns (results, vad stats or None).
+    """
+    # Under fork the parent's already-loaded model is inherited copy-on-write
+    model = registry.get_speech_model(model_path)
+    with wave.open(wav_path, "rb") as wf:
+        rate = wf.getframerate()
+        recognizer = KaldiRecognizer(model, rate)
+        recognizer.SetWords(True)
+        vad = VoiceActivityFilter.from_config({"vad": vad_options}, rate)
+        results = decode_pcm(recognizer, _read_blocks(wf, start_frame, end_frame), start_frame / rate, vad)
+        return results, vad.stats() if vad else None
+
+
+def pool_context():
+    """Multiprocessing context for decoding pools: fork where available, so workers share the parent's model pages."""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def transcribe_parallel(wav_path, model_path, workers=None, segment_seconds=60, progress=None,
+                        vad_options=None, vad_stats=None):
+    """Decode a mono 16-bit WAV on a process pool and return Vosk results in order.
+
+    The audio is cut at silences into segments of about segment_seconds;
+    word timestamps in the returned results are absolute to the whole file.
+    progress, if given, is called as progress(frames_decoded, total_frames).
+    vad_options (True or VoiceActivityFilter keyword arguments) enables
+    silence skipping in every worker; the summed filter stats are added to
+    the vad_stats dict if one is given.
+    """
+    workers = workers or os.cpu_count() or 1
+    splits = find_silence_splits(wav_path, segment_seconds)
+    segments = list(zip(splits[:-1], splits[1:]))
+    total_frames = splits[-1]
+
+    segment_results = [None] * len(segments)
+    frames_done = 0
+    with ProcessPoolExecutor(max_workers=min(workers, len(segments)), mp_context=pool_context()) as pool:
+        futures = {
+            pool.submit(_decode_segment, model_path, wav_path, start, end, vad_options): i
+            for i, (start, end) in enumerate(segments)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            segment_results[i], stats = future.result()
+            if stats and vad_stats is not None:
+                for key in ("frames_in", "frames_skipped"):
+                    vad_stats[key] = vad_stats.get(key, 0) + stats[key]
+            start, end = segments[i]
+            frames_done += end - start
+            if progress:
+                progress(frames_done, total_frames)
+
+    return [result for results in segment_results for result in results]
@@ -0,0 +1,160 @@
+import bisect
+
+import numpy as np
+
+
+def skipped_ratio(frames_skipped, frames_in):
+    """Share of the input the filter dropped; 0.0 when there was no input."""
+    return round(frames_skipped / frames_in, 4) if frames_in else 0.0
+
+
+class VoiceActivityFilter:
+    """Energy-based voice activity detection for a 16-bit mono PCM stream.
+
+    Audio is split into windows of window_seconds and a window counts as
+    voiced when its RMS energy is above max(threshold, noise floor *
+    floor_ratio), where the noise floor adapts to the quietest windows seen.
+    Voiced windows are kept together with hangover_seconds of audio after
+    them (so the recognizer still sees the pause that ends an utterance) and
+    preroll_seconds before them; everything else is dropped.
+
+    Dropping audio shifts the recognizer's clock, so the filter records
+    where each cut happened and to_absolute() maps decoded times back to
+    the original timeline.
+    """
+
+    def __init__(self, sample_rate=16000, window_seconds=0.03, threshold=300.0, floor_ratio=3.0,
+                 hangover_seconds=1.0, preroll_seconds=0.3):
+        self.sample_rate = sample_rate
+        self.window_bytes = int(sample_rate * window_seconds) * 2
+        self.threshold = threshold
+        self.floor_ratio = floor_ratio
+        self.hangover = max(0, int(round(hangover_seconds / window_seconds)))
+        self.preroll = max(0, int(round(preroll_seconds / window_seconds)))
+        self.noise_floor = None
+
+        self._leftover = b""
+        self._pending = []  # Undecided windows: a voiced window may still pull them in as preroll
+        self._pending_voiced = np.zeros(0, dtype=bool)
+        self._history = np.zeros(0, dtype=bool)  # Last `hangover` decided windows
+        self._skipping = False
+
+        self.frames_in = 0
+        self.frames_out = 0
+        self.frames_skipped = 0
+        # (decoded frame, frames skipped before it), one entry per cut
+        self._cuts_at = [0]
+        self._cuts_skipped = [0]
+
+    @classmethod
+    def from_config(cls, config, sample_rate=16000):
+        """Build a filter from config["vad"] (True or a dict of options), or return None."""
+        options = config.get("vad") if config else None
+        if not options:
+            return None
+        return cls(sample_rate, **(options if isinstance(options, dict) else {}))
+
+    def _voiced(self, windows):
+        """Classify whole windows (one per row) as voiced or silent."""
+        samples = windows.astype(np.float32)
+        energy = np.sqrt(np.mean(samples * samples, axis=1))
+
+        floor = self.noise_floor if self.noise_floor is not None else 0.0
+        voiced = energy > max(self.threshold, floor * self.floor_ratio)
+
+        # Only silent windows move the floor, so long speech can't raise it
+        silent = energy[~voiced]
+        if len(silent):
+            quiet = float(np.mean(silent))
+            self.noise_floor = quiet if self.noise_floor is None else 0.9 * self.noise_floor + 0.1 * quiet
+        return voiced
+
+    def push(self, data):
+        """Add PCM and return the bytes that should be fed to the recognizer.
+
+        Output lags input by up to preroll_seconds while the filter waits to
+        see whether speech follows a silence.
+        """
+        self.frames_in += len(data) // 2
+        data = self._leftover + data
+        n = len(data) // self.window_bytes
+        self._leftover = data[n * self.window_bytes:]
+        if n == 0:
+            return b""
+
+        windows = np.frombuffer(data, dtype=np.int16, count=n * self.window_bytes // 2).reshape(n, -1)
+        voiced = self._voiced(windows)
+        self._pending.extend(data[i * self.window_bytes:(i + 1) * self.window_bytes] for i in range(n))
+        self._pending_voiced = np.concatenate([self._pending_voiced, voiced])
+        return self._decide(len(self._pending) - self.preroll)
+
+    def flush(self):
+        """Decide the remaining windows and return their bytes, plus any partial window."""
+        out = self._decide(len(self._pending))
+        tail, self._leftover = self._leftover, b""
+        self.frames_out += len(tail) // 2
+        return out + tail
+
+    def _decide(self, ready):
+        """Keep or drop the first `ready` pending windows."""
+        if ready <= 0:
+            return b""
+
+        # A window is kept if any window from `hangover` before to `preroll` after it is voiced
+        flags = np.concatenate([self._history, self._pending_voiced])
+        counts = np.concatenate([[0], np.cumsum(flags)])
+        index = np.arange(ready) + len(self._history)
+        low = np.maximum(index - self.hangover, 0)
+        high = np.minimum(index + self.preroll + 1, len(flags))
+        keep = counts[high] - counts[low] > 0
+
+        out = []
+        window_frames = self.window_bytes // 2
+        for window, kept in zip(self._pending[:ready], keep.tolist()):
+            if kept:
+                if self._skipping:
+                    self._cuts_at.append(self.frames_out)
+                    self._cuts_skipped.append(self.frames_skipped)
+                    self._skipping = False
+                out.append(window)
+                self.frames_out += window_frames
+            else:
+                self._skipping = True
+                self.frames_skipped += window_frames
+
+        self._history = flags[:len(self._history) + ready][-self.hangover:] if self.hangover else self._history
+        del self._pending[:ready]
+        self._pending_voiced = self._pending_voiced[ready:]
+        return b"".join(out)
+
+    def filter(self, blocks):
+        """Generator form of push/flush over an iterable of PCM blocks."""
+        for data in blocks:
+            out = self.push(data)
+            if out:
+                yield out
+        out = self.flush()
+        if out:
+            yield out
+
+    def to_absolute(self, seconds):
+        """Map a time in the decoded (filtered) stream to the original audio."""
+        frame = seconds * self.sample_rate
+        i = bisect.bisect_right(self._cuts_at, frame) - 1
+        return seconds + self._cuts_skipped[i] / self.sample_rate
+
+    def shift_result(self, result):
+        """Rewrite the word timings of a Vosk result onto the original timeline."""
+        for word in result.get("result", []):
+            # Map the start once so a word never straddles a cut
+            start = self.to_absolute(word.get("start", 0))
+            word["end"] = start + word.get("end", 0) - word.get("start", 0)
+            word["start"] = start
+        return result
+
+    def stats(self):
+        return {
+            "frames_in": self.frames_in,
+            "frames_skipped": self.frames_skipped,
+            "skipped_ratio": skipped_ratio(self.frames_skipped, self.frames_in),
+        }
@@ -0,0 +1,161 @@
+"""WebSocket endpoint for transcribing audio captured in the browser.
+
+Clients send binary frames of 16 kHz mono 16-bit PCM (or Opus packets
+after a {"type": "start", "encoding": "opus"} message, when opuslib is
+installed) and receive JSON events on the same connection:
+
+    {"type": "session", "session_id": ...}    once, after connecting
+    {"type": "partial", "text": ...}           interim hypothesis
+    {"type": "final", "segment": ..., ...}     committed segment
+    {"type": "stopped"}                        after {"type": "stop"}
+
+Each connection gets its own KaldiRecognizer against the shared model, and
+decoding runs on a thread pool so one busy meeting doesn't stall the
+event loop for the others.
+"""
+import json
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import meeting_summarizer
+from segments import Segment
+
+
+class _Connection:
+    """Per-connection recognizer state; only touched from one executor task at a time."""
+
+    def __init__(self, summarizer, sample_rate):
+        self.summarizer = summarizer
+        self.recognizer = summarizer.recognizer
+        self.sample_rate = sample_rate
+        self.decoder = None
+        self.last_partial = ""
+
+    def use_opus(self):
+        import opuslib
+        self.decoder = opuslib.Decoder(self.sample_rate, 1)
+
+    def accept(self, data, received_at):
+        """Feed one audio frame and return the events it produced."""
+        if self.decoder is not None:
+            # 60 ms is the largest Opus frame size
+            data = self.decoder.decode(data, self.sample_rate * 60 // 1000)
+
+        events = []
+        if self.recognizer.AcceptWaveform(data):
+            self.last_partial = ""
+            event = self._final(json.loads(self.recognizer.Result()), received_at)
+            if event:
+                events.append(event)
+        else:
+            partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+            if partial and partial != self.last_partial:
+                self.last_partial = partial
+                events.append({"type": "partial", "text": partial,
+                               "latency_ms": round((time.perf_counter() - received_at) * 1000, 1)})
+        return events
+
+    def finish(self):
+        event = self._final(json.loads(self.recognizer.FinalResult()), time.perf_counter())
+        return [event] if event else []
+
+    def _final(self, result, received_at):
+        segment = Segment.from_vosk(result)
+        if not segment.text:
+            return None
+        if segment.start is None:
+            segment.start = 0
+        self.summarizer.segments.append(segment)
+        return {"type": "final", "text": segment.text, "segment": segment.render(), "start": segment.start,
+                "latency_ms": round((time.perf_counter() - received_at) * 1000, 1)}
+
+
+class TranscriptionServer:
+    """asyncio WebSocket server; create_session(summarizer) returns a session_store.Session.
+
+    The session is pinned (see Session.streaming) while its connection is open.
+
+    summarizer_config is passed to create_summarizer for every connection.
+    """
+
+    def __init__(self, create_session, host="0.0.0.0", port=8765, decode_workers=4, summarizer_config=None):
+        self.create_session = create_session
+        self.summarizer_config = summarizer_config or {}
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(max_workers=decode_workers, thread_name_prefix="ws-decode")
+        self.connections = 0
+
+    async def handle(self, websocket, path=None):
+        loop = asyncio.get_running_loop()
+        summarizer = meeting_summarizer.create_summarizer({**self.summarizer_config, "lazy_models": True})
+        session = self.create_session(summarizer)
+        session_id = session.id
+        connection = await loop.run_in_executor(
+            self.executor, _Connection, summarizer, meeting_summarizer.FRAME_RATE)
+
+        self.connections += 1
+        try:
+            with session.streaming():
+                await websocket.send(json.dumps({"type": "session", "session_id": session_id}))
+                async for message in websocket:
+                    if isinstance(message, bytes):
+                        events = await loop.run_in_executor(
+                            self.executor, connection.accept, message, time.perf_counter())
+                    else:
+                        control = json.loads(message)
+                        if control.get("type") == "start" and control.get("encoding") == "opus":
+                            connection.use_opus()
+                            continue
+                        if control.get("type") != "stop":
+                            continue
+                        events = await loop.run_in_executor(self.executor, connection.finish)
+                        events.append({"type": "stopped", "session_id": session_id})
+
+                    for event in events:
+                        await websocket.send(json.dumps(event))
+                    if events and events[-1]["type"] == "stopped":
+                        break
+        except Exception as e:
+            logging.error(f"WebSocket session {session_id} ended: {e}")
+        finally:
+            self.connections -= 1
+
+    async def serve_forever(self):
+        import websockets
+
+        async with websockets.serve(self.handle, self.host, self.port, max_size=2**20):
+            logging.info(f"WebSocket transcription listening on ws://{self.host}:{self.port}")
+            await asyncio.Future()
+
+    def start_in_thread(self):
+        """Run the server on its own event loop in a daemon thread."""
+        def run():
+            try:
+                asyncio.run(self.serve_forever())
+            except OSError as e:
+                # e.g. the Flask reloader's parent process already holds the port
+                logging.error(f"WebSocket server not started: {e}")
+
+        thread = threading.Thread(target=run, name="ws-server", daemon=True)
+        thread.start()
+        return thread
+
+
+if __name__ == "__main__":
+    import argparse
+    import uuid
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--decode-workers", type=int, default=4)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    meeting_summarizer.preload_models()
+    server = TranscriptionServer(lambda summarizer: uuid.uuid4().hex, args.host, args.port, args.decode_workers)
+    asyncio.run(server.serve_forever())